@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark the prompt-decision path of the policy gateway.
+
+Compares the previous per-request path (fresh DecisionResult, to_response()
+dict, Pydantic DecisionResponse, generic JSON encoding) with the current one
+(interned result, pre-encoded body), then measures /filter/prompt
+throughput in-process:
+
+    PYTHONPATH=services/policy-gateway/src python services/policy-gateway/scripts/bench_decisions.py
+
+Numbers are per call; "peak bytes" is the largest transient allocation seen
+while one call runs (tracemalloc), a proxy for how much each call allocates.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app as gateway_app  # noqa: E402
+from policy_gateway.application.services import PolicyDecisionService  # noqa: E402
+from policy_gateway.domain.models import DecisionResult, PromptDecisionInput  # noqa: E402
+from policy_gateway.interface.http.schemas import DecisionResponse  # noqa: E402
+
+
+class NoConfig:
+    def load(self):
+        return {}
+
+
+def legacy(service, request):
+    # What every call did before: a new result, a dict copy, a model, an encoder pass.
+    decision = service.decide_prompt(request)
+    fresh = DecisionResult(decision.allowed, decision.action, list(decision.reasons))
+    return json.dumps(jsonable_encoder(DecisionResponse(**fresh.to_response()))).encode()
+
+
+def current(service, request):
+    return service.decide_prompt(request).to_json()
+
+
+def per_call(fn, args, n):
+    for _ in range(min(n, 1000)):
+        fn(*args)
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(*args)
+    seconds = (time.perf_counter() - start) / n
+    tracemalloc.start()
+    peaks = []
+    for _ in range(200):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return seconds * 1e6, sorted(peaks)[len(peaks) // 2]
+
+
+def throughput(app, payload, n):
+    """Requests per second through the ASGI app itself (no HTTP client)."""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/filter/prompt", "raw_path": b"/filter/prompt",
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    async def run():
+        for _ in range(min(n, 500)):
+            await app(dict(scope), receive, send)
+        start = time.perf_counter()
+        for _ in range(n):
+            await app(dict(scope), receive, send)
+        return n / (time.perf_counter() - start)
+
+    return asyncio.run(run())
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--calls", type=int, default=200_000)
+    ap.add_argument("--requests", type=int, default=20_000)
+    opts = ap.parse_args(argv)
+
+    service = PolicyDecisionService(NoConfig())
+    cases = {
+        "allow": PromptDecisionInput(prompt="hello", context={}),
+        "block": PromptDecisionInput(prompt="hello", context={"contains_pii": True}),
+    }
+    print(f"{'decision':<10}{'path':<10}{'us/call':>10}{'peak bytes':>12}")
+    for name, request in cases.items():
+        for label, fn in (("legacy", legacy), ("current", current)):
+            assert json.loads(fn(service, request)) == json.loads(legacy(service, request))
+            us, peak = per_call(fn, (service, request), opts.calls)
+            print(f"{name:<10}{label:<10}{us:>10.2f}{peak:>12}")
+
+    with TestClient(gateway_app.app):  # runs startup so the app is fully built
+        pass
+    rate = throughput(gateway_app.app, {"prompt": "hello"}, opts.requests)
+    print(f"/filter/prompt in-process: {rate:,.0f} req/s over {opts.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,48 @@
 from __future__ import annotations
 
+import hmac
+import json
 import os
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from policy_gateway.application.services import PolicyDecisionService
+from policy_gateway.application.summarizer import ExtractiveSummarizer
 from policy_gateway.domain.models import (
     CiCheckInput,
     OutputDecisionInput,
     PromptDecisionInput,
 )
-from policy_gateway.infrastructure.config_file_adapter import ConfigFileAdapter
+from policy_gateway.infrastructure.canary import (
+    CanaryLLMAdapter,
+    CanaryRouter,
+    canary_settings,
+    parse_canary_policy,
+)
+from policy_gateway.infrastructure.embedders import HashingEmbedder, SentenceTransformerEmbedder
 from policy_gateway.infrastructure.litellm_adapter import LiteLLMAdapter
 from policy_gateway.infrastructure.llm_http_adapter import HTTPLLMAdapter
+from policy_gateway.infrastructure.policy_registry import (
+    PolicyRegistry,
+    PolicyScopeError,
+)
+from policy_gateway.infrastructure.profiler import folded, sample_stacks
+from policy_gateway.infrastructure.semantic_cache import SemanticCache, SemanticCacheLLMAdapter
+from policy_gateway.infrastructure.tokenizers import TokenCounter
+from policy_gateway.infrastructure.tracing import (
+    FileExporter,
+    RingBufferExporter,
+    Tracer,
+    TracingMiddleware,
+    bound_to_context,
+    span,
+)
+from policy_gateway.interface.http.rules_cache import RulesCache, UnknownPath
 from policy_gateway.interface.http.schemas import (
+    CiBulkCheckRequest,
+    CiBulkCheckResponse,
     CiCheckRequest,
     CiCheckResponse,
     CompletionRequest,
@@ -22,22 +51,98 @@ from policy_gateway.interface.http.schemas import (
     OutputCheckRequest,
     PromptCheckRequest,
 )
-from starlette.responses import StreamingResponse
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+
 
+TENANT_HEADER = "X-PAC-Tenant"
+NAMESPACE_HEADER = "X-PAC-Namespace"
+SESSION_HEADER = "X-PAC-Session"
 
-def _build_service() -> PolicyDecisionService:
+# Shared read-only stand-in for an absent request context.
+_NO_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+
+@lru_cache(maxsize=8)
+def _registry_for(cfg_path: str, policy_dir: str | None) -> PolicyRegistry:
+    return PolicyRegistry(
+        cfg_path,
+        policy_dir,
+        max_entries=int(os.getenv("PAC_POLICY_CACHE_SIZE", "512")),
+        recheck_seconds=float(os.getenv("PAC_POLICY_RECHECK_SECONDS", "1.0")),
+    )
+
+
+def get_policy_registry() -> PolicyRegistry:
+    # Registries are keyed by the environment so tests that monkeypatch
+    # PAC_CONFIG/PAC_POLICY_DIR still get a registry for their own files.
     cfg_path = os.getenv("PAC_CONFIG", "/config/adr-006.embedded-governance.yaml")
-    configuration_adapter = ConfigFileAdapter(cfg_path)
-    return PolicyDecisionService(configuration_adapter)
+    return _registry_for(cfg_path, os.getenv("PAC_POLICY_DIR") or None)
+
+
+def _scope(request: Request, context: Mapping[str, Any] | None = None) -> tuple:
+    """Return the caller's (tenant, namespace).
+
+    Headers take precedence over `tenant`/`namespace` keys in the request
+    context; requests with neither use the base policy (or PAC_NAMESPACE).
+    """
+    context = context or _NO_CONTEXT
+    tenant = request.headers.get(TENANT_HEADER) or context.get("tenant")
+    namespace = (
+        request.headers.get(NAMESPACE_HEADER)
+        or context.get("namespace")
+        or os.getenv("PAC_NAMESPACE")
+    )
+    return tenant, namespace
+
+
+@lru_cache(maxsize=8)
+def _base_service(registry: PolicyRegistry) -> PolicyDecisionService:
+    return PolicyDecisionService(registry.port_for(None, None))
+
+
+def _build_service(
+    registry: PolicyRegistry,
+    request: Request,
+    context: Mapping[str, Any] | None = None,
+) -> PolicyDecisionService:
+    """Build a service scoped to the caller's tenant/namespace."""
+    tenant, namespace = _scope(request, context)
+    if not tenant and not namespace:
+        # Services are stateless views over the registry; share the unscoped one.
+        return _base_service(registry)
+    try:
+        port = registry.port_for(
+            str(tenant) if tenant else None, str(namespace) if namespace else None
+        )
+    except PolicyScopeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return PolicyDecisionService(port)
+
+
+@lru_cache(maxsize=1)
+def _tracer() -> Tracer:
+    """Request tracer: PAC_TRACE_SAMPLE_RATE of requests (plus any arriving
+    with a sampled `traceparent`) are traced; spans go to PAC_TRACE_FILE as
+    OTLP/JSON lines, or to an in-memory ring read by /debug/traces."""
+    path = os.getenv("PAC_TRACE_FILE")
+    exporter = (
+        FileExporter(path)
+        if path
+        else RingBufferExporter(int(os.getenv("PAC_TRACE_BUFFER", "2048")))
+    )
+    return Tracer(exporter, sample_rate=float(os.getenv("PAC_TRACE_SAMPLE_RATE", "0.05")))
 
 
 app = FastAPI(title="Policy Gateway")
+app.add_middleware(TracingMiddleware, tracer=lambda: _tracer())
 
 
-def get_service() -> PolicyDecisionService:
-    # Build a fresh service for each test/request to ensure environment
-    # variables (like PAC_CONFIG) are picked up when tests monkeypatch them.
-    return _build_service()
+def get_service(
+    request: Request, registry: PolicyRegistry = Depends(get_policy_registry)
+) -> PolicyDecisionService:
+    # Services are cheap per-request views; the compiled policies they read
+    # live in the shared registry.
+    return _build_service(registry, request)
 
 
 def _build_llm_adapter():
@@ -55,47 +160,301 @@ def _build_llm_adapter():
     return HTTPLLMAdapter()
 
 
-@app.post("/proxy/completion", response_model=CompletionResponse)
-def proxy_completion(
-    body: CompletionRequest,
-):
+@lru_cache(maxsize=1)
+def _semantic_cache() -> SemanticCache | None:
+    """Process-wide semantic completion cache, enabled by PAC_SEMANTIC_CACHE=1.
+
+    PAC_SEMANTIC_CACHE_THRESHOLDS is a JSON object of model -> minimum cosine
+    similarity, with "*" as the default for unlisted models.
+    """
+    if os.getenv("PAC_SEMANTIC_CACHE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    embedder_name = os.getenv("PAC_SEMANTIC_CACHE_EMBEDDER", "hashing")
+    embedder = (
+        HashingEmbedder()
+        if embedder_name == "hashing"
+        else SentenceTransformerEmbedder(embedder_name)
+    )
+    return SemanticCache(
+        embedder,
+        capacity=int(os.getenv("PAC_SEMANTIC_CACHE_SIZE", "10000")),
+        thresholds=json.loads(os.getenv("PAC_SEMANTIC_CACHE_THRESHOLDS", "{}")),
+        nprobe=int(os.getenv("PAC_SEMANTIC_CACHE_NPROBE", "8")),
+    )
+
+
+@lru_cache(maxsize=1)
+def _token_counter() -> TokenCounter:
+    """PAC_TOKENIZERS is a JSON object of model -> tokenizer spec
+    (`tiktoken:<encoding>`, `hf:<repo>`, `regex`), "*" for the rest."""
+    return TokenCounter(
+        json.loads(os.getenv("PAC_TOKENIZERS", "{}")),
+        cache_size=int(os.getenv("PAC_TOKEN_CACHE_SIZE", "4096")),
+    )
+
+
+@lru_cache(maxsize=1)
+def _model_contexts() -> Dict[str, int]:
+    """PAC_MODEL_CONTEXT is a JSON object of model -> context window in
+    tokens, "*" for the rest."""
+    return {model: int(window) for model, window in json.loads(os.getenv("PAC_MODEL_CONTEXT", "{}")).items()}
+
+
+def _context_window(model: str | None) -> int | None:
+    windows = _model_contexts()
+    return windows.get(model or "", windows.get("*"))
+
+
+def _usage(
+    upstream: Any, prompt_tokens: int, completion_tokens: int, rewritten: bool = False
+) -> Dict[str, object]:
+    """Upstream usage with any missing counts filled from local counting.
+
+    When the gateway rewrote the answer (summarize), `completion_tokens` is
+    the local count of the content the client actually receives."""
+    usage = dict(upstream) if isinstance(upstream, Mapping) else {}
+    usage.setdefault("prompt_tokens", prompt_tokens)
+    if rewritten:
+        usage["completion_tokens"] = completion_tokens
+        usage.pop("total_tokens", None)
+    usage.setdefault("completion_tokens", completion_tokens)
+    usage.setdefault("total_tokens", usage["prompt_tokens"] + usage["completion_tokens"])
+    return usage
+
+
+@lru_cache(maxsize=1)
+def _summarizer() -> ExtractiveSummarizer:
+    return ExtractiveSummarizer(
+        ratio=float(os.getenv("PAC_SUMMARY_RATIO", "0.3")),
+        max_sentences=int(os.getenv("PAC_SUMMARY_MAX_SENTENCES", "5")),
+    )
+
+
+def _apply_output_action(action: str, content: str) -> str:
+    """Rewrite `content` for output actions the gateway carries out itself."""
+    if action == "summarize":
+        return _summarizer().summarize(content)
+    return content
+
+
+@lru_cache(maxsize=1)
+def _canary_router() -> CanaryRouter | None:
+    """Process-wide canary split, enabled by PAC_CANARY_UPSTREAM_URL or
+    PAC_CANARY_MODEL.
+
+    Traffic share and soak come from the base policy's `ci_cd_gates.prod`
+    `canary_release` entry (PAC_CANARY_POLICY overrides it, e.g. "10%
+    traffic, 5 min soak"); the rollback latency target is
+    `thresholds.latency.p95_seconds.target_max`.
+    """
+    if not (os.getenv("PAC_CANARY_UPSTREAM_URL") or os.getenv("PAC_CANARY_MODEL")):
+        return None
+    settings = canary_settings(get_policy_registry().resolve())
+    if os.getenv("PAC_CANARY_POLICY"):
+        settings["weight"], settings["soak_seconds"] = parse_canary_policy(
+            os.environ["PAC_CANARY_POLICY"]
+        )
+    return CanaryRouter(
+        settings["weight"],
+        settings["soak_seconds"],
+        settings["p95_target"],
+        max_error_delta=float(os.getenv("PAC_CANARY_MAX_ERROR_DELTA", "0.02")),
+        min_samples=int(os.getenv("PAC_CANARY_MIN_SAMPLES", "20")),
+    )
+
+
+def _completion_adapter():
     adapter = _build_llm_adapter()
-    # map HTTP request -> domain request
+    router = _canary_router()
+    if router is not None:
+        canary_url = os.getenv("PAC_CANARY_UPSTREAM_URL")
+        adapter = CanaryLLMAdapter(
+            adapter,
+            HTTPLLMAdapter(canary_url) if canary_url else adapter,
+            router,
+            canary_model=os.getenv("PAC_CANARY_MODEL") or None,
+        )
+    cache = _semantic_cache()
+    return SemanticCacheLLMAdapter(adapter, cache) if cache is not None else adapter
+
+
+def _prepare_completion(body: CompletionRequest, request: Request, registry: PolicyRegistry):
+    """Apply prompt policy and token budgets and build the domain request.
+
+    Blocked prompts are rejected with 403 and prompts over the model context
+    or policy `token_budget` with 413, both before reaching the model. The
+    decision action is part of the cache scope, so e.g. a `safe_mode` prompt
+    never receives an answer cached for an `allow` prompt, and with a canary
+    split the assigned arm is part of it too.
+    """
     from policy_gateway.domain.models import (
         CompletionRequest as DomainCompletionRequest,
     )
 
+    context = body.context or {}
+    service = _build_service(registry, request, context)
+    with span("service.decide_prompt"):
+        decision = service.decide_prompt(PromptDecisionInput(prompt=body.prompt, context=context))
+    if not decision.allowed:
+        raise HTTPException(status_code=403, detail=decision.to_response())
+    with span("tokens.count", model=body.model or "") as current:
+        prompt_tokens = _token_counter().count(body.prompt, body.model)
+        current.set("prompt_tokens", prompt_tokens)
+    with span("service.decide_token_budget"):
+        budget = service.decide_token_budget(
+            prompt_tokens, body.max_tokens, _context_window(body.model)
+        )
+    if not budget.allowed:
+        raise HTTPException(
+            status_code=413, detail={**budget.to_response(), "prompt_tokens": prompt_tokens}
+        )
+    tenant, namespace = _scope(request, context)
+    session = request.headers.get(SESSION_HEADER) or context.get("session_id")
+    scope: tuple = (str(tenant or ""), str(namespace or ""), decision.action)
+    router = _canary_router()
+    # The arm is decided once: the cache scope, X-PAC-Arm and the routing
+    # all use it, even if the split is rolled back mid-request.
+    arm = router.arm_for(str(session or body.prompt)) if router is not None else None
+    if arm is not None:
+        scope += (arm,)
     domain_req = DomainCompletionRequest(
-        prompt=body.prompt, model=body.model, max_tokens=body.max_tokens
+        prompt=body.prompt,
+        model=body.model,
+        max_tokens=body.max_tokens,
+        scope=scope,
+        session=str(session) if session else None,
+        arm=arm,
     )
-    result = adapter.complete(domain_req)
+    return service, context, domain_req, prompt_tokens
+
+
+@app.post("/proxy/completion", response_model=CompletionResponse)
+def proxy_completion(
+    body: CompletionRequest,
+    request: Request,
+    response: Response,
+    registry: PolicyRegistry = Depends(get_policy_registry),
+):
+    service, context, domain_req, prompt_tokens = _prepare_completion(body, request, registry)
+    with span("adapter.build"):
+        adapter = _completion_adapter()
+    with span("llm.complete", model=body.model or "") as current:
+        result = adapter.complete(domain_req)
+        if isinstance(adapter, SemanticCacheLLMAdapter):
+            current.set("cache.hit", adapter.last_hit)
+    # Output policy runs on every answer, cached or fresh.
+    with span("service.decide_output"):
+        output_decision = service.decide_output(
+            OutputDecisionInput(output=result.content, context=context)
+        )
+    if not output_decision.allowed:
+        raise HTTPException(status_code=403, detail=output_decision.to_response())
+    if isinstance(adapter, SemanticCacheLLMAdapter):
+        response.headers["X-PAC-Cache"] = "hit" if adapter.last_hit else "miss"
+    if domain_req.arm is not None:
+        response.headers["X-PAC-Arm"] = domain_req.arm
+    response.headers["X-PAC-Output-Action"] = output_decision.action
+    content = _apply_output_action(output_decision.action, result.content)
     return CompletionResponse(
-        content=result.content, model=result.model, usage=result.usage
+        content=content,
+        model=result.model,
+        usage=_usage(
+            result.usage,
+            prompt_tokens,
+            _token_counter().count(content, body.model),
+            rewritten=content != result.content,
+        ),
     )
 
 
 @app.post("/proxy/completion/stream")
-def proxy_completion_stream(body: CompletionRequest):
+def proxy_completion_stream(
+    body: CompletionRequest,
+    request: Request,
+    registry: PolicyRegistry = Depends(get_policy_registry),
+):
     """Stream completion results as Server-Sent-Events (SSE).
 
     The endpoint yields `data: <chunk>\n\n` for each chunk produced by the
-    selected LLM adapter's stream() method.
+    selected LLM adapter's stream() method. Output rules are driven by the
+    request context, so the output decision is made before the first chunk:
+    a blocked output is rejected with 403, and a `summarize` output is
+    buffered and sent as a single event holding the extractive summary.
     """
-    adapter = _build_llm_adapter()
-    from policy_gateway.domain.models import (
-        CompletionRequest as DomainCompletionRequest,
-    )
-
-    domain_req = DomainCompletionRequest(
-        prompt=body.prompt, model=body.model, max_tokens=body.max_tokens
-    )
+    service, context, domain_req, _ = _prepare_completion(body, request, registry)
+    with span("service.decide_output"):
+        output_decision = service.decide_output(OutputDecisionInput(output="", context=context))
+    if not output_decision.allowed:
+        raise HTTPException(status_code=403, detail=output_decision.to_response())
+    with span("adapter.build"):
+        adapter = _completion_adapter()
 
     def event_stream():
-        for chunk in adapter.stream(domain_req):
-            # SSE requires each event to be prefixed with `data:` and terminated by a blank line
-            yield f"data: {chunk}\n\n"
+        with span("llm.stream", model=body.model or ""):
+            if output_decision.action == "summarize":
+                content = "".join(adapter.stream(domain_req))
+                yield f"data: {_apply_output_action(output_decision.action, content)}\n\n"
+                return
+            for chunk in adapter.stream(domain_req):
+                # SSE requires each event to be prefixed with `data:` and terminated by a blank line
+                yield f"data: {chunk}\n\n"
+
+    headers = {"X-PAC-Output-Action": output_decision.action}
+    if domain_req.arm is not None:
+        headers["X-PAC-Arm"] = domain_req.arm
+    return StreamingResponse(bound_to_context(event_stream()), media_type="text/event-stream", headers=headers)
+
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+@app.get("/cache/stats")
+def cache_stats() -> Dict[str, object]:
+    cache = _semantic_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.get("/canary/status")
+def canary_status() -> Dict[str, object]:
+    router = _canary_router()
+    if router is None:
+        return {"enabled": False}
+    return {"enabled": True, **router.status()}
+
+
+def _require_debug_token(request: Request) -> None:
+    """Debug endpoints exist only when PAC_DEBUG_TOKEN is set and need it in
+    `X-PAC-Debug-Token` or `Authorization: Bearer`."""
+    token = os.getenv("PAC_DEBUG_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("X-PAC-Debug-Token") or ""
+    auth = request.headers.get("Authorization") or ""
+    if auth.startswith("Bearer "):
+        supplied = supplied or auth[len("Bearer "):]
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="invalid debug token")
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse)
+def debug_profile(
+    seconds: float = Query(10.0, gt=0, le=60),
+    hz: float = Query(100.0, gt=0, le=1000),
+    _: None = Depends(_require_debug_token),
+) -> PlainTextResponse:
+    """Sample this worker's thread stacks for `seconds` and return them as
+    folded stacks (`frame;frame;frame count` per line) for flame graphs."""
+    return PlainTextResponse(folded(sample_stacks(seconds, hz)))
+
+
+@app.get("/debug/traces")
+def debug_traces(
+    limit: int = Query(200, gt=0, le=10_000),
+    _: None = Depends(_require_debug_token),
+) -> Dict[str, object]:
+    exporter = _tracer().exporter
+    if not isinstance(exporter, RingBufferExporter):
+        return {"spans": [], "exporter": "file"}
+    return {"spans": exporter.spans(limit), "exporter": "memory"}
 
 
 @app.get("/health")
@@ -103,32 +462,77 @@ def health(service: PolicyDecisionService = Depends(get_service)) -> Dict[str, s
     return service.health()
 
 
+@lru_cache(maxsize=1)
+def _rules_cache() -> RulesCache:
+    return RulesCache()
+
+
 @app.get("/rules")
-def rules(service: PolicyDecisionService = Depends(get_service)) -> Dict[str, object]:
-    return service.rules().to_dict()
+def rules(
+    request: Request,
+    select: str | None = Query(None),
+    service: PolicyDecisionService = Depends(get_service),
+) -> Response:
+    """The effective policy, encoded once per policy snapshot and selection.
+
+    `select` is a comma-separated list of dotted paths (e.g.
+    `policy_as_code.rules,thresholds`). Responses carry a strong ETag;
+    a matching If-None-Match gets 304, and gzip/br variants are precomputed.
+    """
+    paths = tuple(p.strip() for p in (select or "").split(",") if p.strip())
+    try:
+        encoded = _rules_cache().get(service.rules().raw, paths)
+    except UnknownPath as exc:
+        raise HTTPException(status_code=400, detail=f"unknown path: {exc.args[0]}") from exc
+    coding = encoded.negotiate(request.headers.get("Accept-Encoding"))
+    body, etag = encoded.variants[coding]
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if encoded.matches(request.headers.get("If-None-Match")):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.post("/filter/prompt", response_model=DecisionResponse)
 def filter_prompt(
     body: PromptCheckRequest,
-    service: PolicyDecisionService = Depends(get_service),
-) -> DecisionResponse:
-    decision = service.decide_prompt(
-        PromptDecisionInput(prompt=body.prompt, context=body.context or {})
-    )
-    # Use centralized mapping from the domain model
-    return DecisionResponse(**decision.to_response())
+    request: Request,
+    registry: PolicyRegistry = Depends(get_policy_registry),
+) -> Response:
+    service = _build_service(registry, request, body.context)
+    with span("service.decide_prompt"):
+        decision = service.decide_prompt(
+            PromptDecisionInput(prompt=body.prompt, context=body.context or _NO_CONTEXT)
+        )
+    # The body is written straight from the (usually interned) result;
+    # response_model only documents the shape.
+    return Response(decision.to_json(), media_type="application/json")
 
 
 @app.post("/filter/output", response_model=DecisionResponse)
 def filter_output(
     body: OutputCheckRequest,
-    service: PolicyDecisionService = Depends(get_service),
-) -> DecisionResponse:
-    decision = service.decide_output(
-        OutputDecisionInput(output=body.output, context=body.context or {})
+    request: Request,
+    registry: PolicyRegistry = Depends(get_policy_registry),
+) -> Response:
+    service = _build_service(registry, request, body.context)
+    with span("service.decide_output"):
+        decision = service.decide_output(
+            OutputDecisionInput(output=body.output, context=body.context or _NO_CONTEXT)
+        )
+    return Response(decision.to_json(), media_type="application/json")
+
+
+def _ci_input(body: CiCheckRequest) -> CiCheckInput:
+    return CiCheckInput(
+        quality=body.quality,
+        fairness=body.fairness,
+        safety=body.safety,
+        drift=body.drift,
+        privacy=body.privacy,
+        latency=body.latency,
     )
-    return DecisionResponse(**decision.to_response())
 
 
 @app.post("/ci/check", response_model=CiCheckResponse)
@@ -136,12 +540,25 @@ def ci_check(
     body: CiCheckRequest,
     service: PolicyDecisionService = Depends(get_service),
 ) -> CiCheckResponse:
-    result = service.ci_check(
-        CiCheckInput(
-            quality=body.quality,
-            fairness=body.fairness,
-            safety=body.safety,
-            drift=body.drift,
-        )
-    )
+    with span("service.ci_check"):
+        result = service.ci_check(_ci_input(body))
     return CiCheckResponse(**result.to_response())
+
+
+@app.post("/ci/check/bulk", response_model=CiBulkCheckResponse)
+def ci_check_bulk(
+    body: CiBulkCheckRequest,
+    service: PolicyDecisionService = Depends(get_service),
+) -> CiBulkCheckResponse:
+    with span("service.ci_check_bulk", candidates=len(body.candidates)):
+        results = service.ci_check_bulk([_ci_input(c) for c in body.candidates])
+    summary = {"pass": 0, "warn": 0, "fail": 0}
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    return CiBulkCheckResponse(
+        results=[
+            {"id": candidate.id, **result.to_response()}
+            for candidate, result in zip(body.candidates, results)
+        ],
+        summary=summary,
+    )
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
+from policy_gateway.application.threshold_engine import compile_thresholds
 from policy_gateway.domain.models import (
+    ALLOW,
+    JAILBREAK_SAFE_MODE,
+    PII_BLOCK,
+    VERBATIM_SUMMARIZE,
     CiCheckInput,
     CiCheckResult,
     DecisionResult,
@@ -12,6 +17,8 @@ from policy_gateway.domain.models import (
 )
 from policy_gateway.ports.configuration import ConfigurationPort
 
+_NO_THRESHOLDS: Dict[str, Any] = {}
+
 
 class PolicyDecisionService:
     """Application service exposing policy decisions over abstract ports."""
@@ -27,67 +34,49 @@ class PolicyDecisionService:
         return RulesSnapshot(raw=config)
 
     def decide_prompt(self, request: PromptDecisionInput) -> DecisionResult:
-        context = request.context or {}
+        context = request.context
+        if not context:
+            return ALLOW
         if context.get("contains_pii") and not context.get("lawful_basis"):
-            return DecisionResult(
-                allowed=False,
-                action="block",
-                reasons=["PII without lawful basis"],
-            )
+            return PII_BLOCK
         if (context.get("jailbreak_score") or 0) > 0.8:
-            return DecisionResult(
-                allowed=True,
-                action="safe_mode",
-                reasons=["high jailbreak score"],
-            )
-        return DecisionResult(allowed=True, action="allow")
+            return JAILBREAK_SAFE_MODE
+        return ALLOW
 
     def decide_output(self, request: OutputDecisionInput) -> DecisionResult:
-        context = request.context or {}
-        if (context.get("verbatim_ratio") or 0) > 0.2:
-            return DecisionResult(
-                allowed=True,
-                action="summarize",
-                reasons=["verbatim over limit"],
-            )
-        return DecisionResult(allowed=True, action="allow")
-
-    def ci_check(self, request: CiCheckInput) -> CiCheckResult:
+        context = request.context
+        if context and (context.get("verbatim_ratio") or 0) > 0.2:
+            return VERBATIM_SUMMARIZE
+        return ALLOW
+
+    def decide_token_budget(
+        self,
+        prompt_tokens: int,
+        max_tokens: Optional[int] = None,
+        context_window: Optional[int] = None,
+    ) -> DecisionResult:
+        """Check a completion's size against the model context and the
+        policy's `token_budget` block (max_prompt_tokens, max_total_tokens)."""
         config = self._configuration_port.load() or {}
-        thresholds: Dict[str, Any] = config.get("thresholds", {})
-
-        violations: List[str] = []
-
-        quality_target = self._lookup_threshold(thresholds, "quality", "pass_at_5", "target")
-        if quality_target is not None and request.quality.get("pass_at_5", 0) < quality_target:
-            violations.append("quality.pass_at_5")
+        budget = config.get("token_budget") or {}
+        total = prompt_tokens + (max_tokens or 0)
+        reasons: List[str] = []
+        if context_window is not None and total > context_window:
+            reasons.append(f"{total} tokens exceed model context {context_window}")
+        if budget.get("max_prompt_tokens") is not None and prompt_tokens > budget["max_prompt_tokens"]:
+            reasons.append(f"{prompt_tokens} prompt tokens over budget {budget['max_prompt_tokens']}")
+        if budget.get("max_total_tokens") is not None and total > budget["max_total_tokens"]:
+            reasons.append(f"{total} total tokens over budget {budget['max_total_tokens']}")
+        if reasons:
+            return DecisionResult(allowed=False, action="reject", reasons=reasons)
+        return ALLOW
 
-        fairness_max = self._lookup_threshold(
-            thresholds, "fairness", "subgroup_delta", "target_max"
-        )
-        if fairness_max is not None and request.fairness.get("subgroup_delta", 0) > fairness_max:
-            violations.append("fairness.subgroup_delta")
-
-        safety_max = self._lookup_threshold(thresholds, "safety", "harmful_rate", "target_max")
-        if safety_max is not None and request.safety.get("harmful_rate", 0) > safety_max:
-            violations.append("safety.harmful_rate")
-
-        status = "fail" if violations else "pass"
-        return CiCheckResult(status=status, violations=violations)
+    def ci_check(self, request: CiCheckInput) -> CiCheckResult:
+        return self.ci_check_bulk([request])[0]
 
-    @staticmethod
-    def _lookup_threshold(
-        thresholds: Dict[str, Any],
-        domain_key: str,
-        metric_key: str,
-        value_key: str,
-    ) -> float | None:
-        domain_cfg = thresholds.get(domain_key, {})
-        metric_cfg = domain_cfg.get(metric_key, {})
-        value = metric_cfg.get(value_key)
-        if value is None:
-            return None
-        try:
-            return float(value)
-        except (TypeError, ValueError):
-            return None
+    def ci_check_bulk(self, requests: Sequence[CiCheckInput]) -> List[CiCheckResult]:
+        """Evaluate many candidates against the compiled `thresholds` block."""
+        config = self._configuration_port.load() or {}
+        thresholds: Dict[str, Any] = config.get("thresholds") or _NO_THRESHOLDS
+        engine = compile_thresholds(thresholds)
+        return engine.evaluate([request.sections() for request in requests])
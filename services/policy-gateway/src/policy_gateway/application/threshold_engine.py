@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from policy_gateway.domain.models import CiCheckResult
+
+MetricSections = Mapping[str, Mapping[str, float]]
+
+
+def _as_float(value: Any) -> float | None:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class ThresholdEngine:
+    """Vectorised evaluator for the ADR-006 `thresholds` block.
+
+    Every numeric metric under `thresholds.<domain>.<metric>` becomes one
+    column named `<domain>.<metric>`. Supported keys:
+
+    - `target`: lower bound. Breaching it blocks unless `block_below` is
+      false; a numeric `block_below` is a separate hard floor and turns the
+      target into a warning.
+    - `target_max`: upper bound, with `block_above` mirroring `block_below`.
+    - `warn_at` / `retrain_at`: warning levels (e.g. `drift.psi`); they never
+      fail a candidate on their own.
+
+    Missing metric values are treated as 0, matching the historical
+    `ci_check` behaviour. Non-numeric thresholds (e.g. `availability.target:
+    "99.5%"`) are skipped.
+    """
+
+    __slots__ = (
+        "metrics",
+        "min_block",
+        "min_warn",
+        "max_block",
+        "max_warn",
+        "warn_at",
+        "retrain_at",
+        "_paths",
+    )
+
+    def __init__(self, metrics: Sequence[str], bounds: Mapping[str, Sequence[float]]):
+        self.metrics: Tuple[str, ...] = tuple(metrics)
+        self._paths = tuple(tuple(name.split(".", 1)) for name in self.metrics)
+        n = len(self.metrics)
+
+        def column(key: str) -> np.ndarray:
+            values = bounds.get(key)
+            if values is None:
+                return np.full(n, np.nan)
+            return np.asarray(values, dtype=np.float64)
+
+        self.min_block = column("min_block")
+        self.min_warn = column("min_warn")
+        self.max_block = column("max_block")
+        self.max_warn = column("max_warn")
+        self.warn_at = column("warn_at")
+        self.retrain_at = column("retrain_at")
+
+    @classmethod
+    def compile(cls, thresholds: Mapping[str, Any]) -> "ThresholdEngine":
+        metrics: List[str] = []
+        bounds: Dict[str, List[float]] = {
+            key: []
+            for key in ("min_block", "min_warn", "max_block", "max_warn", "warn_at", "retrain_at")
+        }
+
+        for domain, domain_cfg in (thresholds or {}).items():
+            if not isinstance(domain_cfg, Mapping):
+                continue
+            for metric, metric_cfg in domain_cfg.items():
+                if not isinstance(metric_cfg, Mapping):
+                    continue
+                row = dict.fromkeys(bounds, math.nan)
+                cls._compile_bound(row, metric_cfg, "target", "block_below", "min")
+                cls._compile_bound(row, metric_cfg, "target_max", "block_above", "max")
+                for key in ("warn_at", "retrain_at"):
+                    level = _as_float(metric_cfg.get(key))
+                    if level is not None:
+                        row[key] = level
+                if all(math.isnan(v) for v in row.values()):
+                    continue
+                metrics.append(f"{domain}.{metric}")
+                for key, value in row.items():
+                    bounds[key].append(value)
+
+        return cls(metrics, bounds)
+
+    @staticmethod
+    def _compile_bound(
+        row: Dict[str, float], cfg: Mapping[str, Any], target_key: str, block_key: str, side: str
+    ) -> None:
+        target = _as_float(cfg.get(target_key))
+        block = cfg.get(block_key, True)
+        hard_limit = _as_float(block)
+        if hard_limit is not None:
+            row[f"{side}_block"] = hard_limit
+            if target is not None:
+                row[f"{side}_warn"] = target
+        elif target is not None:
+            row[f"{side}_block" if block is not False else f"{side}_warn"] = target
+
+    def columns(self, candidates: Sequence[MetricSections]) -> np.ndarray:
+        """Return an (n_candidates, n_metrics) matrix of metric values."""
+        matrix = np.zeros((len(candidates), len(self.metrics)), dtype=np.float64)
+        for j, (domain, metric) in enumerate(self._paths):
+            matrix[:, j] = np.fromiter(
+                (
+                    _as_float((c.get(domain) or {}).get(metric)) or 0.0
+                    for c in candidates
+                ),
+                dtype=np.float64,
+                count=len(candidates),
+            )
+        return matrix
+
+    def evaluate(self, candidates: Sequence[MetricSections]) -> List[CiCheckResult]:
+        """Evaluate many metric sets at once against the compiled thresholds."""
+        if not candidates:
+            return []
+        values = self.columns(candidates)
+        # NaN bounds compare False, so unset thresholds never fire.
+        with np.errstate(invalid="ignore"):
+            blocked = (values < self.min_block) | (values > self.max_block)
+            soft_min = (values < self.min_warn) & ~blocked
+            soft_max = (values > self.max_warn) & ~blocked
+            retrain = values >= self.retrain_at
+            warn = (values >= self.warn_at) & ~retrain
+
+        flagged = blocked | soft_min | soft_max | retrain | warn
+        results: List[CiCheckResult] = []
+        for i in range(values.shape[0]):
+            if not flagged[i].any():
+                results.append(CiCheckResult(status="pass"))
+                continue
+            violations = [self.metrics[j] for j in np.flatnonzero(blocked[i])]
+            warnings = [f"{self.metrics[j]}.target" for j in np.flatnonzero(soft_min[i])]
+            warnings += [f"{self.metrics[j]}.target_max" for j in np.flatnonzero(soft_max[i])]
+            warnings += [f"{self.metrics[j]}.warn_at" for j in np.flatnonzero(warn[i])]
+            warnings += [f"{self.metrics[j]}.retrain_at" for j in np.flatnonzero(retrain[i])]
+            status = "fail" if violations else "warn"
+            results.append(CiCheckResult(status=status, violations=violations, warnings=warnings))
+        return results
+
+
+_CACHE: "OrderedDict[int, Tuple[Mapping[str, Any], ThresholdEngine]]" = OrderedDict()
+_CACHE_SIZE = 64
+_CACHE_LOCK = threading.Lock()
+
+
+def compile_thresholds(thresholds: Mapping[str, Any]) -> ThresholdEngine:
+    """Return the engine for a thresholds block, compiling it at most once.
+
+    Policies served by the PolicyRegistry are stable objects between edits,
+    so the cache is keyed by identity; the cached entry keeps the mapping
+    alive so its id cannot be reused while it is cached.
+    """
+    key = id(thresholds)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None and hit[0] is thresholds:
+            _CACHE.move_to_end(key)
+            return hit[1]
+
+    engine = ThresholdEngine.compile(thresholds)
+    with _CACHE_LOCK:
+        _CACHE[key] = (thresholds, engine)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return engine
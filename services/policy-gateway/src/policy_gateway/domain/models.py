@@ -1,34 +1,51 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PromptDecisionInput:
     prompt: str
     context: Dict[str, object] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OutputDecisionInput:
     output: str
     context: Dict[str, object] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CiCheckInput:
     quality: Dict[str, float]
     fairness: Dict[str, float]
     safety: Dict[str, float]
     drift: Dict[str, float]
+    privacy: Dict[str, float] = field(default_factory=dict)
+    latency: Dict[str, float] = field(default_factory=dict)
 
+    def sections(self) -> Mapping[str, Mapping[str, float]]:
+        """Return metric values keyed like the `thresholds` config block."""
+        return {
+            "quality": self.quality,
+            "fairness": self.fairness,
+            "safety": self.safety,
+            "drift": self.drift,
+            "privacy": self.privacy,
+            "latency": self.latency,
+        }
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DecisionResult:
     allowed: bool
     action: str
-    reasons: List[str] = field(default_factory=list)
+    reasons: Sequence[str] = ()
+    # Response body, encoded on first use; the shared results below keep
+    # theirs for the life of the process.
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
 
     def to_response(self) -> Dict[str, object]:
         """Return a plain dict shaped like the HTTP DecisionResponse.
@@ -42,21 +59,46 @@ class DecisionResult:
             "reasons": list(self.reasons or []),
         }
 
-
-@dataclass(frozen=True)
+    def to_json(self) -> bytes:
+        """The DecisionResponse JSON body, without building a dict or model."""
+        encoded = self._json
+        if encoded is None:
+            encoded = b'{"allowed":%s,"action":%s,"reasons":%s}' % (
+                b"true" if self.allowed else b"false",
+                json.dumps(self.action).encode(),
+                json.dumps(list(self.reasons or ()), separators=(",", ":")).encode(),
+            )
+            object.__setattr__(self, "_json", encoded)
+        return encoded
+
+
+# Interned results for the common decisions; services return these instead
+# of allocating a new result per request.
+ALLOW = DecisionResult(allowed=True, action="allow")
+PII_BLOCK = DecisionResult(allowed=False, action="block", reasons=("PII without lawful basis",))
+JAILBREAK_SAFE_MODE = DecisionResult(allowed=True, action="safe_mode", reasons=("high jailbreak score",))
+VERBATIM_SUMMARIZE = DecisionResult(allowed=True, action="summarize", reasons=("verbatim over limit",))
+for _interned in (ALLOW, PII_BLOCK, JAILBREAK_SAFE_MODE, VERBATIM_SUMMARIZE):
+    _interned.to_json()
+del _interned
+
+
+@dataclass(frozen=True, slots=True)
 class CiCheckResult:
     status: str
     violations: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
 
     def to_response(self) -> Dict[str, object]:
         """Return a plain dict shaped like the HTTP CiCheckResponse."""
         return {
             "status": self.status,
             "violations": list(self.violations or []),
+            "warnings": list(self.warnings or []),
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RulesSnapshot:
     raw: Dict[str, object]
 
@@ -65,15 +107,22 @@ class RulesSnapshot:
 
 
 # --- LLM completion models
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompletionRequest:
     prompt: str
     # optional model selection and extra parameters
     model: Optional[str] = None
     max_tokens: Optional[int] = None
+    # Partition for response caches: (tenant, namespace, prompt decision).
+    # Requests in different scopes never share cached completions.
+    scope: Tuple[str, ...] = ()
+    # Sticky key for canary arm assignment; the prompt is used when unset.
+    session: Optional[str] = None
+    # Canary arm chosen by the caller; routed to as-is instead of re-hashing.
+    arm: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompletionResponse:
     content: str
     model: Optional[str] = None
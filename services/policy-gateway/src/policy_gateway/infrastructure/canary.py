@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from policy_gateway.domain.models import CompletionRequest, CompletionResponse
+from policy_gateway.ports.llm_adapter import LLMAdapterPort
+
+STABLE = "stable"
+CANARY = "canary"
+
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_SOAK = re.compile(r"(\d+(?:\.\d+)?)\s*(s|sec|second|m|min|minute|h|hr|hour)s?\b\s*soak", re.I)
+_UNIT_SECONDS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hr": 3600, "hour": 3600}
+
+# Latency bucket upper bounds in seconds: 1 ms .. ~131 s, 8 buckets per doubling.
+BUCKETS: Tuple[float, ...] = tuple(0.001 * 2 ** (i / 8) for i in range(137))
+
+
+def parse_canary_policy(text: str) -> Tuple[float, float]:
+    """Parse e.g. "5% traffic, 15 min soak" into (0.05, 900.0)."""
+    share = _PERCENT.search(text or "")
+    soak = _SOAK.search(text or "")
+    if share is None or soak is None:
+        raise ValueError(f"unrecognised canary policy: {text!r}")
+    weight = float(share.group(1)) / 100
+    if not 0 <= weight <= 1:
+        raise ValueError(f"canary share out of range: {text!r}")
+    return weight, float(soak.group(1)) * _UNIT_SECONDS[soak.group(2).lower()]
+
+
+def canary_settings(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """Read the canary policy and latency target from a policy document.
+
+    The policy comes from the `canary_release` entry in `ci_cd_gates.prod`,
+    the target from `thresholds.latency.p95_seconds.target_max`.
+    """
+    policy = next(
+        (
+            gate.get("policy")
+            for gate in ((config.get("ci_cd_gates") or {}).get("prod") or [])
+            if isinstance(gate, Mapping) and gate.get("name") == "canary_release"
+        ),
+        None,
+    )
+    weight, soak_seconds = parse_canary_policy(policy) if policy else (0.0, 0.0)
+    p95 = (((config.get("thresholds") or {}).get("latency") or {}).get("p95_seconds") or {})
+    target = p95.get("target_max") if isinstance(p95, Mapping) else None
+    return {
+        "weight": weight,
+        "soak_seconds": soak_seconds,
+        "p95_target": float(target) if target is not None else None,
+    }
+
+
+class ArmStats:
+    """Requests, errors and a fixed-bucket latency histogram for one arm."""
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, seconds: float, error: bool) -> None:
+        self.requests += 1
+        if error:
+            self.errors += 1
+            return
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile of successes."""
+        total = self.requests - self.errors
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return BUCKETS[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "p99_seconds": self.quantile(0.99),
+        }
+
+
+class CanaryRouter:
+    """Sticky weighted split between the stable and canary arms.
+
+    A session key is hashed (crc32) onto [0, 2**32) and goes to the canary
+    when it falls below `weight * 2**32`, so a session stays on its arm for
+    as long as the weight does. Every call is recorded per arm. While the
+    soak window is open and the canary has `min_samples` calls, the split is
+    rolled back (weight 0, all traffic stable) when the canary p95 exceeds
+    `p95_target` or its error rate exceeds the stable arm's by more than
+    `max_error_delta`. A canary that outlives the soak is reported as
+    `passed`; promoting it is a deployment step, not the router's.
+    """
+
+    def __init__(
+        self,
+        weight: float,
+        soak_seconds: float,
+        p95_target: Optional[float] = None,
+        max_error_delta: float = 0.02,
+        min_samples: int = 20,
+        clock=time.monotonic,
+    ) -> None:
+        self.weight = weight
+        self.soak_seconds = soak_seconds
+        self.p95_target = p95_target
+        self.max_error_delta = max_error_delta
+        self.min_samples = min_samples
+        self._clock = clock
+        self._cutoff = int(weight * 2**32)
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._arms = {STABLE: ArmStats(), CANARY: ArmStats()}
+        self.state = "soaking" if weight > 0 else "disabled"
+        self.rollback_reason: Optional[str] = None
+
+    def arm_for(self, key: str) -> str:
+        return CANARY if zlib.crc32(key.encode()) < self._cutoff else STABLE
+
+    def record(self, arm: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._arms[arm].record(seconds, error)
+            if self.state == "soaking":
+                self._evaluate()
+
+    def _evaluate(self) -> None:
+        if self._clock() - self._started >= self.soak_seconds:
+            self.state = "passed"
+            return
+        canary = self._arms[CANARY]
+        if canary.requests < self.min_samples:
+            return
+        p95 = canary.quantile(0.95)
+        if self.p95_target is not None and p95 is not None and p95 > self.p95_target:
+            self._rollback(f"canary p95 {p95:.3f}s over target {self.p95_target}s")
+        elif canary.error_rate > self._arms[STABLE].error_rate + self.max_error_delta:
+            self._rollback(
+                f"canary error rate {canary.error_rate:.3f} over stable "
+                f"{self._arms[STABLE].error_rate:.3f} + {self.max_error_delta}"
+            )
+
+    def _rollback(self, reason: str) -> None:
+        self._cutoff = 0
+        self.state = "rolled_back"
+        self.rollback_reason = reason
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            if self.state == "soaking" and self._clock() - self._started >= self.soak_seconds:
+                self.state = "passed"
+            elapsed = self._clock() - self._started
+            return {
+                "state": self.state,
+                "weight": self.weight,
+                "effective_weight": self._cutoff / 2**32,
+                "soak_seconds": self.soak_seconds,
+                "soak_remaining_seconds": max(0.0, self.soak_seconds - elapsed),
+                "p95_target_seconds": self.p95_target,
+                "rollback_reason": self.rollback_reason,
+                "arms": {name: stats.to_dict() for name, stats in self._arms.items()},
+            }
+
+
+class CanaryLLMAdapter(LLMAdapterPort):
+    """LLMAdapterPort routing each request to the stable or canary adapter.
+
+    `canary_model`, when set, replaces the request's model on the canary arm
+    so a canary can also be a different model on the same upstream. A
+    request that already carries an `arm` is routed there without hashing.
+
+    Only failures the wrapped adapter raises are recorded as errors.
+    HTTPLLMAdapter.stream recovers from a failed upstream stream by falling
+    back to a full completion, so a stream that failed but whose fallback
+    succeeded counts as a success (with the fallback's latency).
+    """
+
+    def __init__(
+        self,
+        stable: LLMAdapterPort,
+        canary: LLMAdapterPort,
+        router: CanaryRouter,
+        canary_model: Optional[str] = None,
+    ) -> None:
+        self._adapters = {STABLE: stable, CANARY: canary}
+        self._router = router
+        self._canary_model = canary_model
+        self.last_arm = STABLE
+
+    def _route(self, request: CompletionRequest) -> Tuple[str, CompletionRequest]:
+        arm = request.arm or self._router.arm_for(request.session or request.prompt)
+        if arm == CANARY and self._canary_model:
+            request = dataclasses.replace(request, model=self._canary_model)
+        self.last_arm = arm
+        return arm, request
+
+    def complete(self, request: CompletionRequest) -> CompletionResponse:
+        arm, request = self._route(request)
+        started = time.perf_counter()
+        try:
+            response = self._adapters[arm].complete(request)
+        except Exception:
+            self._router.record(arm, time.perf_counter() - started, error=True)
+            raise
+        self._router.record(arm, time.perf_counter() - started)
+        return response
+
+    def stream(self, request: CompletionRequest) -> Iterator[str]:
+        arm, request = self._route(request)
+        started = time.perf_counter()
+        try:
+            yield from self._adapters[arm].stream(request)
+        except Exception:
+            self._router.record(arm, time.perf_counter() - started, error=True)
+            raise
+        self._router.record(arm, time.perf_counter() - started)
@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 
 import yaml
+from policy_gateway.infrastructure.tracing import span
 from policy_gateway.ports.configuration import ConfigurationPort
 
 
@@ -20,6 +21,10 @@ class ConfigFileAdapter(ConfigurationPort):
         Returns an empty dict for missing files or invalid content so callers can
         safely consume the adapter in tests and runtime.
         """
+        with span("policy.load", path=str(self._path)):
+            return self._load()
+
+    def _load(self) -> dict:
         if not self._path.exists():
             return {}
         try:
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:  # pragma: no cover - sentence-transformers is optional
+    SentenceTransformer = None
+
+from policy_gateway.ports.embedder import EmbedderPort
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder(EmbedderPort):
+    """Dependency-free CPU embedder based on the hashing trick.
+
+    Each text contributes word unigrams, word bigrams and character
+    trigrams, hashed (crc32) into `dim` signed buckets with sublinear term
+    weights. Paraphrases that share most of their wording land close
+    together; it does not capture synonyms, which is what the optional
+    SentenceTransformerEmbedder is for.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD.findall(text.lower())
+        feats = [f"w:{w}" for w in words]
+        feats += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"<{w}>"
+            feats += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return feats
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode()) for f in self._features(text)), dtype=np.uint32
+            )
+            if hashes.size == 0:
+                continue
+            buckets = (hashes % self.dim).astype(np.intp)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(out[row], buckets, signs)
+        # Sublinear tf keeps repeated tokens from dominating.
+        out = np.sign(out) * np.log1p(np.abs(out))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+
+class SentenceTransformerEmbedder(EmbedderPort):
+    """Small local transformer embedder (e.g. all-MiniLM-L6-v2) on CPU."""
+
+    def __init__(self, model: str = "sentence-transformers/all-MiniLM-L6-v2") -> None:
+        if SentenceTransformer is None:
+            raise RuntimeError("sentence-transformers package is not installed")
+        self._model = SentenceTransformer(model, device="cpu")
+        self.dim = int(self._model.get_sentence_embedding_dimension())
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._model.encode(list(texts), normalize_embeddings=True)
+        return np.asarray(vectors, dtype=np.float32)
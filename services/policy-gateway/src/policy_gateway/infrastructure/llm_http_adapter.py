@@ -54,9 +54,10 @@ class HTTPLLMAdapter(LLMAdapterPort):
         )
 
     def stream(self, request: CompletionRequest):
-        """Attempt to stream from the upstream LLM. If streaming isn't
-        supported by the upstream, fall back to returning the completed
-        response as a single chunk.
+        """Attempt to stream from the upstream LLM. The request carries
+        `"stream": true` and the response body is relayed as it arrives. If
+        streaming isn't supported by the upstream, fall back to returning the
+        completed response as a single chunk.
         """
         url = self.endpoint.rstrip("/") + "/completion"
         payload: Dict[str, object] = {"prompt": request.prompt}
@@ -65,6 +66,8 @@ class HTTPLLMAdapter(LLMAdapterPort):
         if request.max_tokens is not None:
             payload["max_tokens"] = request.max_tokens
 
+        payload["stream"] = True
+
         try:
             with httpx.stream("POST", url, json=payload, timeout=self.timeout) as resp:
                 resp.raise_for_status()
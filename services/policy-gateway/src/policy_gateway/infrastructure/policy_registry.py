@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from policy_gateway.infrastructure.config_file_adapter import ConfigFileAdapter
+from policy_gateway.ports.configuration import ConfigurationPort, PolicyRegistryPort
+
+# Tenant and namespace names end up in file paths, so only accept plain
+# identifiers (no separators, no leading dot or underscore).
+_SCOPE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+_SUFFIXES = (".yaml", ".yml", ".json")
+_NAMESPACE_FILE = "_namespace"
+
+ScopeKey = Tuple[Optional[str], Optional[str]]
+# (path, mtime_ns, size) of the file backing a layer, or None when absent.
+Stamp = Optional[Tuple[str, int, int]]
+
+
+class PolicyScopeError(ValueError):
+    """Raised when a tenant or namespace cannot be mapped to a policy set."""
+
+
+def merge_policy(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep-merge `overlay` onto `base` sharing every untouched sub-tree.
+
+    Mappings are merged key by key; any other value (including lists such as
+    `policy_as_code.rules`) replaces the base value. Sub-trees the overlay does
+    not touch are returned by reference, so thousands of tenants that only
+    override a couple of thresholds share one copy of the rest of the policy.
+    Callers must treat the result as read-only.
+    """
+    if not overlay:
+        return base
+    merged = dict(base)
+    for key, value in overlay.items():
+        current = base.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = merge_policy(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class _Entry:
+    __slots__ = ("config", "stamps", "checked_at")
+
+    def __init__(self, config: Dict[str, Any], stamps: tuple, checked_at: float):
+        self.config = config
+        self.stamps = stamps
+        self.checked_at = checked_at
+
+
+class _ScopedConfigAdapter(ConfigurationPort):
+    """ConfigurationPort view of one tenant/namespace in a PolicyRegistry."""
+
+    def __init__(self, registry: "PolicyRegistry", key: ScopeKey):
+        self._registry = registry
+        self._key = key
+
+    def load(self) -> dict:
+        return self._registry.resolve(*self._key)
+
+
+class PolicyRegistry(PolicyRegistryPort):
+    """Select a compiled policy set by tenant and namespace.
+
+    The base policy (`PAC_CONFIG`) is layered with optional overrides found
+    under `policy_dir`:
+
+      {policy_dir}/{namespace}/_namespace.yaml   namespace-wide overrides
+      {policy_dir}/{namespace}/{tenant}.yaml     tenant overrides in a namespace
+      {policy_dir}/{tenant}.yaml                 tenant overrides (no namespace)
+
+    `.yml` and `.json` files are accepted as well. Merged policies are held in
+    a bounded LRU keyed by (tenant, namespace) and built lazily on first use;
+    cold tenants cost nothing until they send traffic. Backing files are
+    re-stat'ed at most every `recheck_seconds`, so lookups stay O(1) while
+    edits to the policy files are still picked up.
+    """
+
+    def __init__(
+        self,
+        base_path: str | os.PathLike[str],
+        policy_dir: str | os.PathLike[str] | None = None,
+        max_entries: int = 512,
+        recheck_seconds: float = 1.0,
+    ) -> None:
+        self._base_path = Path(base_path)
+        self._policy_dir = Path(policy_dir) if policy_dir else None
+        self._max_entries = max(1, int(max_entries))
+        self._recheck_seconds = recheck_seconds
+        self._entries: "OrderedDict[ScopeKey, _Entry]" = OrderedDict()
+        # Base and namespace layers are few and shared by every tenant, so
+        # they are cached separately from the tenant LRU.
+        self._layers: Dict[Optional[str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    # -- public API -----------------------------------------------------
+    def port_for(
+        self, tenant: Optional[str] = None, namespace: Optional[str] = None
+    ) -> ConfigurationPort:
+        key = (self._check_name(tenant, "tenant"), self._check_name(namespace, "namespace"))
+        if key[1] is not None:
+            allowed = self._namespaces()
+            if allowed and key[1] not in allowed:
+                raise PolicyScopeError(f"unknown namespace: {key[1]}")
+        return _ScopedConfigAdapter(self, key)
+
+    def resolve(self, tenant: Optional[str] = None, namespace: Optional[str] = None) -> dict:
+        """Return the merged policy for a scope, building it if needed."""
+        key = (tenant, namespace)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now - entry.checked_at < self._recheck_seconds:
+                    return entry.config
+
+        base = self._layer(None, now)
+        layered = self._layer(namespace, now) if namespace is not None else base
+        tenant_path = self._tenant_path(tenant, namespace)
+        stamps = (base.stamps, layered.stamps, self._stamp(tenant_path))
+
+        if entry is not None and entry.stamps == stamps:
+            entry.checked_at = now
+            return entry.config
+
+        config = layered.config
+        if tenant_path is not None and stamps[2] is not None:
+            config = merge_policy(config, ConfigFileAdapter(tenant_path).load())
+
+        with self._lock:
+            self._entries[key] = _Entry(config, stamps, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return config
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- internals ------------------------------------------------------
+    @staticmethod
+    def _check_name(value: Optional[str], kind: str) -> Optional[str]:
+        if value is None or value == "":
+            return None
+        if not _SCOPE_NAME.match(value):
+            raise PolicyScopeError(f"invalid {kind}: {value!r}")
+        return value
+
+    def _namespaces(self) -> set:
+        base = self._layer(None, time.monotonic()).config
+        namespaces = (base.get("environment") or {}).get("namespaces") or []
+        return {str(ns) for ns in namespaces} if isinstance(namespaces, list) else set()
+
+    def _layer(self, namespace: Optional[str], now: float) -> _Entry:
+        """Return the base layer (namespace=None) or base+namespace layer."""
+        cached = self._layers.get(namespace)
+        if cached is not None and now - cached.checked_at < self._recheck_seconds:
+            return cached
+
+        if namespace is None:
+            path: Optional[Path] = self._base_path
+            parent_stamps: tuple = ()
+            parent: Dict[str, Any] = {}
+        else:
+            base = self._layer(None, now)
+            path = self._find(self._policy_dir / namespace, _NAMESPACE_FILE) if self._policy_dir else None
+            parent_stamps = base.stamps
+            parent = base.config
+
+        stamps = parent_stamps + (self._stamp(path),)
+        if cached is not None and cached.stamps == stamps:
+            cached.checked_at = now
+            return cached
+
+        if namespace is None:
+            config = ConfigFileAdapter(self._base_path).load()
+        elif stamps[-1] is not None:
+            config = merge_policy(parent, ConfigFileAdapter(path).load())
+        else:
+            config = parent
+        entry = _Entry(config, stamps, now)
+        if len(self._layers) >= self._max_entries and namespace not in self._layers:
+            self._layers.clear()
+        self._layers[namespace] = entry
+        return entry
+
+    def _tenant_path(self, tenant: Optional[str], namespace: Optional[str]) -> Optional[Path]:
+        if tenant is None or self._policy_dir is None:
+            return None
+        directory = self._policy_dir / namespace if namespace is not None else self._policy_dir
+        return self._find(directory, tenant)
+
+    @staticmethod
+    def _find(directory: Path, stem: str) -> Optional[Path]:
+        for suffix in _SUFFIXES:
+            candidate = directory / f"{stem}{suffix}"
+            if candidate.is_file():
+                return candidate
+        return None
+
+    @staticmethod
+    def _stamp(path: Optional[Path]) -> Stamp:
+        if path is None:
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (str(path), st.st_mtime_ns, st.st_size)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+from typing import Dict
+
+
+def sample_stacks(seconds: float, hz: float = 100.0) -> Counter:
+    """Sample every other thread's Python stack `hz` times a second.
+
+    Returns a Counter of folded stacks ("thread;outer;...;inner" -> samples),
+    the input format of flamegraph.pl, speedscope and similar tools. Only
+    `sys._current_frames()` is read, so the sampled threads are never paused
+    beyond the interpreter's normal thread switching.
+    """
+    me = threading.get_ident()
+    labels: Dict[CodeType, str] = {}
+    counts: Counter = Counter()
+    names: Dict[int, str] = {}
+    interval = 1.0 / hz
+    deadline = time.perf_counter() + seconds
+    next_tick = time.perf_counter()
+    while next_tick < deadline:
+        frames = sys._current_frames()
+        if frames.keys() - names.keys():
+            names = {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+        for ident, frame in frames.items():
+            if ident == me:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    labels[code] = label = label.replace(";", ":")
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            counts[";".join(reversed(stack))] += 1
+        del frames
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_tick = time.perf_counter()
+    return counts
+
+
+def folded(counts: Counter) -> str:
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
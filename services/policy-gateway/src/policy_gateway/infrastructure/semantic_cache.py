@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from policy_gateway.domain.models import CompletionRequest, CompletionResponse
+from policy_gateway.ports.embedder import EmbedderPort
+from policy_gateway.ports.llm_adapter import LLMAdapterPort
+
+
+def scope_id(parts: Tuple[object, ...]) -> int:
+    """Stable signed 64-bit id for a cache scope tuple."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class IVFIndex:
+    """Fixed-capacity inverted-file index over unit vectors (inner product).
+
+    Vectors live in one preallocated float32 matrix, so memory is
+    `capacity x dim` regardless of traffic. Until `train_at` vectors are
+    present, search is a masked brute-force scan; after that a spherical
+    k-means quantiser with `nlist` cells is trained and a query scans only
+    the `nprobe` nearest cells. The quantiser is retrained after every
+    `capacity` inserts so cells follow the traffic mix. Every slot carries a
+    scope id and candidates from other scopes are never returned.
+
+    The index is not thread-safe; callers hold their own lock. `add()` only
+    reports that training is due. Training is split so the k-means itself
+    can run without that lock: `snapshot()` copies the live vectors (lock
+    held), `fit()` clusters the copy (no lock) and `install()` swaps in the
+    result (lock held), placing vectors added meanwhile in their cells.
+    """
+
+    def __init__(self, dim: int, capacity: int, nlist: Optional[int] = None, nprobe: int = 8) -> None:
+        self.dim = dim
+        self.capacity = capacity
+        self.nlist = nlist or max(1, int(np.sqrt(capacity)))
+        self.nprobe = min(nprobe, self.nlist)
+        self.train_at = 8 * self.nlist
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.scopes = np.zeros(capacity, dtype=np.int64)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.cell = np.full(capacity, -1, dtype=np.int32)
+        # Bumped on every add, so install() can tell a reused slot from the
+        # vector that was in it when the snapshot was taken.
+        self.version = np.zeros(capacity, dtype=np.int64)
+        self.centroids: Optional[np.ndarray] = None
+        self._cells: List[set] = []
+        self._live = 0
+        self._inserts_since_train = 0
+        self._training = False
+
+    def __len__(self) -> int:
+        return self._live
+
+    def add(self, slot: int, vector: np.ndarray, scope: int) -> bool:
+        """Insert a vector; True when the quantiser should be (re)trained."""
+        if not self.live[slot]:
+            self._live += 1
+        self.vectors[slot] = vector
+        self.scopes[slot] = scope
+        self.live[slot] = True
+        self.version[slot] += 1
+        self._inserts_since_train += 1
+        if self.centroids is None:
+            due = self._live >= self.train_at
+        else:
+            cell = int(np.argmax(self.centroids @ vector))
+            self.cell[slot] = cell
+            self._cells[cell].add(slot)
+            due = self._inserts_since_train >= self.capacity
+        return due and not self._training
+
+    def remove(self, slot: int) -> None:
+        if not self.live[slot]:
+            return
+        self.live[slot] = False
+        self._live -= 1
+        cell = self.cell[slot]
+        if cell >= 0:
+            self._cells[cell].discard(slot)
+            self.cell[slot] = -1
+
+    def snapshot(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Copy (slots, vectors, versions) of the live vectors and mark a
+        training run as started; None when there are too few to train on."""
+        slots = np.flatnonzero(self.live)
+        if slots.size < self.nlist:
+            return None
+        self._training = True
+        return slots, self.vectors[slots], self.version[slots]
+
+    def fit(self, snapshot, iterations: int = 8, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Spherical k-means over a snapshot; returns (centroids, cell per slot)."""
+        _, vectors, _ = snapshot
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(vectors.shape[0], min(vectors.shape[0], 64 * self.nlist), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            sums[empty] = centroids[empty]  # keep cells that lost every point
+            centroids = sums / np.where(norms == 0, 1.0, norms)
+        centroids = centroids.astype(np.float32)
+        return centroids, np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+
+    def install(self, snapshot, centroids: np.ndarray, cells: np.ndarray) -> None:
+        """Swap in a fitted quantiser and rebuild the cells."""
+        slots, _, versions = snapshot
+        unchanged = self.live[slots] & (self.version[slots] == versions)
+        self.centroids = centroids
+        self.cell[:] = -1
+        self.cell[slots[unchanged]] = cells[unchanged]
+        added = np.flatnonzero(self.live & (self.cell < 0))
+        if added.size:
+            self.cell[added] = np.argmax(self.vectors[added] @ centroids.T, axis=1)
+        self._cells = [set() for _ in range(self.nlist)]
+        live = np.flatnonzero(self.live)
+        for slot, cell in zip(live.tolist(), self.cell[live].tolist()):
+            self._cells[cell].add(slot)
+        self._inserts_since_train = 0
+        self._training = False
+
+    def abort_training(self) -> None:
+        self._training = False
+
+    def train(self, iterations: int = 8, seed: int = 0) -> None:
+        """snapshot, fit and install in one call (caller holds its lock)."""
+        snapshot = self.snapshot()
+        if snapshot is not None:
+            self.install(snapshot, *self.fit(snapshot, iterations, seed))
+
+    def search(self, vector: np.ndarray, scope: int) -> Tuple[int, float]:
+        """Best (slot, similarity) within `scope`, or (-1, -inf)."""
+        if self.centroids is None:
+            candidates = np.flatnonzero(self.live & (self.scopes == scope))
+        else:
+            probe = np.argpartition(-(self.centroids @ vector), self.nprobe - 1)[: self.nprobe]
+            slots = [s for c in probe for s in self._cells[c]]
+            if not slots:
+                return -1, -np.inf
+            candidates = np.fromiter(slots, dtype=np.intp, count=len(slots))
+            candidates = candidates[self.scopes[candidates] == scope]
+        if candidates.size == 0:
+            return -1, -np.inf
+        scores = self.vectors[candidates] @ vector
+        best = int(np.argmax(scores))
+        return int(candidates[best]), float(scores[best])
+
+
+class SemanticCache:
+    """Bounded LRU of completions looked up by prompt similarity.
+
+    A hit needs the same scope (tenant, namespace, prompt decision, model,
+    max_tokens) and cosine similarity at or above the model's threshold
+    (`thresholds[model]`, else `thresholds["*"]`, else `default_threshold`).
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderPort,
+        capacity: int = 10_000,
+        thresholds: Optional[Mapping[str, float]] = None,
+        default_threshold: float = 0.95,
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        max_content_bytes: int = 64 * 1024,
+        latency_window: int = 2048,
+    ) -> None:
+        self._embedder = embedder
+        self._thresholds = dict(thresholds or {})
+        self._default_threshold = self._thresholds.pop("*", default_threshold)
+        self._max_content_bytes = max_content_bytes
+        self._index = IVFIndex(embedder.dim, capacity, nlist, nprobe)
+        self._responses: List[Optional[CompletionResponse]] = [None] * capacity
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lookup_ms = np.zeros(latency_window, dtype=np.float64)
+        self._lookups = 0
+
+    def threshold(self, model: Optional[str]) -> float:
+        return self._thresholds.get(model or "", self._default_threshold)
+
+    @staticmethod
+    def scope_of(request: CompletionRequest) -> int:
+        return scope_id((*request.scope, request.model, request.max_tokens))
+
+    def embed(self, prompt: str) -> np.ndarray:
+        return self._embedder.embed([prompt])[0]
+
+    def lookup(self, request: CompletionRequest, vector: np.ndarray) -> Optional[CompletionResponse]:
+        started = time.perf_counter()
+        scope = self.scope_of(request)
+        with self._lock:
+            slot, score = self._index.search(vector, scope)
+            hit = slot >= 0 and score >= self.threshold(request.model)
+            if hit:
+                self._lru.move_to_end(slot)
+                self._hits += 1
+                response = self._responses[slot]
+            else:
+                self._misses += 1
+                response = None
+            self._lookup_ms[self._lookups % self._lookup_ms.size] = (time.perf_counter() - started) * 1000
+            self._lookups += 1
+        return response
+
+    def store(self, request: CompletionRequest, vector: np.ndarray, response: CompletionResponse) -> None:
+        if len(response.content.encode()) > self._max_content_bytes:
+            return
+        with self._lock:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot, _ = self._lru.popitem(last=False)
+                self._index.remove(slot)
+                self._evictions += 1
+            due = self._index.add(slot, vector, self.scope_of(request))
+            self._responses[slot] = response
+            self._lru[slot] = None
+            snapshot = self._index.snapshot() if due else None
+        if snapshot is not None:
+            self._retrain(snapshot)
+
+    def _retrain(self, snapshot) -> None:
+        # k-means runs on a copy without the lock; lookups and stores go on
+        # against the old quantiser until the new one is installed.
+        try:
+            centroids, cells = self._index.fit(snapshot)
+        except BaseException:
+            with self._lock:
+                self._index.abort_training()
+            raise
+        with self._lock:
+            self._index.install(snapshot, centroids, cells)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            total = self._hits + self._misses
+            window = self._lookup_ms[: min(self._lookups, self._lookup_ms.size)]
+            p50, p95, p99 = (
+                np.percentile(window, [50, 95, 99]).tolist() if window.size else (None, None, None)
+            )
+            return {
+                "entries": len(self._lru),
+                "capacity": self._index.capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "indexed": self._index.centroids is not None,
+                "lookup_ms": {"p50": p50, "p95": p95, "p99": p99},
+            }
+
+
+class SemanticCacheLLMAdapter(LLMAdapterPort):
+    """LLMAdapterPort decorator answering near-duplicate prompts from a
+    SemanticCache. Only successful upstream completions are stored; output
+    policy is the caller's job and runs on cached answers too."""
+
+    def __init__(self, inner: LLMAdapterPort, cache: SemanticCache) -> None:
+        self._inner = inner
+        self._cache = cache
+        self.last_hit = False
+
+    def complete(self, request: CompletionRequest) -> CompletionResponse:
+        vector = self._cache.embed(request.prompt)
+        cached = self._cache.lookup(request, vector)
+        self.last_hit = cached is not None
+        if cached is not None:
+            return cached
+        response = self._inner.complete(request)
+        self._cache.store(request, vector, response)
+        return response
+
+    def stream(self, request: CompletionRequest) -> Iterator[str]:
+        vector = self._cache.embed(request.prompt)
+        cached = self._cache.lookup(request, vector)
+        self.last_hit = cached is not None
+        if cached is not None:
+            yield cached.content
+            return
+        chunks: List[str] = []
+        for chunk in self._inner.stream(request):
+            chunks.append(chunk)
+            yield chunk
+        # Only a stream that ran to completion is cached.
+        self._cache.store(request, vector, CompletionResponse(content="".join(chunks), model=request.model))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+    import tiktoken
+except Exception:  # pragma: no cover - tiktoken is optional
+    tiktoken = None
+
+try:
+    from transformers import AutoTokenizer
+except Exception:  # pragma: no cover - transformers is optional
+    AutoTokenizer = None
+
+# Rough BPE stand-in: words, numbers and single punctuation marks.
+_PIECES = re.compile(r"\w+|[^\w\s]")
+# Prompts are counted per paragraph so shared prefixes (system prompts,
+# few-shot examples, retrieved documents) hit the cache.
+_SEGMENT = re.compile(r".*?(?:\n\s*\n|\Z)", re.S)
+
+Encoder = Callable[[str], int]
+
+
+def _regex_count(text: str) -> int:
+    return len(_PIECES.findall(text))
+
+
+class TokenCounter:
+    """Counts tokens with each model's tokenizer, loaded on first use.
+
+    `tokenizers` maps a model name (or "*") to `tiktoken:<encoding>`,
+    `hf:<repo or path>` or `regex`. Unmapped models try
+    `tiktoken.encoding_for_model` and otherwise fall back to the regex
+    estimate, which never needs a download. Text is counted per paragraph
+    and each paragraph's count is kept in an LRU of `cache_size` entries, so
+    repeated prompt prefixes are tokenized once; BPE merges across paragraph
+    breaks are rare, so the sum stays within a token or two of a whole-text
+    count. Entries are keyed by a 16-byte digest of the paragraph, so the
+    cache holds no prompt text and its size does not depend on document length.
+    """
+
+    def __init__(self, tokenizers: Optional[Mapping[str, str]] = None, cache_size: int = 4096) -> None:
+        self._specs = dict(tokenizers or {})
+        self._encoders: Dict[str, Tuple[str, Encoder]] = {}
+        self._cache: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _load(self, spec: str) -> Encoder:
+        kind, _, name = spec.partition(":")
+        if kind == "tiktoken":
+            if tiktoken is None:
+                raise RuntimeError("tiktoken package is not installed")
+            encoding = tiktoken.get_encoding(name)
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        if kind == "hf":
+            if AutoTokenizer is None:
+                raise RuntimeError("transformers package is not installed")
+            tokenizer = AutoTokenizer.from_pretrained(name)
+            return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+        if kind == "regex":
+            return _regex_count
+        raise ValueError(f"unknown tokenizer spec: {spec!r}")
+
+    def encoder(self, model: Optional[str]) -> Tuple[str, Encoder]:
+        """Return (tokenizer name, count function) for a model."""
+        key = model or ""
+        found = self._encoders.get(key)
+        if found is not None:
+            return found
+        spec = self._specs.get(key) or self._specs.get("*")
+        if spec is None and tiktoken is not None and model:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+                spec = f"tiktoken:{encoding.name}"
+            except KeyError:
+                pass
+        spec = spec or "regex"
+        found = (spec, self._load(spec))
+        with self._lock:
+            self._encoders[key] = found
+        return found
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        name, encode = self.encoder(model)
+        total = 0
+        misses: List[Tuple[Tuple[str, bytes], str]] = []
+        keys = [
+            ((name, hashlib.blake2b(segment.encode(), digest_size=16).digest()), segment)
+            for segment in _SEGMENT.findall(text)
+            if segment
+        ]
+        with self._lock:
+            for key, segment in keys:
+                cached = self._cache.get(key)
+                if cached is None:
+                    misses.append((key, segment))
+                else:
+                    self._cache.move_to_end(key)
+                    total += cached
+        if not misses:
+            return total
+        # Tokenize outside the lock; concurrent misses on the same segment
+        # just store the same count twice.
+        counted = [(key, encode(segment)) for key, segment in misses]
+        with self._lock:
+            for key, n in counted:
+                total += n
+                self._cache[key] = n
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return total
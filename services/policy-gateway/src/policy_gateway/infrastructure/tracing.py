@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+# W3C trace context: version-traceid-parentid-flags
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current: ContextVar[Optional["Span"]] = ContextVar("pac_current_span", default=None)
+
+T = TypeVar("T")
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class RingBufferExporter:
+    """Keeps the most recent `capacity` finished spans in memory."""
+
+    def __init__(self, capacity: int = 2048) -> None:
+        self._spans: deque = deque(maxlen=capacity)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        self._spans.append(span)
+
+    def spans(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        spans = list(self._spans)
+        return spans[-limit:] if limit else spans
+
+
+class FileExporter:
+    """Appends finished spans to a file, one OTLP/JSON span per line."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, separators=(",", ":")) + "\n"
+        with self._lock, open(self._path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+class Span:
+    """One timed operation; a context manager that becomes the current span."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes",
+                 "start_ns", "end_ns", "error", "_exporter", "_token")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: str,
+                 attributes: Dict[str, Any], exporter) -> None:
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self._exporter = exporter
+        self._token = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Exited in another context copy (a generator resumed by a
+            # different threadpool call); that copy never saw this span.
+            # Wrap such generators in bound_to_context() to keep nesting.
+            pass
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self._exporter.export(self.to_dict())
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON shape (as in ExportTraceServiceRequest)."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind}",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": self.error}
+                if self.error
+                else {"code": "STATUS_CODE_UNSET"}
+            ),
+        }
+
+
+def bound_to_context(iterator: Iterator[T]) -> Iterator[T]:
+    """Run every step of `iterator` in one copy of the current context.
+
+    Starlette advances a sync response generator in a fresh context copy per
+    chunk, so a span opened in one step would not be current in the next and
+    later child spans would attach to the root instead.
+    """
+    context = copy_context()
+    try:
+        while True:
+            try:
+                item = context.run(next, iterator)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            context.run(close)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Child span of the current span; a shared no-op when the request is not
+    being traced, so instrumented code costs one context-variable read."""
+    parent = _current.get()
+    if parent is None:
+        return _NOOP
+    return Span(parent.trace_id, parent.span_id, name, "INTERNAL", attributes, parent._exporter)
+
+
+class Tracer:
+    """Starts root spans for a sampled share of requests.
+
+    An incoming W3C `traceparent` header is honoured: its trace id and parent
+    span are reused and its sampled flag overrides `sample_rate`.
+    """
+
+    def __init__(self, exporter, sample_rate: float = 0.05) -> None:
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start(self, name: str, traceparent: Optional[str] = None, **attributes: Any):
+        match = _TRACEPARENT.match(traceparent or "")
+        if match is not None:
+            if not int(match.group(3), 16) & 1:
+                return _NOOP
+            trace_id, parent_id = match.group(1), match.group(2)
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            trace_id, parent_id = "%032x" % random.getrandbits(128), None
+        else:
+            return _NOOP
+        return Span(trace_id, parent_id, name, "SERVER", attributes, self.exporter)
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a root span per sampled HTTP request.
+
+    Request parsing and validation run inside the root span, so they show up
+    as the time before its first child span.
+    """
+
+    def __init__(self, app, tracer: Callable[[], Tracer]) -> None:
+        self.app = app
+        self._tracer = tracer
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for key, value in scope.get("headers") or ():
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        root = self._tracer().start(
+            f"{scope['method']} {scope['path']}",
+            traceparent,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        if root is _NOOP:
+            await self.app(scope, receive, send)
+            return
+
+        async def traced_send(message) -> None:
+            if message["type"] == "http.response.start":
+                root.set("http.status_code", message["status"])
+            await send(message)
+
+        with root:
+            await self.app(scope, receive, traced_send)
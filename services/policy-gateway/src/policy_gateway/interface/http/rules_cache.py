@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except Exception:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class UnknownPath(KeyError):
+    """A `select` path that does not exist in the policy."""
+
+
+class EncodedRules:
+    """One JSON representation of (a selection of) the policy, encoded once.
+
+    `variants` maps a content coding ("identity", "gzip", "br") to
+    (body, ETag). Compressed variants get their own strong ETag derived from
+    the same content hash, as RFC 9110 requires.
+    """
+
+    __slots__ = ("digest", "variants")
+
+    def __init__(self, body: bytes) -> None:
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, f'"{self.digest}"')}
+        self.variants["gzip"] = (gzip.compress(body, 9, mtime=0), f'"{self.digest}-gzip"')
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body), f'"{self.digest}-br"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True when an If-None-Match header names any variant of this body."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag.strip('"').split("-", 1)[0] == self.digest:
+                return True
+        return False
+
+    def negotiate(self, accept_encoding: Optional[str]) -> str:
+        """Pick br, then gzip, then identity from an Accept-Encoding header."""
+        accepted = set()
+        for item in (accept_encoding or "").lower().split(","):
+            coding, _, params = item.strip().partition(";")
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) <= 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(coding.strip())
+        for coding in ("br", "gzip"):
+            if coding in self.variants and (coding in accepted or "*" in accepted):
+                return coding
+        return "identity"
+
+
+def select(config: Mapping[str, Any], paths: Sequence[str]) -> Dict[str, Any]:
+    """Sub-trees of `config` at dotted `paths`, keeping their nesting."""
+    out: Dict[str, Any] = {}
+    for path in paths:
+        keys = path.split(".")
+        node: Any = config
+        for key in keys:
+            if not isinstance(node, Mapping) or key not in node:
+                raise UnknownPath(path)
+            node = node[key]
+        target = out
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = node
+    return out
+
+
+class RulesCache:
+    """Pre-encoded `/rules` responses per policy snapshot and selection.
+
+    The registry hands out the same dict object until the policy files
+    change, so a snapshot is identified by object identity and a cached
+    entry is only reused while it still refers to that very object.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self._entries: "OrderedDict[Tuple[int, Tuple[str, ...]], Tuple[Mapping[str, Any], EncodedRules]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, config: Mapping[str, Any], paths: Tuple[str, ...] = ()) -> EncodedRules:
+        key = (id(config), paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is config:
+                self._entries.move_to_end(key)
+                return entry[1]
+        document = select(config, paths) if paths else config
+        body = json.dumps(document, ensure_ascii=False, separators=(",", ":"), default=str).encode()
+        encoded = EncodedRules(body)
+        with self._lock:
+            self._entries[key] = (config, encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return encoded
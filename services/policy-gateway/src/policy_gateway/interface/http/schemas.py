@@ -20,6 +20,16 @@ class CiCheckRequest(BaseModel):
     fairness: Dict[str, float]
     safety: Dict[str, float]
     drift: Dict[str, float]
+    privacy: Dict[str, float] = Field(default_factory=dict)
+    latency: Dict[str, float] = Field(default_factory=dict)
+
+
+class CiCheckCandidate(CiCheckRequest):
+    id: str | None = None
+
+
+class CiBulkCheckRequest(BaseModel):
+    candidates: list[CiCheckCandidate]
 
 
 class DecisionResponse(BaseModel):
@@ -31,12 +41,24 @@ class DecisionResponse(BaseModel):
 class CiCheckResponse(BaseModel):
     status: str
     violations: list[str] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class CiCheckCandidateResult(CiCheckResponse):
+    id: str | None = None
+
+
+class CiBulkCheckResponse(BaseModel):
+    results: list[CiCheckCandidateResult]
+    summary: Dict[str, int] = Field(default_factory=dict)
 
 
 class CompletionRequest(BaseModel):
     prompt: str
     model: str | None = None
     max_tokens: int | None = None
+    # Same shape as PromptCheckRequest.context; evaluated by prompt policy.
+    context: Dict[str, Any] | None = None
 
 
 class CompletionResponse(BaseModel):
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Optional, Protocol
 
 
 class ConfigurationPort(Protocol):
@@ -9,3 +9,17 @@ class ConfigurationPort(Protocol):
     def load(self) -> dict:
         """Return the latest configuration data for the gateway."""
         ...
+
+
+class PolicyRegistryPort(Protocol):
+    """Abstract port selecting a policy set by tenant and namespace.
+
+    Implementations return a ConfigurationPort scoped to the requested
+    tenant/namespace so application services stay unaware of multi-tenancy.
+    """
+
+    def port_for(
+        self, tenant: Optional[str] = None, namespace: Optional[str] = None
+    ) -> ConfigurationPort:
+        """Return the configuration port for the given policy scope."""
+        ...
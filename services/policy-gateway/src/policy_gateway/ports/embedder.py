@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Protocol, Sequence
+
+import numpy as np
+
+
+class EmbedderPort(Protocol):
+    """Abstract port turning texts into L2-normalised float32 vectors.
+
+    embed(texts) returns an array of shape (len(texts), dim), so cosine
+    similarity between two embeddings is their dot product.
+    """
+
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
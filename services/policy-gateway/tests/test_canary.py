@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.domain.models import CompletionRequest, CompletionResponse
+from policy_gateway.infrastructure.canary import (
+    CANARY,
+    STABLE,
+    ArmStats,
+    CanaryLLMAdapter,
+    CanaryRouter,
+    canary_settings,
+    parse_canary_policy,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class EchoAdapter:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+
+    def complete(self, request):
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return CompletionResponse(content=self.name, model=request.model)
+
+    def stream(self, request):
+        yield self.complete(request).content
+
+
+def test_policy_parsing_and_settings_from_config():
+    assert parse_canary_policy("5% traffic, 15 min soak") == (0.05, 900.0)
+    assert parse_canary_policy("12.5% traffic, 2 hours soak") == (0.125, 7200.0)
+    with pytest.raises(ValueError):
+        parse_canary_policy("some traffic")
+
+    config = {
+        "ci_cd_gates": {"prod": [{"name": "canary_release", "policy": "5% traffic, 15 min soak"}]},
+        "thresholds": {"latency": {"p95_seconds": {"target_max": 2.0}}},
+    }
+    assert canary_settings(config) == {"weight": 0.05, "soak_seconds": 900.0, "p95_target": 2.0}
+    assert canary_settings({})["weight"] == 0.0
+
+
+def test_assignment_is_sticky_and_close_to_weight():
+    router = CanaryRouter(0.05, 900)
+    arms = [router.arm_for(f"session-{i}") for i in range(20_000)]
+    assert 0.04 < arms.count(CANARY) / len(arms) < 0.06
+    assert arms == [router.arm_for(f"session-{i}") for i in range(20_000)]
+    assert CanaryRouter(0.0, 900).arm_for("anything") == STABLE
+
+
+def test_histogram_quantiles_follow_bucket_bounds():
+    stats = ArmStats()
+    for _ in range(95):
+        stats.record(0.1, error=False)
+    for _ in range(5):
+        stats.record(3.0, error=False)
+    stats.record(0.0, error=True)
+    assert 0.1 <= stats.quantile(0.5) < 0.11
+    assert 0.1 <= stats.quantile(0.95) < 0.11
+    assert 3.0 <= stats.quantile(0.99) < 3.3
+    assert stats.error_rate == pytest.approx(1 / 101)
+
+
+def test_latency_regression_rolls_back_during_soak_only():
+    clock = Clock()
+    router = CanaryRouter(0.5, 60, p95_target=2.0, min_samples=10, clock=clock)
+    for _ in range(9):
+        router.record(CANARY, 5.0)
+    assert router.status()["state"] == "soaking"
+    router.record(CANARY, 5.0)
+    status = router.status()
+    assert status["state"] == "rolled_back" and "p95" in status["rollback_reason"]
+    assert status["effective_weight"] == 0
+    assert all(router.arm_for(f"s{i}") == STABLE for i in range(1000))
+
+    passed = CanaryRouter(0.5, 60, p95_target=2.0, min_samples=10, clock=clock)
+    clock.now += 61
+    for _ in range(20):
+        passed.record(CANARY, 5.0)
+    assert passed.status()["state"] == "passed" and passed.status()["effective_weight"] == 0.5
+
+
+def test_error_regression_rolls_back_through_adapter():
+    router = CanaryRouter(1.0, 900, min_samples=5)
+    adapter = CanaryLLMAdapter(EchoAdapter("stable"), EchoAdapter("canary", fail=True), router)
+    for i in range(5):
+        with pytest.raises(RuntimeError):
+            adapter.complete(CompletionRequest(prompt="hi", session=f"s{i}"))
+    assert router.status()["state"] == "rolled_back"
+    assert "error rate" in router.status()["rollback_reason"]
+    assert adapter.complete(CompletionRequest(prompt="hi")).content == "stable"
+    assert router.status()["arms"][STABLE]["requests"] == 1
+
+
+def test_preassigned_arm_wins_over_a_later_rollback():
+    router = CanaryRouter(1.0, 900)
+    adapter = CanaryLLMAdapter(EchoAdapter("stable"), EchoAdapter("canary"), router)
+    request = CompletionRequest(prompt="hi", arm=router.arm_for("hi"))
+    router._rollback("test")  # between the gateway's assignment and the call
+    assert request.arm == CANARY and router.arm_for("hi") == STABLE
+    assert adapter.complete(request).content == "canary" and adapter.last_arm == CANARY
+
+
+def test_proxy_splits_by_session_and_reports_status(monkeypatch):
+    gateway_app._canary_router.cache_clear()
+    assert TestClient(gateway_app.app).get("/canary/status").json() == {"enabled": False}
+    monkeypatch.setenv("PAC_CANARY_MODEL", "candidate")
+    monkeypatch.setenv("PAC_CANARY_POLICY", "50% traffic, 15 min soak")
+
+    class ModelEcho:
+        def complete(self, request):
+            return CompletionResponse(content=request.model or "default", model=request.model)
+
+        def stream(self, request):
+            yield request.model or "default"
+
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: ModelEcho())
+    gateway_app._canary_router.cache_clear()
+    try:
+        client = TestClient(gateway_app.app)
+        seen = {}
+        for i in range(40):
+            r = client.post("/proxy/completion", json={"prompt": "hi"}, headers={"X-PAC-Session": f"user-{i}"})
+            seen[r.headers["X-PAC-Arm"]] = r.json()["content"]
+            again = client.post("/proxy/completion", json={"prompt": "bye"}, headers={"X-PAC-Session": f"user-{i}"})
+            assert again.headers["X-PAC-Arm"] == r.headers["X-PAC-Arm"]
+        assert seen == {"stable": "default", "canary": "candidate"}
+
+        status = client.get("/canary/status").json()
+        assert status["enabled"] and status["state"] == "soaking" and status["weight"] == 0.5
+        assert status["arms"]["stable"]["requests"] + status["arms"]["canary"]["requests"] == 80
+    finally:
+        gateway_app._canary_router.cache_clear()
@@ -39,3 +39,15 @@ def test_ci_check_endpoint_returns_expected_shape():
     assert res.status_code == 200
     body = res.json()
     assert set(body.keys()) >= {"status", "violations"}
+
+
+def test_ci_check_bulk_endpoint_returns_per_candidate_results():
+    client = TestClient(policy_app)
+    sections = {"quality": {}, "fairness": {}, "safety": {}, "drift": {}}
+    payload = {"candidates": [{"id": "ckpt-1", **sections}, {"id": "ckpt-2", **sections}]}
+    res = client.post("/ci/check/bulk", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert [r["id"] for r in body["results"]] == ["ckpt-1", "ckpt-2"]
+    assert set(body["results"][0].keys()) >= {"status", "violations", "warnings"}
+    assert sum(body["summary"].values()) == 2
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+from fastapi.testclient import TestClient
+from policy_gateway.infrastructure.policy_registry import (
+    PolicyRegistry,
+    PolicyScopeError,
+)
+
+BASE = {
+    "environment": {"namespaces": ["dev", "staging", "prod"]},
+    "policy_as_code": {"rules": [{"id": "pii_block_prompt"}]},
+    "thresholds": {
+        "quality": {"pass_at_5": {"target": 0.82}},
+        "safety": {"harmful_rate": {"target_max": 0.005}},
+    },
+}
+
+
+def _write(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data))
+
+
+@pytest.fixture()
+def policy_tree(tmp_path: Path) -> tuple[Path, Path]:
+    base = tmp_path / "base.yaml"
+    _write(base, BASE)
+    root = tmp_path / "policies"
+    _write(
+        root / "prod" / "_namespace.yaml",
+        {"thresholds": {"safety": {"harmful_rate": {"target_max": 0.001}}}},
+    )
+    _write(
+        root / "prod" / "team-a.yaml",
+        {"thresholds": {"quality": {"pass_at_5": {"target": 0.9}}}},
+    )
+    return base, root
+
+
+def test_registry_layers_namespace_and_tenant(policy_tree):
+    base, root = policy_tree
+    registry = PolicyRegistry(base, root)
+
+    cfg = registry.port_for("team-a", "prod").load()
+    assert cfg["thresholds"]["quality"]["pass_at_5"]["target"] == 0.9
+    assert cfg["thresholds"]["safety"]["harmful_rate"]["target_max"] == 0.001
+
+    # Tenants without overrides get the namespace policy unchanged.
+    other = registry.port_for("team-b", "prod").load()
+    assert other["thresholds"]["quality"]["pass_at_5"]["target"] == 0.82
+    assert registry.port_for().load()["thresholds"] == BASE["thresholds"]
+
+
+def test_registry_shares_unchanged_subtrees(policy_tree):
+    base, root = policy_tree
+    registry = PolicyRegistry(base, root)
+
+    team_a = registry.resolve("team-a", "prod")
+    team_b = registry.resolve("team-b", "prod")
+    dev = registry.resolve("team-a", "dev")
+    assert team_a["policy_as_code"] is team_b["policy_as_code"] is dev["policy_as_code"]
+    assert team_a["thresholds"]["safety"] is team_b["thresholds"]["safety"]
+    # Repeated lookups return the cached compiled policy.
+    assert registry.resolve("team-a", "prod") is team_a
+
+
+def test_registry_lru_is_bounded(policy_tree):
+    base, root = policy_tree
+    registry = PolicyRegistry(base, root, max_entries=4)
+    for i in range(50):
+        registry.resolve(f"tenant-{i}", "dev")
+    assert len(registry) == 4
+
+
+def test_registry_rejects_unknown_scopes(policy_tree):
+    base, root = policy_tree
+    registry = PolicyRegistry(base, root)
+    with pytest.raises(PolicyScopeError):
+        registry.port_for("team-a", "qa")
+    with pytest.raises(PolicyScopeError):
+        registry.port_for("../etc/passwd", "prod")
+
+
+def test_registry_picks_up_policy_edits(policy_tree):
+    base, root = policy_tree
+    registry = PolicyRegistry(base, root, recheck_seconds=0)
+    assert registry.resolve("team-a", "prod")["thresholds"]["quality"]["pass_at_5"]["target"] == 0.9
+
+    _write(
+        root / "prod" / "team-a.yaml",
+        {"thresholds": {"quality": {"pass_at_5": {"target": 0.95, "block_below": True}}}},
+    )
+    cfg = registry.resolve("team-a", "prod")
+    assert cfg["thresholds"]["quality"]["pass_at_5"]["target"] == 0.95
+
+
+def test_ci_check_uses_tenant_headers(policy_tree, monkeypatch):
+    base, root = policy_tree
+    monkeypatch.setenv("PAC_CONFIG", str(base))
+    monkeypatch.setenv("PAC_POLICY_DIR", str(root))
+    import app as gateway_app  # type: ignore
+
+    client = TestClient(gateway_app.app)
+    payload = {
+        "quality": {"pass_at_5": 0.85},
+        "fairness": {},
+        "safety": {"harmful_rate": 0.0},
+        "drift": {},
+    }
+    assert client.post("/ci/check", json=payload).json()["status"] == "pass"
+
+    headers = {"X-PAC-Tenant": "team-a", "X-PAC-Namespace": "prod"}
+    res = client.post("/ci/check", json=payload, headers=headers)
+    assert res.json()["violations"] == ["quality.pass_at_5"]
+
+    res = client.post(
+        "/ci/check", json=payload, headers={"X-PAC-Namespace": "unknown"}
+    )
+    assert res.status_code == 400
@@ -161,3 +161,77 @@ def test_config_file_adapter_handles_json(tmp_path: Path):
 def test_config_file_adapter_missing_file(tmp_path: Path):
     adapter = ConfigFileAdapter(tmp_path / "missing.yaml")
     assert adapter.load() == {}
+
+
+def test_ci_check_covers_privacy_latency_and_drift_levels():
+    cfg = yaml.safe_load(
+        """
+thresholds:
+  quality:
+    pass_at_5: { target: 0.82, block_below: true }
+  privacy:
+    reid_risk: { target_max: 0.001, block_above: true }
+  drift:
+    psi: { warn_at: 0.1, retrain_at: 0.2 }
+  latency:
+    p95_seconds: { target_max: 2.0, block_above: false }
+  availability:
+    target: "99.5%"
+"""
+    )
+    service = create_service(cfg)
+    result = service.ci_check(
+        CiCheckInput(
+            quality={"pass_at_5": 0.9},
+            fairness={},
+            safety={},
+            drift={"psi": 0.15},
+            privacy={"reid_risk": 0.002},
+            latency={"p95_seconds": 2.5},
+        )
+    )
+    assert result.status == "fail"
+    assert result.violations == ["privacy.reid_risk"]
+    assert set(result.warnings) == {"drift.psi.warn_at", "latency.p95_seconds.target_max"}
+
+    warn_only = service.ci_check(
+        CiCheckInput(
+            quality={"pass_at_5": 0.9}, fairness={}, safety={}, drift={"psi": 0.25}
+        )
+    )
+    assert warn_only.status == "warn"
+    assert warn_only.warnings == ["drift.psi.retrain_at"]
+
+
+def test_ci_check_bulk_evaluates_each_candidate():
+    cfg = {
+        "thresholds": {
+            "quality": {"pass_at_5": {"target": 0.8}},
+            "safety": {"harmful_rate": {"target_max": 0.01}},
+        }
+    }
+    service = create_service(cfg)
+    candidates = [
+        CiCheckInput(
+            quality={"pass_at_5": 0.5 + i / 100}, fairness={}, safety={"harmful_rate": 0.0}, drift={}
+        )
+        for i in range(50)
+    ]
+    results = service.ci_check_bulk(candidates)
+    assert [r.status for r in results] == ["fail"] * 30 + ["pass"] * 20
+    assert results[0].violations == ["quality.pass_at_5"]
+
+
+def test_decisions_are_interned_and_pre_encoded():
+    from policy_gateway.domain.models import ALLOW, PII_BLOCK, DecisionResult
+
+    service = create_service()
+    assert service.decide_prompt(PromptDecisionInput(prompt="hi", context={})) is ALLOW
+    blocked = service.decide_prompt(PromptDecisionInput(prompt="hi", context={"contains_pii": True}))
+    assert blocked is PII_BLOCK
+    assert json.loads(blocked.to_json()) == blocked.to_response()
+    assert blocked.to_json() is blocked.to_json()
+
+    custom = DecisionResult(allowed=False, action="reject", reasons=['quote " and é'])
+    assert json.loads(custom.to_json()) == custom.to_response()
+    assert not hasattr(custom, "__dict__")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.interface.http.rules_cache import EncodedRules, RulesCache, select
+
+POLICY = """
+policy_as_code:
+  rules:
+    - id: pii_block_prompt
+      action: block
+thresholds:
+  latency:
+    p95_seconds: { target_max: 2.0 }
+"""
+
+
+def test_rules_are_encoded_once_and_revalidated_with_etag(tmp_path, monkeypatch):
+    cfg = tmp_path / "rules.yaml"
+    cfg.write_text(POLICY)
+    monkeypatch.setenv("PAC_CONFIG", str(cfg))
+    monkeypatch.setenv("PAC_POLICY_RECHECK_SECONDS", "0")
+    client = TestClient(gateway_app.app)
+
+    first = client.get("/rules", headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200 and first.headers["content-type"] == "application/json"
+    assert first.json()["thresholds"]["latency"]["p95_seconds"]["target_max"] == 2.0
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and first.headers["Vary"] == "Accept-Encoding"
+
+    unchanged = client.get("/rules", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+
+    zipped = client.get("/rules", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip" and zipped.headers["ETag"] != etag
+    assert zipped.json() == first.json()  # the client decodes gzip transparently
+    assert client.get("/rules", headers={"If-None-Match": zipped.headers["ETag"]}).status_code == 304
+
+    cfg.write_text(POLICY.replace("2.0", "1.5"))
+    changed = client.get("/rules", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert changed.json()["thresholds"]["latency"]["p95_seconds"]["target_max"] == 1.5
+
+
+def test_rules_select_subtrees(tmp_path, monkeypatch):
+    cfg = tmp_path / "select.yaml"
+    cfg.write_text(POLICY)
+    monkeypatch.setenv("PAC_CONFIG", str(cfg))
+    client = TestClient(gateway_app.app)
+
+    picked = client.get("/rules", params={"select": "policy_as_code.rules, thresholds.latency"})
+    assert picked.json() == {
+        "policy_as_code": {"rules": [{"id": "pii_block_prompt", "action": "block"}]},
+        "thresholds": {"latency": {"p95_seconds": {"target_max": 2.0}}},
+    }
+    only_rules = client.get("/rules", params={"select": "policy_as_code.rules"})
+    assert only_rules.json() == {"policy_as_code": picked.json()["policy_as_code"]}
+    assert only_rules.headers["ETag"] != picked.headers["ETag"]
+    assert client.get("/rules", params={"select": "thresholds.nope"}).status_code == 400
+
+
+def test_cache_reuses_encoding_per_snapshot_object():
+    cache = RulesCache(max_entries=2)
+    config = {"a": {"b": 1}, "c": [1, 2]}
+    encoded = cache.get(config)
+    assert cache.get(config) is encoded
+    assert cache.get(dict(config)) is not encoded
+    assert json.loads(gzip.decompress(encoded.variants["gzip"][0])) == config
+    assert select(config, ["a.b"]) == {"a": {"b": 1}}
+
+    body = EncodedRules(b"{}")
+    assert body.negotiate("gzip;q=0, identity") == "identity"
+    assert body.negotiate("deflate, *") in ("br", "gzip")
+    assert body.matches(f'W/"{body.digest}"') and body.matches("*")
+    assert not body.matches('"other"')
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.domain.models import CompletionRequest, CompletionResponse
+from policy_gateway.infrastructure.embedders import HashingEmbedder
+from policy_gateway.infrastructure.semantic_cache import (
+    IVFIndex,
+    SemanticCache,
+    SemanticCacheLLMAdapter,
+)
+
+
+class CountingAdapter:
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, request):
+        self.calls += 1
+        return CompletionResponse(content=f"answer {self.calls}", model=request.model)
+
+    def stream(self, request):
+        self.calls += 1
+        yield "streamed "
+        yield f"answer {self.calls}"
+
+
+def test_ivf_search_matches_brute_force_within_scope():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(400, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = IVFIndex(32, capacity=400, nlist=8, nprobe=8)
+    due = [index.add(slot, v, scope=slot % 2) for slot, v in enumerate(vectors)]
+    assert due.index(True) == 63  # training is due once 8 * nlist vectors arrived
+    index.train()
+    assert index.centroids is not None and len(index) == 400
+
+    slot, score = index.search(vectors[10], scope=0)
+    assert slot == 10 and abs(score - 1.0) < 1e-5
+    assert index.search(vectors[10], scope=1)[0] % 2 == 1
+    index.remove(10)
+    assert index.search(vectors[10], scope=0)[0] != 10 and len(index) == 399
+
+
+def test_vectors_added_during_training_land_in_cells():
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = IVFIndex(16, capacity=200, nlist=4, nprobe=1)
+    for slot in range(100):
+        index.add(slot, vectors[slot], scope=0)
+    snapshot = index.snapshot()
+    assert not index.add(100, vectors[100], scope=0)  # a run is already in flight
+    fitted = index.fit(snapshot)
+    index.remove(5)
+    index.add(5, vectors[150], scope=0)  # slot reused after the snapshot
+    index.install(snapshot, *fitted)
+    for slot in (5, 100):
+        assert slot in index._cells[index.cell[slot]]
+        assert index.cell[slot] == int(np.argmax(index.centroids @ index.vectors[slot]))
+    assert sum(len(c) for c in index._cells) == len(index) == 101
+
+
+def test_cache_hits_paraphrases_only_within_scope_and_evicts_lru():
+    inner = CountingAdapter()
+    cache = SemanticCache(HashingEmbedder(), capacity=2, thresholds={"*": 0.9})
+    adapter = SemanticCacheLLMAdapter(inner, cache)
+    acme = ("acme", "prod", "allow")
+
+    first = adapter.complete(CompletionRequest("How do I reset my password?", model="m", scope=acme))
+    again = adapter.complete(CompletionRequest("how do i reset my password", model="m", scope=acme))
+    assert again == first and adapter.last_hit and inner.calls == 1
+    # Another tenant, prompt decision or model never shares the answer.
+    adapter.complete(CompletionRequest("How do I reset my password?", model="m", scope=("other", "prod", "allow")))
+    adapter.complete(CompletionRequest("How do I reset my password?", model="m", scope=("acme", "prod", "safe_mode")))
+    assert inner.calls == 3 and not adapter.last_hit
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["lookup_ms"]["p99"] is not None
+
+    chunks = list(adapter.stream(CompletionRequest("What is the refund policy?", scope=acme)))
+    assert list(adapter.stream(CompletionRequest("what is the refund policy", scope=acme))) == ["".join(chunks)]
+
+
+def test_proxy_uses_cache_per_tenant_and_enforces_prompt_policy(monkeypatch):
+    inner = CountingAdapter()
+    monkeypatch.setenv("PAC_SEMANTIC_CACHE", "1")
+    monkeypatch.setenv("PAC_SEMANTIC_CACHE_THRESHOLDS", '{"*": 0.9}')
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: inner)
+    gateway_app._semantic_cache.cache_clear()
+    try:
+        client = TestClient(gateway_app.app)
+        r1 = client.post("/proxy/completion", json={"prompt": "Reset my password please"})
+        r2 = client.post("/proxy/completion", json={"prompt": "reset my password, please!"})
+        r3 = client.post(
+            "/proxy/completion",
+            json={"prompt": "reset my password, please!"},
+            headers={"X-PAC-Tenant": "acme"},
+        )
+        assert (r1.headers["X-PAC-Cache"], r2.headers["X-PAC-Cache"], r3.headers["X-PAC-Cache"]) == ("miss", "hit", "miss")
+        assert r2.json()["content"] == r1.json()["content"] and inner.calls == 2
+
+        blocked = client.post(
+            "/proxy/completion",
+            json={"prompt": "my SSN is ...", "context": {"contains_pii": True}},
+        )
+        assert blocked.status_code == 403 and blocked.json()["detail"]["action"] == "block"
+        assert inner.calls == 2
+
+        stats = client.get("/cache/stats").json()
+        assert stats["enabled"] and stats["hits"] == 1 and stats["misses"] == 2
+    finally:
+        gateway_app._semantic_cache.cache_clear()
+
+
+def test_retraining_does_not_block_lookups():
+    cache = SemanticCache(HashingEmbedder(), capacity=64, nlist=2, thresholds={"*": 0.9})
+    index = cache._index
+    fit, started, release = index.fit, threading.Event(), threading.Event()
+
+    def slow_fit(snapshot, *args):
+        started.set()
+        release.wait(5)
+        return fit(snapshot, *args)
+
+    index.fit = slow_fit
+    for i in range(index.train_at - 1):
+        request = CompletionRequest(f"question number {i}")
+        cache.store(request, cache.embed(request.prompt), CompletionResponse(content=str(i)))
+    last = CompletionRequest("the final question")
+    trainer = threading.Thread(
+        target=cache.store, args=(last, cache.embed(last.prompt), CompletionResponse(content="last"))
+    )
+    trainer.start()
+    assert started.wait(5)
+    probe = CompletionRequest("question number 3")
+    assert cache.lookup(probe, cache.embed(probe.prompt)).content == "3"  # not stuck behind k-means
+    release.set()
+    trainer.join(5)
+    assert cache.stats()["indexed"] and cache.lookup(last, cache.embed(last.prompt)).content == "last"
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.application.summarizer import ExtractiveSummarizer, split_sentences
+from policy_gateway.domain.models import CompletionResponse
+
+ARTICLE = (
+    "The river flooded the valley after three days of rain. "
+    "Farmers in the valley lost most of their crops to the flood. "
+    "A local bakery introduced a new rye bread. "
+    "Officials said the flood damage in the valley will take months to repair. "
+    "The rain is expected to stop by Friday, easing flood fears in the valley."
+)
+
+
+class ArticleAdapter:
+    def complete(self, request):
+        return CompletionResponse(content=ARTICLE, model=request.model)
+
+    def stream(self, request):
+        for sentence in split_sentences(ARTICLE):
+            yield sentence + " "
+
+
+def test_summary_keeps_central_sentences_in_original_order():
+    sentences = split_sentences(ARTICLE)
+    assert len(sentences) == 5
+
+    summarizer = ExtractiveSummarizer(ratio=0.4)
+    ranks = summarizer.scores(sentences)
+    assert int(ranks.argmin()) == 2  # the off-topic bakery sentence
+    assert abs(float(ranks.sum()) - 1.0) < 1e-6
+
+    summary = summarizer.summarize(ARTICLE)
+    kept = split_sentences(summary)
+    assert len(kept) == 2 and "bakery" not in summary
+    assert [sentences.index(s) for s in kept] == sorted(sentences.index(s) for s in kept)
+
+    assert summarizer.summarize("Just one sentence.") == "Just one sentence."
+    assert ExtractiveSummarizer(max_sentences=1).summarize(ARTICLE) in sentences
+
+
+def test_proxy_summarizes_when_output_policy_says_so(monkeypatch):
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: ArticleAdapter())
+    client = TestClient(gateway_app.app)
+
+    plain = client.post("/proxy/completion", json={"prompt": "news"})
+    assert plain.headers["X-PAC-Output-Action"] == "allow"
+    assert plain.json()["content"] == ARTICLE
+
+    guarded = {"prompt": "news", "context": {"verbatim_ratio": 0.5}}
+    summarized = client.post("/proxy/completion", json=guarded)
+    assert summarized.headers["X-PAC-Output-Action"] == "summarize"
+    expected = gateway_app._summarizer().summarize(ARTICLE)
+    assert summarized.json()["content"] == expected and expected != ARTICLE
+
+    streamed = client.post("/proxy/completion/stream", json=guarded)
+    assert streamed.headers["X-PAC-Output-Action"] == "summarize"
+    assert streamed.text == f"data: {expected}\n\n"
+
+
+def test_summarized_usage_counts_the_returned_summary(monkeypatch):
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: ArticleAdapter())
+    client = TestClient(gateway_app.app)
+    body = client.post("/proxy/completion", json={"prompt": "news", "context": {"verbatim_ratio": 0.5}}).json()
+    counter = gateway_app._token_counter()
+    usage = body["usage"]
+    assert usage["completion_tokens"] == counter.count(body["content"]) < counter.count(ARTICLE)
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
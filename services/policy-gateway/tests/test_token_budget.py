@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.domain.models import CompletionResponse
+from policy_gateway.infrastructure.tokenizers import TokenCounter
+
+POLICY = Path(__file__).resolve().parents[3] / "policies" / "adr-006.embedded-governance.yaml"
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return len(text.split())
+
+
+class EchoAdapter:
+    def __init__(self, usage=None):
+        self.usage = usage or {}
+        self.calls = 0
+
+    def complete(self, request):
+        self.calls += 1
+        return CompletionResponse(content="four words of output", model=request.model, usage=self.usage)
+
+    def stream(self, request):
+        self.calls += 1
+        yield "streamed"
+
+
+def test_counts_are_cached_per_paragraph_and_tokenizer():
+    counter = TokenCounter({"small": "regex"}, cache_size=8)
+    encoder = CountingEncoder()
+    counter._encoders["words"] = ("words", encoder)
+
+    system = "You are a careful assistant.\n\n"
+    assert counter.count(system + "First question here?", "words") == 8
+    assert counter.count(system + "Second one?", "words") == 7
+    assert encoder.calls == [system, "First question here?", "Second one?"]
+
+    assert counter.encoder("small")[0] == "regex"
+    assert counter.count("Hello, world!", "small") == 4
+    assert counter.count("", "small") == 0
+    assert all(isinstance(digest, bytes) and len(digest) == 16 for _, digest in counter._cache)
+
+
+@pytest.fixture
+def model_context(monkeypatch):
+    monkeypatch.setenv("PAC_MODEL_CONTEXT", '{"tiny": 10, "*": 100000}')
+    gateway_app._model_contexts.cache_clear()
+    yield
+    gateway_app._model_contexts.cache_clear()
+
+
+def test_budget_and_context_rejections_happen_before_upstream(monkeypatch, model_context):
+    adapter = EchoAdapter()
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: adapter)
+    monkeypatch.setenv("PAC_CONFIG", str(POLICY))
+    client = TestClient(gateway_app.app)
+
+    ok = client.post("/proxy/completion", json={"prompt": "short prompt", "model": "tiny", "max_tokens": 5})
+    assert ok.status_code == 200
+    assert ok.json()["usage"] == {"prompt_tokens": 2, "completion_tokens": 4, "total_tokens": 6}
+
+    too_long = client.post("/proxy/completion", json={"prompt": "short prompt", "model": "tiny", "max_tokens": 9})
+    assert too_long.status_code == 413
+    detail = too_long.json()["detail"]
+    assert detail["action"] == "reject" and detail["prompt_tokens"] == 2
+    assert "model context 10" in detail["reasons"][0]
+
+    huge = client.post("/proxy/completion/stream", json={"prompt": "word " * 16001})
+    assert huge.status_code == 413 and "over budget 16000" in huge.json()["detail"]["reasons"][0]
+    assert adapter.calls == 1
+
+
+def test_upstream_usage_is_kept_and_completed(monkeypatch):
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: EchoAdapter({"prompt_tokens": 7}))
+    client = TestClient(gateway_app.app)
+    usage = client.post("/proxy/completion", json={"prompt": "short prompt"}).json()["usage"]
+    assert usage == {"prompt_tokens": 7, "completion_tokens": 4, "total_tokens": 11}
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as gateway_app
+from policy_gateway.domain.models import CompletionResponse
+from policy_gateway.infrastructure.tracing import RingBufferExporter, Tracer, span
+
+
+class EchoAdapter:
+    def complete(self, request):
+        with span("upstream.http"):
+            return CompletionResponse(content="ok", model=request.model)
+
+    def stream(self, request):
+        yield "o"
+        with span("upstream.chunk"):  # opened in a later generator step
+            yield "k"
+
+
+@pytest.fixture
+def traced(monkeypatch):
+    def configure(rate):
+        monkeypatch.setenv("PAC_TRACE_SAMPLE_RATE", str(rate))
+        gateway_app._tracer.cache_clear()
+        return gateway_app._tracer().exporter
+
+    monkeypatch.setattr(gateway_app, "_build_llm_adapter", lambda: EchoAdapter())
+    monkeypatch.setenv("PAC_DEBUG_TOKEN", "s3cret")
+    yield configure
+    gateway_app._tracer.cache_clear()
+
+
+def test_spans_nest_across_layers(traced):
+    exporter = traced(1.0)
+    client = TestClient(gateway_app.app)
+    assert client.post("/proxy/completion", json={"prompt": "hi"}).status_code == 200
+
+    spans = {s["name"]: s for s in exporter.spans()}
+    root = spans["POST /proxy/completion"]
+    assert root["kind"] == "SPAN_KIND_SERVER" and root["parentSpanId"] == ""
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    for name in ("service.decide_prompt", "tokens.count", "adapter.build", "llm.complete", "service.decide_output"):
+        assert spans[name]["parentSpanId"] == root["spanId"]
+        assert spans[name]["traceId"] == root["traceId"]
+    assert spans["upstream.http"]["parentSpanId"] == spans["llm.complete"]["spanId"]
+    assert int(root["startTimeUnixNano"]) <= int(spans["llm.complete"]["startTimeUnixNano"])
+    assert int(spans["llm.complete"]["endTimeUnixNano"]) <= int(root["endTimeUnixNano"])
+
+    streamed = client.post("/proxy/completion/stream", json={"prompt": "hi"})
+    assert streamed.status_code == 200
+    spans = {s["name"]: s for s in exporter.spans()}
+    assert spans["upstream.chunk"]["parentSpanId"] == spans["llm.stream"]["spanId"]
+
+    before = exporter.spans()
+    listed = client.get("/debug/traces", headers={"Authorization": "Bearer s3cret"}).json()
+    assert listed["exporter"] == "memory" and listed["spans"] == before
+
+
+def test_sampling_and_traceparent(traced):
+    exporter = traced(0.0)
+    client = TestClient(gateway_app.app)
+    client.post("/filter/prompt", json={"prompt": "hi"})
+    assert exporter.spans() == []
+
+    trace_id, parent = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    client.post("/filter/prompt", json={"prompt": "hi"}, headers={"traceparent": f"00-{trace_id}-{parent}-00"})
+    assert exporter.spans() == []
+    client.post("/filter/prompt", json={"prompt": "hi"}, headers={"traceparent": f"00-{trace_id}-{parent}-01"})
+    root = [s for s in exporter.spans() if s["kind"] == "SPAN_KIND_SERVER"][0]
+    assert root["traceId"] == trace_id and root["parentSpanId"] == parent
+
+
+def test_errors_mark_span_status():
+    exporter = RingBufferExporter()
+    with pytest.raises(ValueError):
+        with Tracer(exporter, sample_rate=1.0).start("root"):
+            with span("child"):
+                raise ValueError("boom")
+    child, root = exporter.spans()
+    assert child["status"] == {"code": "STATUS_CODE_ERROR", "message": "ValueError: boom"}
+    assert root["status"]["code"] == "STATUS_CODE_ERROR"
+    with span("outside") as noop:
+        noop.set("ignored", 1)
+    assert len(exporter.spans()) == 2
+
+
+def busy_loop_for_profile(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_endpoint_is_protected_and_returns_folded_stacks(traced, monkeypatch):
+    traced(0.0)
+    client = TestClient(gateway_app.app)
+    assert client.get("/debug/profile?seconds=0.1").status_code == 403
+    assert client.get("/debug/profile?seconds=0.1", headers={"X-PAC-Debug-Token": "nope"}).status_code == 403
+    assert client.get("/debug/profile?seconds=61", headers={"X-PAC-Debug-Token": "s3cret"}).status_code == 422
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop_for_profile, args=(stop,), name="busy", daemon=True)
+    worker.start()
+    try:
+        resp = client.get("/debug/profile?seconds=0.3&hz=200", headers={"X-PAC-Debug-Token": "s3cret"})
+    finally:
+        stop.set()
+        worker.join()
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    lines = resp.text.splitlines()
+    busy = [line for line in lines if line.startswith("busy;") and "busy_loop_for_profile" in line]
+    assert busy and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    monkeypatch.delenv("PAC_DEBUG_TOKEN")
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
@@ -1,92 +1,730 @@
-from fastapi import FastAPI
+from datetime import datetime, timezone
+from fastapi import FastAPI, HTTPException, Query, Request
 from pydantic import BaseModel
-from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
-import os, json, time, hashlib, yaml
+from typing import Literal
+from prometheus_client import REGISTRY, Counter, CONTENT_TYPE_LATEST
+from fastapi.responses import Response, StreamingResponse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os, json, math, time, threading, yaml, asyncio, collections, multiprocessing, tempfile
+
+from risk_evidence.alerts import AlertEngine, IncidentLog
+from risk_evidence.archive import ColdArchive
+from risk_evidence.compaction import Compactor, parse_retention
+from risk_evidence.drift import DriftMonitor
+from risk_evidence.exposition import CachedExposition, GovernedMetricsCollector
+from risk_evidence.index import EvidenceIndex
+from risk_evidence.ingest import LineTooLongError, canonicalize_batch, ndjson_batches
+from risk_evidence.merkle import MerkleTree, RootCheckpoints, leaf_hash
+from risk_evidence.metrics import GOVERNED_METRICS, MetricStore, metric_spec
+from risk_evidence.schemas import Evidence
+from risk_evidence.sketch import DDSketch, LatencySketches
+from risk_evidence.storage import SegmentedLog
+from risk_evidence.store import EvidenceStore, evidence_id
+from risk_evidence.writer import Overloaded, WriteBehind
 
 app = FastAPI(title="Risk & Evidence Service")
 
 STORAGE = os.getenv("STORAGE_PATH", "/evidence")
+SEGMENT_BYTES = int(os.getenv("EVIDENCE_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+FSYNC = os.getenv("EVIDENCE_FSYNC", "1") != "0"
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+INGEST_BATCH = int(os.getenv("INGEST_BATCH", "512"))
+INGEST_MAX_LINE_BYTES = int(os.getenv("INGEST_MAX_LINE_BYTES", str(1024 * 1024)))
+INGEST_SPOOL_BYTES = 1024 * 1024
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+EVIDENCE_QUEUE_SIZE = int(os.getenv("EVIDENCE_QUEUE_SIZE", "1024"))
+EVIDENCE_WRITE_BATCH = int(os.getenv("EVIDENCE_WRITE_BATCH", "256"))
+COLD_AFTER_DAYS = float(os.getenv("EVIDENCE_COLD_AFTER_DAYS", "30"))
+RETENTION = parse_retention(os.getenv("EVIDENCE_RETENTION", ""))
+COMPACT_INTERVAL = float(os.getenv("EVIDENCE_COMPACT_INTERVAL", "300"))
+MERKLE_ROOT_INTERVAL = float(os.getenv("MERKLE_ROOT_INTERVAL", "60"))
+ROOT_SIGNING_KEY = os.getenv("RES_ROOT_SIGNING_KEY", "").encode() or None
 CFG_PATH = os.getenv("PAC_CONFIG", "/config/adr-006.embedded-governance.yaml")
 
 EVID_CNT = Counter("res_evidence_events_total", "Evidence events")
-PASS5 = Gauge("llm_pass_at_5", "Quality pass@5")
-FAIR = Gauge("fairness_subgroup_delta", "Fairness subgroup delta")
-HARM = Gauge("harmful_output_rate", "Safety harmful rate")
-DRIFT = Gauge("drift_psi", "Data drift PSI")
-LAT95 = Gauge("latency_p95_seconds", "Latency p95 seconds")
-AVAIL = Gauge("availability", "Availability")
+# Governed metrics are exported per model_version/namespace, capped at
+# METRIC_MAX_SERIES label sets per metric; evicted models drop their series.
+COLLECTOR = GovernedMetricsCollector(
+    GOVERNED_METRICS, max_series=int(os.getenv("METRIC_MAX_SERIES", "1000"))
+)
+REGISTRY.register(COLLECTOR)
+EXPOSITION = CachedExposition(REGISTRY, ttl=float(os.getenv("METRICS_CACHE_SECONDS", "5")))
 
+METRICS = MetricStore(
+    points=int(os.getenv("METRIC_HISTORY_POINTS", "2048")),
+    slots=int(os.getenv("METRIC_WINDOW_SLOTS", "12")),
+    slot_seconds=float(os.getenv("METRIC_SLOT_SECONDS", "300")),
+    max_models=int(os.getenv("METRIC_MAX_MODELS", "256")),
+    on_evict=COLLECTOR.forget_model,
+)
 
-def load_cfg():
+# p50/p95/p99 latency per model over the same window as the metric store.
+LATENCY_MAX_BINS = int(os.getenv("LATENCY_MAX_BINS", "2048"))
+LATENCY = LatencySketches(
+    slots=int(os.getenv("METRIC_WINDOW_SLOTS", "12")),
+    slot_seconds=float(os.getenv("METRIC_SLOT_SECONDS", "300")),
+    max_models=int(os.getenv("METRIC_MAX_MODELS", "256")),
+    relative_accuracy=float(os.getenv("LATENCY_RELATIVE_ACCURACY", "0.01")),
+    max_bins=LATENCY_MAX_BINS,
+)
+
+def alert_input(name):
     try:
-        if CFG_PATH.endswith((".yml", ".yaml")):
-            return yaml.safe_load(open(CFG_PATH))
-        return json.load(open(CFG_PATH))
-    except Exception:
-        return {}
+        return metric_spec(name).key
+    except KeyError:
+        return name  # free-form signal, e.g. privacy_incident_detected
 
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+INCIDENTS = IncidentLog()
+ALERTS = AlertEngine(INCIDENTS, resolve=alert_input, max_scopes=int(os.getenv("METRIC_MAX_SERIES", "1000")))
 
+DRIFT_MONITOR = DriftMonitor(
+    slots=int(os.getenv("DRIFT_WINDOW_SLOTS", "12")),
+    slot_seconds=float(os.getenv("DRIFT_SLOT_SECONDS", "300")),
+    max_models=int(os.getenv("DRIFT_MAX_MODELS", "256")),
+)
 
-class Evidence(BaseModel):
-    artifactType: str
-    modelVersion: str
-    metadata: dict | None = None
-    contentRef: str
+
+_store = None
+_roots = None
+_compactor = None
+_store_lock = threading.Lock()
+
+
+def evidence_store():
+    """Open the log, its index, Merkle tree and cold tier once; opening
+    recovers a torn log tail and re-indexes anything the index or tree
+    missed. Starts the background compactor."""
+    global _store, _roots, _compactor
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                log = SegmentedLog(STORAGE, segment_bytes=SEGMENT_BYTES, fsync=FSYNC)
+                index = EvidenceIndex(os.path.join(STORAGE, "index.sqlite3"))
+                tree = MerkleTree(os.path.join(STORAGE, "merkle"))
+                archive = ColdArchive(os.path.join(STORAGE, "cold"))
+                store = EvidenceStore(log, index, tree, archive)
+                _roots = RootCheckpoints(
+                    tree,
+                    os.path.join(STORAGE, "merkle", "roots.jsonl"),
+                    key=ROOT_SIGNING_KEY,
+                    interval=MERKLE_ROOT_INTERVAL,
+                )
+                _compactor = Compactor(
+                    store,
+                    cold_after=COLD_AFTER_DAYS * 86400,
+                    retention=RETENTION,
+                    interval=COMPACT_INTERVAL,
+                )
+                _compactor.start()
+                _store = store
+    return _store
+
+
+# Ingest runs on its own executors rather than Starlette's shared threadpool,
+# which only serves the remaining sync (read) handlers; /health and /metrics
+# run on the event loop, so neither saturates the other. Observations (metric
+# store, labeled gauges, alert evaluation) are applied in order on one thread.
+HASH_EXECUTOR = ThreadPoolExecutor(HASH_WORKERS, thread_name_prefix="res-hash")
+STORAGE_EXECUTOR = ThreadPoolExecutor(1, thread_name_prefix="res-storage")
+METRICS_EXECUTOR = ThreadPoolExecutor(1, thread_name_prefix="res-metrics")
+OBSERVE_EXECUTOR = ThreadPoolExecutor(1, thread_name_prefix="res-observe")
+WRITER = WriteBehind(
+    lambda items: evidence_store().put_hashed(items),
+    STORAGE_EXECUTOR,
+    max_pending=EVIDENCE_QUEUE_SIZE,
+    max_batch=EVIDENCE_WRITE_BATCH,
+)
+
+
+def signed_root(force=False):
+    evidence_store()
+    return _roots.latest(force=force)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def ingest_pool():
+    """Process pool for canonicalizing/hashing bulk uploads (None: run in threads).
+
+    Spawned rather than forked: the server is multi-threaded by the time the
+    first upload arrives."""
+    global _pool
+    if _pool is None and INGEST_WORKERS > 0:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(INGEST_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def cfg_version():
+    try:
+        st = os.stat(CFG_PATH)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+_cfg = (object(), {})
+
+
+def load_cfg():
+    """Parsed PAC_CONFIG; the file is re-read only when it changes."""
+    global _cfg
+    version = cfg_version()
+    if version != _cfg[0]:
+        try:
+            with open(CFG_PATH) as fh:
+                cfg = yaml.safe_load(fh) if CFG_PATH.endswith((".yml", ".yaml")) else json.load(fh)
+        except Exception:
+            cfg = {}
+        _cfg = (version, cfg or {})
+    return _cfg[1]
+
+
+def alert_engine():
+    """Alert conditions are recompiled only when the config file changes."""
+    version = cfg_version()
+    if version != ALERTS.version:
+        ALERTS.configure(load_cfg(), version)
+    return ALERTS
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
 
 
 @app.post("/evidence", status_code=201)
-def evidence(ev: Evidence):
-    EVID_CNT.inc()
+async def evidence(ev: Evidence):
+    # Content-addressed: identical evidence is stored once and re-posting it
+    # returns the original record. Durable when the write-behind queue
+    # resolves; concurrent posts share one append and fsync.
     content = ev.model_dump()
-    h = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
-    path = f"{STORAGE}/{int(time.time())}-{h}.json"
-    os.makedirs(STORAGE, exist_ok=True)
-    open(path, "w").write(json.dumps(content))
+    eid = await asyncio.get_running_loop().run_in_executor(HASH_EXECUTOR, evidence_id, content)
+    try:
+        r = await WRITER.submit((eid, content))
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    EVID_CNT.inc()
+    return {
+        "id": r.id,
+        "evidence_hash": f"sha256:{r.id}",
+        "stored_at": r.stored_at,
+        "duplicate": r.duplicate,
+    }
+
+
+@app.post("/evidence/bulk")
+async def evidence_bulk(request: Request):
+    """Ingest an NDJSON body of Evidence records and return one NDJSON result
+    per record (`{"line", "id", "evidence_hash", "stored_at", "duplicate"}` or
+    `{"line", "error"}`).
+
+    Batches are hashed in the worker pool while the previous batch is being
+    written, and each batch is one storage append. Results are spooled (to
+    disk past 1 MiB) so memory stays bounded for any upload size.
+
+    A line over INGEST_MAX_LINE_BYTES ends the upload: every line before it
+    is stored and reported, followed by `{"line", "error": "line too long"}`.
+    The rest of the body is not read."""
+    loop = asyncio.get_running_loop()
+    pool = ingest_pool()
+    store = await loop.run_in_executor(STORAGE_EXECUTOR, evidence_store)
+    out = tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_BYTES)
+    counts = collections.Counter()
+    pending = collections.deque()
+
+    async def write_next():
+        batch = await pending.popleft()
+        good = [(eid, content) for _, eid, content in batch if eid is not None]
+        stored = iter(await loop.run_in_executor(STORAGE_EXECUTOR, store.put_hashed, good) if good else ())
+        lines = []
+        for line, eid, content in batch:
+            if eid is None:
+                counts["errors"] += 1
+                lines.append({"line": line, "error": content})
+                continue
+            r = next(stored)
+            counts["duplicates" if r.duplicate else "stored"] += 1
+            lines.append({
+                "line": line,
+                "id": r.id,
+                "evidence_hash": f"sha256:{r.id}",
+                "stored_at": r.stored_at,
+                "duplicate": r.duplicate,
+            })
+        out.write("".join(json.dumps(l) + "\n" for l in lines).encode())
+
+    try:
+        async for first, lines in ndjson_batches(request.stream(), INGEST_BATCH, INGEST_MAX_LINE_BYTES):
+            pending.append(loop.run_in_executor(pool, canonicalize_batch, first, lines))
+            # Keep hashing ahead of the writer, but only one batch per worker.
+            while len(pending) > max(INGEST_WORKERS, 1):
+                await write_next()
+        while pending:
+            await write_next()
+    except LineTooLongError as e:
+        # Earlier lines are committed either way; report them before the stop.
+        while pending:
+            await write_next()
+        counts["errors"] += 1
+        out.write((json.dumps({"line": e.line, "error": "line too long"}) + "\n").encode())
+    EVID_CNT.inc(counts["stored"] + counts["duplicates"])
+
+    out.seek(0)
+
+    def body():
+        with out:
+            while chunk := out.read(64 * 1024):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-RES-Stored": str(counts["stored"]),
+            "X-RES-Duplicates": str(counts["duplicates"]),
+            "X-RES-Errors": str(counts["errors"]),
+        },
+    )
+
+
+@app.post("/evidence/compact")
+def evidence_compact():
+    """Run one compaction pass now (it also runs every EVIDENCE_COMPACT_INTERVAL)."""
+    evidence_store()
+    return _compactor.run_once()
+
+
+def proof_hex(proof):
+    return [h.hex() for h in proof]
+
+
+@app.get("/merkle/root")
+def merkle_root(fresh: bool = False):
+    """Latest signed tree head; `fresh=true` cuts a new one if the tree grew."""
+    return signed_root(force=fresh)
+
+
+@app.get("/merkle/proof/inclusion/{evidence_id}")
+def merkle_inclusion(evidence_id: str, tree_size: int | None = None):
+    store = evidence_store()
+    evidence_id = evidence_id.removeprefix("sha256:")
+    seq = store.seq_of(evidence_id)
+    if seq is None:
+        raise HTTPException(status_code=404, detail="evidence not found")
+    size = store.tree.size if tree_size is None else tree_size
+    try:
+        proof = store.tree.inclusion_proof(seq, size)
+        root = store.tree.root(size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "id": evidence_id,
+        "leaf_index": seq,
+        "leaf_hash": leaf_hash(bytes.fromhex(evidence_id)).hex(),
+        "tree_size": size,
+        "root_hash": root.hex(),
+        "audit_path": proof_hex(proof),
+    }
+
+
+@app.get("/merkle/proof/consistency")
+def merkle_consistency(first: int, second: int | None = None):
+    tree = evidence_store().tree
+    second = tree.size if second is None else second
+    try:
+        proof = tree.consistency_proof(first, second)
+        roots = tree.root(first), tree.root(second)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "first": first,
+        "second": second,
+        "first_root": roots[0].hex(),
+        "second_root": roots[1].hex(),
+        "proof": proof_hex(proof),
+    }
+
+
+def evidence_item(record, summary=False):
+    body = record["evidence"]
+    if summary:
+        # Listing views fetch metadata on demand via GET /evidence/{id}.
+        meta = body.get("metadata")
+        body = {k: v for k, v in body.items() if k != "metadata"}
+        body["metadata_bytes"] = len(json.dumps(meta)) if meta is not None else 0
     return {
-        "id": h,
-        "evidence_hash": f"sha256:{h}",
-        "stored_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "id": record["id"],
+        "evidence_hash": f"sha256:{record['id']}",
+        "stored_at": record["stored_at"],
+        **body,
     }
 
 
+def epoch(dt):
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@app.get("/evidence")
+def evidence_query(
+    modelVersion: str | None = None,
+    artifactType: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=1000),
+    view: Literal["full", "summary"] = "full",
+):
+    try:
+        records, next_cursor = evidence_store().query(
+            model_version=modelVersion,
+            artifact_type=artifactType,
+            since=epoch(since),
+            until=epoch(until),
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    summary = view == "summary"
+    return {"items": [evidence_item(r, summary) for r in records], "next_cursor": next_cursor}
+
+
+@app.get("/evidence/{evidence_id}")
+def evidence_get(evidence_id: str):
+    record = evidence_store().get(evidence_id.removeprefix("sha256:"))
+    if record is None:
+        raise HTTPException(status_code=404, detail="evidence not found")
+    return evidence_item(record)
+
+
 @app.get("/metrics")
-def metrics():
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+async def metrics():
+    # Rendered at most once per METRICS_CACHE_SECONDS however often it is
+    # scraped, off the event loop and off the shared threadpool.
+    body = EXPOSITION.fresh()
+    if body is None:
+        body = await asyncio.get_running_loop().run_in_executor(METRICS_EXECUTOR, EXPOSITION.render)
+    return Response(body, media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricValues(BaseModel):
+    modelVersion: str
+    # metric key ("quality.pass_at_5"), Prometheus name or alias -> value
+    values: dict[str, float]
+    ts: float | None = None
+
+
+class Observation(BaseModel):
+    metric: str
+    modelVersion: str
+    namespace: str = "default"
+    value: float
+    ts: float | None = None
+
+
+class ObservationBatch(BaseModel):
+    # Objects, or compact [metric, modelVersion, namespace, value, ts] rows.
+    observations: list[Observation | tuple[str, str, str, float, float | None]]
+
+
+def record_observations(points):
+    """Record (metric, model, namespace, value, ts) points: one MetricStore
+    update and one labeled-gauge update for the whole batch."""
+    now = time.time()
+    resolved, latest = [], {}
+    for i, (name, model, ns, value, ts) in enumerate(points):
+        try:
+            key = metric_spec(name).key
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"observation {i}: unknown metric {name}")
+        ts = now if ts is None else ts
+        resolved.append((model, key, value, ts))
+        prev = latest.get((key, model, ns))
+        if prev is None or ts >= prev[0]:
+            latest[(key, model, ns)] = (ts, value)
+    METRICS.observe_many(resolved, now=now)
+    current = [(k, m, ns, v) for (k, m, ns), (_, v) in latest.items()]
+    overflowed = COLLECTOR.set_many(current)
+    # Only alerts reading these metrics are re-evaluated, inline.
+    alerts = alert_engine().update(current, now=now)
+    return {"accepted": len(resolved), "overflowed": overflowed, "alerts": alerts}
+
+
+async def observe(fn, *args):
+    """Run observation work on OBSERVE_EXECUTOR, off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(OBSERVE_EXECUTOR, fn, *args)
+
+
+@app.post("/observations", status_code=202)
+async def observations(batch: ObservationBatch):
+    points = [
+        (o.metric, o.modelVersion, o.namespace, o.value, o.ts) if isinstance(o, Observation) else o
+        for o in batch.observations
+    ]
+    return await observe(record_observations, points)
+
+
+@app.post("/risk/metrics", status_code=202)
+async def risk_metrics(body: MetricValues):
+    await observe(record_observations, [(k, body.modelVersion, "default", v, body.ts) for k, v in body.values.items()])
+    return {"modelVersion": body.modelVersion, "recorded": len(body.values)}
+
+
+class LatencyReport(BaseModel):
+    modelVersion: str
+    namespace: str = "default"
+    # Raw request latencies in seconds and/or a DDSketch from another
+    # aggregator ({relative_accuracy, offset, bins, zero_count, count, ...}).
+    samples: list[float] | None = None
+    sketch: dict | None = None
+    ts: float | None = None
+
+
+def latency_quantiles(model, qs=(0.5, 0.95, 0.99)):
+    q = LATENCY.quantiles(model, qs) if model else None
+    return {
+        "model_version": model,
+        "window_seconds": LATENCY.window_seconds,
+        "count": int(LATENCY.merged(model).count) if q else 0,
+        "quantiles": q or {f"p{x * 100:g}": None for x in qs},
+    }
+
+
+def record_latency(body):
+    try:
+        sketch = DDSketch.from_dict(body.sketch, max_bins=LATENCY_MAX_BINS) if body.sketch is not None else None
+        LATENCY.add(body.modelVersion, samples=body.samples, sketch=sketch, ts=body.ts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    report = latency_quantiles(body.modelVersion)
+    p95 = report["quantiles"]["p95"]
+    if p95 is not None:
+        record_observations([("latency.p95_seconds", body.modelVersion, body.namespace, p95, None)])
+    return report
+
+
+@app.post("/latency", status_code=202)
+async def latency(body: LatencyReport):
+    """Fold gateway latencies into the model's windowed sketch and publish
+    the window p95 as latency.p95_seconds."""
+    if body.samples is None and body.sketch is None:
+        raise HTTPException(status_code=400, detail="samples or sketch is required")
+    return await observe(record_latency, body)
+
+
+@app.get("/latency/quantiles")
+def latency_get(model: str, q: list[float] = Query([0.5, 0.95, 0.99])):
+    if not all(0 <= x <= 1 for x in q):
+        raise HTTPException(status_code=400, detail="quantiles must be between 0 and 1")
+    return latency_quantiles(model, tuple(q))
+
+
+@app.get("/latency/sketch")
+def latency_sketch(model: str):
+    """The merged window sketch, for aggregating across RES instances."""
+    sketch = LATENCY.merged(model)
+    if sketch is None:
+        raise HTTPException(status_code=404, detail="no latency samples in the window")
+    return sketch.to_dict()
 
 
 @app.get("/risk/snapshot")
-def snapshot(model: str | None = None):
-    # Simple demo snapshot; integrate your eval feeds here
-    snap = {
-        "model_version": model or "demo",
-        "quality": {"pass_at_5": PASS5._value.get() or 0.84},
-        "fairness": {"subgroup_delta": FAIR._value.get() or 0.03},
-        "safety": {"harmful_rate": HARM._value.get() or 0.002},
-        "privacy": {"reid_risk": 0.0006},
-        "drift": {"psi": DRIFT._value.get() or 0.08},
+def snapshot(
+    model: str | None = None,
+    history: bool = False,
+    max_points: int = Query(200, ge=2, le=5000),
+):
+    """Current posture of one model version (default: the most recently
+    updated one). Metric values are the latest observation, or null when
+    nothing was reported; `window` holds aggregates over the metric window.
+    `history=true` adds per-metric [ts, value] points, downsampled to
+    `max_points`. evidence_hash is the latest signed Merkle root over all
+    evidence stored so far."""
+    root = signed_root()
+    model = model or METRICS.latest_model()
+    summary = (METRICS.summary(model) if model else None) or {}
+    snap = {"model_version": model}
+    for m in GOVERNED_METRICS:
+        s = summary.get(m.key)
+        snap.setdefault(m.section, {})[m.field] = s["value"] if s else None
+    q = LATENCY.quantiles(model) if model else None
+    if q:
+        snap["latency"].update(p50_seconds=q["p50"], p99_seconds=q["p99"])
+    snap.update({
+        "window": {k: s["window"] for k, s in summary.items()},
+        "window_seconds": METRICS.window_seconds,
         "eu_ai_act_tier": "Limited",
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "evidence_hash": "sha256:demo",
-    }
+        "evidence_hash": f"sha256:{root['root_hash']}",
+        "evidence_root": root,
+    })
+    if history:
+        snap["history"] = METRICS.history(model, max_points=max_points) if model else {}
     return snap
 
 
+@app.get("/risk/models")
+def risk_models():
+    """Model versions with metric history, least recently updated first."""
+    return {"models": METRICS.models()}
+
+
+@app.get("/risk/history")
+def risk_history(
+    model: str,
+    metric: str | None = None,
+    since: float | None = None,
+    max_points: int = Query(500, ge=2, le=5000),
+):
+    """Per-metric [ts, value] points for one model, bucket-averaged down to
+    `max_points` server-side; `metric` narrows to one series."""
+    key = None
+    if metric is not None:
+        try:
+            key = metric_spec(metric).key
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"unknown metric {metric}")
+    series = METRICS.history(model, since=-math.inf if since is None else since, max_points=max_points)
+    if key is not None:
+        series = {key: series[key]} if key in series else {}
+    return {"model_version": model, "max_points": max_points, "series": series}
+
+
 class Incident(BaseModel):
     severity: str
     description: str
     refs: list[str] | None = None
+    # While an incident with this key is open, re-posting joins it.
+    dedupe_key: str | None = None
 
 
 @app.post("/incident", status_code=201)
-def incident(body: Incident):
-    h = hashlib.sha256(f"{time.time()}-{body.description}".encode()).hexdigest()
+async def incident(body: Incident):
+    opened, duplicate = INCIDENTS.open(body.severity, body.description, body.refs, body.dedupe_key)
+    return {
+        "id": opened["id"],
+        "created_at": opened["created_at"],
+        "link": opened["link"],
+        "duplicate": duplicate,
+    }
+
+
+@app.get("/incident")
+async def incident_list():
+    return {"open": INCIDENTS.open_incidents()}
+
+
+@app.post("/incident/{incident_id}/resolve")
+async def incident_resolve(incident_id: str):
+    closed = INCIDENTS.resolve(incident_id)
+    if closed is None:
+        raise HTTPException(status_code=404, detail="no open incident with this id")
+    return closed
+
+
+class AlertSignals(BaseModel):
+    modelVersion: str
+    namespace: str = "default"
+    # Alert inputs that are not governed metrics, e.g. privacy_incident_detected.
+    values: dict[str, float | bool]
+
+
+@app.post("/alerts/signals")
+async def alert_signals(body: AlertSignals):
+    points = [(alert_input(k), body.modelVersion, body.namespace, float(v)) for k, v in body.values.items()]
+    return {"alerts": await observe(lambda: alert_engine().update(points))}
+
+
+@app.get("/alerts")
+def alerts():
+    engine = alert_engine()
     return {
-        "id": h,
-        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "link": f"http://tickets/{h}",
+        "rules": [
+            {"name": r.name, "severity": r.severity, "condition": r.condition, "inputs": list(r.inputs), "actions": list(r.actions)}
+            for r in engine.rules
+        ],
+        "errors": engine.errors,
+        "firing": engine.firing(),
     }
+
+
+class DriftReference(BaseModel):
+    modelVersion: str
+    feature: str
+    # Either a histogram (interior `edges` + `counts`, len(edges) + 1 bins)
+    # or raw reference `values` binned into `bins` quantiles.
+    edges: list[float] | None = None
+    counts: list[float] | None = None
+    values: list[float] | None = None
+    bins: int = 10
+
+
+class DriftBatch(BaseModel):
+    modelVersion: str
+    features: dict[str, list[float]]
+
+
+def drift_status(psi):
+    t = (load_cfg().get("thresholds") or {}).get("drift", {}).get("psi", {})
+    if psi is None:
+        return "unknown"
+    if t.get("retrain_at") is not None and psi >= t["retrain_at"]:
+        return "retrain"
+    if t.get("warn_at") is not None and psi >= t["warn_at"]:
+        return "warn"
+    return "ok"
+
+
+def drift_report(model, psi_by_feature):
+    known = [v for v in psi_by_feature.values() if v is not None]
+    worst = max(known) if known else None
+    return {
+        "model_version": model,
+        "psi": psi_by_feature,
+        "max_psi": worst,
+        "status": drift_status(worst),
+        "window_seconds": DRIFT_MONITOR.window_seconds,
+    }
+
+
+@app.put("/drift/reference", status_code=201)
+def drift_reference(ref: DriftReference):
+    try:
+        d = DRIFT_MONITOR.set_reference(
+            ref.modelVersion,
+            ref.feature,
+            edges=ref.edges,
+            counts=ref.counts,
+            values=ref.values,
+            bins=ref.bins,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"modelVersion": ref.modelVersion, "feature": ref.feature, "bins": int(d.expected.size)}
+
+
+def record_drift(batch):
+    DRIFT_MONITOR.observe(batch.modelVersion, batch.features)
+    report = drift_report(batch.modelVersion, DRIFT_MONITOR.model_psi(batch.modelVersion))
+    if report["max_psi"] is not None:
+        record_observations([("drift.psi", batch.modelVersion, "default", report["max_psi"], None)])
+    return report
+
+
+@app.post("/drift/observe")
+async def drift_observe(batch: DriftBatch):
+    return await observe(record_drift, batch)
+
+
+@app.get("/drift/psi")
+def drift_psi(model: str):
+    return drift_report(model, DRIFT_MONITOR.model_psi(model))
@@ -0,0 +1 @@
+"""Building blocks for the Risk & Evidence Service (RES)."""
@@ -0,0 +1,413 @@
+"""Event-driven evaluation of the ADR-006 `monitoring.alerts` conditions.
+
+Conditions such as
+
+    harmful_output_rate > thresholds.safety.harmful_rate.target_max OR privacy_incident_detected == true
+
+are parsed once per config version into a Python lambda: `AND`/`OR`/`NOT`
+and `true`/`false` map to their Python forms, `thresholds.*` references are
+replaced by the configured numbers (so `target * 0.95` is folded to a
+constant by the compiler), and every other name becomes a lookup of the
+latest observed value for that input. Only comparisons, boolean and
+arithmetic operators are accepted.
+
+Inputs that have not been observed read as NaN, so comparisons against them
+are false. A dependency index from input to alerts means an observation
+re-evaluates only the alerts that read it, per (model_version, namespace).
+An alert opens an incident when it starts firing; incidents are
+deduplicated on `alert:<name>:<model_version>:<namespace>` while open.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+Scope = Tuple[str, str]  # (model_version, namespace)
+
+_KEYWORDS = {"AND": "and", "OR": "or", "NOT": "not", "TRUE": "True", "FALSE": "False"}
+_KEYWORD_RE = re.compile(r"\b(and|or|not|true|false)\b", re.IGNORECASE)
+_SEVERITY_RE = re.compile(r"^(sev\d)")
+
+_COMPARE = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+_ARITH = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_UNARY = (ast.Not, ast.USub, ast.UAdd)
+
+
+class ConditionError(ValueError):
+    pass
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _lookup(tree: Mapping[str, Any], path: str) -> Any:
+    node: Any = tree
+    for part in path.split("."):
+        if not isinstance(node, Mapping) or part not in node:
+            raise ConditionError(f"unknown reference {path}")
+        node = node[part]
+    if isinstance(node, bool) or not isinstance(node, (int, float)):
+        raise ConditionError(f"{path} is not a number")
+    return node
+
+
+class _Rewriter(ast.NodeTransformer):
+    def __init__(self, cfg: Mapping[str, Any], resolve: Callable[[str], str]) -> None:
+        self._cfg = cfg
+        self._resolve = resolve
+        self.inputs: List[str] = []
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        allowed = (
+            isinstance(node, (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.Load))
+            or (isinstance(node, ast.UnaryOp) and isinstance(node.op, _UNARY))
+            or (isinstance(node, ast.BinOp) and isinstance(node.op, _ARITH))
+            or (isinstance(node, ast.Compare) and all(isinstance(op, _COMPARE) for op in node.ops))
+            or isinstance(node, _COMPARE + _ARITH + _UNARY)
+            or (isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)))
+        )
+        if not allowed:
+            raise ConditionError(f"unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def _name(self, node: ast.AST) -> ast.AST:
+        name = _dotted(node)
+        if name is None:
+            raise ConditionError("unsupported attribute access")
+        if name.startswith("thresholds."):
+            return ast.copy_location(ast.Constant(_lookup(self._cfg, name)), node)
+        key = self._resolve(name)
+        if key not in self.inputs:
+            self.inputs.append(key)
+        # m.get(key, nan)
+        call = ast.Call(
+            func=ast.Attribute(value=ast.Name("m", ast.Load()), attr="get", ctx=ast.Load()),
+            args=[ast.Constant(key), ast.Name("nan", ast.Load())],
+            keywords=[],
+        )
+        return ast.copy_location(call, node)
+
+    visit_Name = _name
+    visit_Attribute = _name
+
+
+class AlertRule(NamedTuple):
+    name: str
+    severity: str
+    condition: str
+    actions: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    evaluate: Callable[[Mapping[str, float]], bool]
+
+
+def compile_condition(
+    condition: str,
+    cfg: Mapping[str, Any],
+    resolve: Callable[[str], str] = lambda name: name,
+) -> Tuple[Callable[[Mapping[str, float]], bool], Tuple[str, ...]]:
+    """Compile a condition string; return (predicate over input values, inputs).
+
+    `resolve` maps a name in the condition to the input key it reads."""
+    source = _KEYWORD_RE.sub(lambda m: _KEYWORDS[m.group(1).upper()], condition)
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"cannot parse condition: {e.msg}") from None
+    rewriter = _Rewriter(cfg, resolve)
+    body = rewriter.visit(tree).body
+    fn = ast.Expression(
+        ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg("m")], kwonlyargs=[], kw_defaults=[], defaults=[]
+            ),
+            body=body,
+        )
+    )
+    code = compile(ast.fix_missing_locations(fn), f"<alert: {condition}>", "eval")
+    predicate = eval(code, {"__builtins__": {}, "nan": math.nan})
+    return predicate, tuple(rewriter.inputs)
+
+
+def monitoring_aliases(cfg: Mapping[str, Any]) -> Dict[str, str]:
+    """Map `monitoring.metrics` names to the `<domain>.<metric>` whose
+    thresholds they reference (answer_quality_pass_at_5 -> quality.pass_at_5)."""
+    aliases: Dict[str, str] = {}
+    for metric in ((cfg or {}).get("monitoring") or {}).get("metrics") or []:
+        for ref in metric.values():
+            if isinstance(ref, str) and ref.startswith("thresholds."):
+                parts = ref.split(".")
+                if len(parts) >= 3:
+                    aliases[str(metric.get("name"))] = f"{parts[1]}.{parts[2]}"
+                    break
+    return aliases
+
+
+def compile_alerts(
+    cfg: Mapping[str, Any], resolve: Callable[[str], str] = lambda name: name
+) -> Tuple[List[AlertRule], Dict[str, str]]:
+    """Compile `monitoring.alerts`; return (rules, {alert name: error}).
+
+    Names are first mapped through `monitoring.metrics`, then `resolve`."""
+    rules: List[AlertRule] = []
+    errors: Dict[str, str] = {}
+    aliases = monitoring_aliases(cfg)
+    base_resolve = resolve
+
+    def resolve(name: str) -> str:
+        return base_resolve(aliases.get(name, name))
+
+    for i, alert in enumerate(((cfg or {}).get("monitoring") or {}).get("alerts") or []):
+        name = str(alert.get("name") or f"alert_{i}")
+        try:
+            predicate, inputs = compile_condition(str(alert.get("condition", "")), cfg, resolve)
+        except ConditionError as e:
+            log.warning("alert %s not loaded: %s", name, e)
+            errors[name] = str(e)
+            continue
+        actions = alert.get("action") or []
+        severity = _SEVERITY_RE.match(name)
+        rules.append(
+            AlertRule(
+                name=name,
+                severity=alert.get("severity") or (severity.group(1) if severity else "sev3"),
+                condition=str(alert["condition"]),
+                actions=tuple([actions] if isinstance(actions, str) else actions),
+                inputs=inputs,
+                evaluate=predicate,
+            )
+        )
+    return rules, errors
+
+
+class IncidentLog:
+    """Open incidents, deduplicated by key while they stay open."""
+
+    def __init__(self) -> None:
+        self._open: Dict[str, Dict] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def open(
+        self,
+        severity: str,
+        description: str,
+        refs: Optional[List[str]] = None,
+        dedupe_key: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Tuple[Dict, bool]:
+        """Return (incident, duplicate); a duplicate bumps `occurrences`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            existing = self._by_key.get(dedupe_key) if dedupe_key else None
+            if existing is not None:
+                incident = self._open[existing]
+                incident["occurrences"] += 1
+                return dict(incident), True
+            h = hashlib.sha256(f"{now}-{description}".encode()).hexdigest()
+            incident = {
+                "id": h,
+                "severity": severity,
+                "description": description,
+                "refs": list(refs or []),
+                "dedupe_key": dedupe_key,
+                "occurrences": 1,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+                "link": f"http://tickets/{h}",
+            }
+            self._open[h] = incident
+            if dedupe_key:
+                self._by_key[dedupe_key] = h
+            return dict(incident), False
+
+    def resolve(self, incident_id: str) -> Optional[Dict]:
+        with self._lock:
+            incident = self._open.pop(incident_id, None)
+            if incident is not None and incident["dedupe_key"]:
+                self._by_key.pop(incident["dedupe_key"], None)
+            return incident
+
+    def open_incidents(self) -> List[Dict]:
+        with self._lock:
+            return [dict(i) for i in self._open.values()]
+
+
+class AlertEngine:
+    def __init__(
+        self,
+        incidents: IncidentLog,
+        resolve: Callable[[str], str] = lambda name: name,
+        max_scopes: int = 1024,
+    ) -> None:
+        self._incidents = incidents
+        self._resolve = resolve
+        self._max_scopes = max_scopes
+        self._rules: List[AlertRule] = []
+        self._deps: Dict[str, List[int]] = {}
+        self._values: "OrderedDict[Scope, Dict[str, float]]" = OrderedDict()
+        self._firing: Dict[Tuple[str, str, str], Dict] = {}
+        self._version: Any = object()
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self) -> List[AlertRule]:
+        return list(self._rules)
+
+    def configure(self, cfg: Mapping[str, Any], version: Any = None) -> List[Dict]:
+        """Recompile for a new config version and re-check every scope.
+
+        Returns transitions caused by changed thresholds or conditions; a
+        repeated call with the same `version` is a no-op."""
+        with self._lock:
+            if version is not None and version == self._version:
+                return []
+            rules, errors = compile_alerts(cfg, self._resolve)
+            deps: Dict[str, List[int]] = {}
+            for i, rule in enumerate(rules):
+                for key in rule.inputs:
+                    deps.setdefault(key, []).append(i)
+            self._rules, self._deps, self.errors, self._version = rules, deps, errors, version
+            names = {r.name for r in rules}
+            for state in [k for k in self._firing if k[0] not in names]:
+                del self._firing[state]
+            events = []
+            for scope in self._values:
+                events += self._evaluate(scope, range(len(rules)))
+        return self._dispatch(events)
+
+    @property
+    def version(self) -> Any:
+        return self._version
+
+    def update(self, points: Iterable[Tuple[str, str, str, float]], now: Optional[float] = None) -> List[Dict]:
+        """Apply (input key, model_version, namespace, value) points and
+        evaluate the alerts that read them; return firing/resolved transitions."""
+        now = time.time() if now is None else now
+        events: List[Dict] = []
+        with self._lock:
+            dirty: Dict[Scope, set] = {}
+            for key, model, namespace, value in points:
+                scope = (model, namespace)
+                values = self._values.get(scope)
+                if values is None:
+                    values = self._values[scope] = {}
+                    while len(self._values) > self._max_scopes:
+                        evicted, _ = self._values.popitem(last=False)
+                        events += self._forget(evicted, now)
+                self._values.move_to_end(scope)
+                values[key] = float(value)
+                affected = self._deps.get(key)
+                if affected:
+                    dirty.setdefault(scope, set()).update(affected)
+            for scope, rule_ids in dirty.items():
+                if scope in self._values:
+                    events += self._evaluate(scope, sorted(rule_ids), now)
+        return self._dispatch(events)
+
+    def _evaluate(self, scope: Scope, rule_ids: Iterable[int], now: Optional[float] = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        values = self._values[scope]
+        events = []
+        for i in rule_ids:
+            rule = self._rules[i]
+            try:
+                firing = bool(rule.evaluate(values))
+            except ArithmeticError:
+                firing = False
+            state_key = (rule.name, *scope)
+            was = state_key in self._firing
+            if firing == was:
+                continue
+            event = {
+                "alert": rule.name,
+                "severity": rule.severity,
+                "model_version": scope[0],
+                "namespace": scope[1],
+                "state": "firing" if firing else "resolved",
+                "actions": list(rule.actions) if firing else [],
+                "inputs": {k: values.get(k) for k in rule.inputs},
+                "at": now,
+            }
+            if firing:
+                self._firing[state_key] = {"since": now, "incident": None, "rule": rule}
+            else:
+                del self._firing[state_key]
+            events.append(event)
+        return events
+
+    def _forget(self, scope: Scope, now: float) -> List[Dict]:
+        """Resolve the alerts of a scope whose values were evicted; with its
+        inputs gone they could never resolve on their own."""
+        events = []
+        for state_key in [k for k in self._firing if k[1:] == scope]:
+            state = self._firing.pop(state_key)
+            rule = state["rule"]
+            events.append({
+                "alert": rule.name,
+                "severity": rule.severity,
+                "model_version": scope[0],
+                "namespace": scope[1],
+                "state": "resolved",
+                "actions": [],
+                "inputs": {},
+                "at": now,
+                "evicted": True,
+            })
+        return events
+
+    def _dispatch(self, events: List[Dict]) -> List[Dict]:
+        """Open (or join) incidents for newly firing alerts, outside the lock."""
+        for event in events:
+            if event["state"] != "firing":
+                log.info("alert %s resolved for %s/%s", event["alert"], event["model_version"], event["namespace"])
+                continue
+            log.warning(
+                "alert %s firing for %s/%s: %s",
+                event["alert"], event["model_version"], event["namespace"], ", ".join(event["actions"]),
+            )
+            rule_inputs = ", ".join(f"{k}={v}" for k, v in event["inputs"].items())
+            incident, duplicate = self._incidents.open(
+                event["severity"],
+                f"{event['alert']} on {event['model_version']} ({event['namespace']}): {rule_inputs}",
+                refs=[f"alert:{event['alert']}"],
+                dedupe_key=f"alert:{event['alert']}:{event['model_version']}:{event['namespace']}",
+                now=event["at"],
+            )
+            event["incident"] = {"id": incident["id"], "link": incident["link"], "duplicate": duplicate}
+            with self._lock:
+                state = self._firing.get((event["alert"], event["model_version"], event["namespace"]))
+                if state is not None:
+                    state["incident"] = incident["id"]
+        return events
+
+    def firing(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    "alert": name,
+                    "severity": state["rule"].severity,
+                    "model_version": model,
+                    "namespace": namespace,
+                    "since": state["since"],
+                    "actions": list(state["rule"].actions),
+                    "incident": state["incident"],
+                }
+                for (name, model, namespace), state in self._firing.items()
+            ]
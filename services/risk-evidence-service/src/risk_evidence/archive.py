@@ -0,0 +1,251 @@
+"""Cold tier: sealed log segments rewritten as block-compressed archives.
+
+An archive keeps each record's payload under its original `(segment,
+offset)` address, so index locations stay valid after compaction and reads
+are served transparently from either tier.
+
+Layout of `{root}/{segment:08d}.arc`:
+
+    [compressed block]...              payloads packed into ~`block_bytes` blocks
+    [compressed tables]
+        block table  n x <Q I I>       file offset, compressed and raw length
+        frame table  m x <Q Q I I I>   original offset, seq, block, position, length
+    [footer]         <4s B I I Q I Q>  magic, codec, n, m, tables offset, tables length,
+                                       seq following the segment's last original record
+
+Per-frame CRCs are not stored: every block and the tables carry the codec's
+own checksum (zlib adler32, zstd content checksum) instead. Blocks are
+zstd-compressed when `zstandard` is installed and zlib otherwise; the codec
+is recorded per archive so either can be read back.
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+try:
+    import zstandard
+except Exception:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+from risk_evidence.storage import CorruptFrameError, Location
+
+MAGIC = b"RESA"
+FOOTER = struct.Struct("<4sBIIQIQ")
+BLOCK_ENTRY = struct.Struct("<QII")
+FRAME_ENTRY = struct.Struct("<QQIII")
+ARCHIVE_SUFFIX = ".arc"
+
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10, write_checksum=True).compress(data)
+    return zlib.compress(data, 9)
+
+
+def _decompress(codec: int, data: bytes, size: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("archive is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+    return zlib.decompress(data)
+
+
+class _Tables(NamedTuple):
+    codec: int
+    blocks: List[Tuple[int, int, int]]
+    offsets: List[int]
+    seqs: List[int]
+    frames: List[Tuple[int, int, int]]
+    end_seq: int
+
+
+class ColdArchive:
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        block_bytes: int = 256 * 1024,
+        cache_blocks: int = 32,
+        cache_tables: int = 16,
+    ) -> None:
+        self._dir = Path(root)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._block_bytes = block_bytes
+        self._codec = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[int, _Tables]" = OrderedDict()
+        self._blocks: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        self._cache_blocks = cache_blocks
+        self._cache_tables = cache_tables
+        for tmp in self._dir.glob("*.tmp"):
+            tmp.unlink()
+        self._segments = {
+            int(p.stem) for p in self._dir.glob(f"*{ARCHIVE_SUFFIX}") if p.stem.isdigit()
+        }
+
+    def has(self, segment: int) -> bool:
+        return segment in self._segments
+
+    def segments(self) -> List[int]:
+        return sorted(self._segments)
+
+    def path(self, segment: int) -> Path:
+        return self._dir / f"{segment:08d}{ARCHIVE_SUFFIX}"
+
+    # -- writing ----------------------------------------------------------
+    def write(self, segment: int, records: Iterable[Tuple[int, int, bytes]], end_seq: int) -> int:
+        """Atomically (re)write the archive for `segment` from (offset, seq,
+        payload) triples in offset order; return its size in bytes.
+
+        Seqs, and `end_seq` (the seq after the segment's last original
+        record), are kept so the index can be rebuilt with the original
+        record numbers after retention has removed records. For the same
+        reason an archive whose records all expired is still written."""
+        path = self.path(segment)
+        tmp = path.with_suffix(".tmp")
+        blocks: List[Tuple[int, int, int]] = []
+        entries: List[bytes] = []
+        pending: List[bytes] = []
+        pending_len = 0
+        written = 0
+        with open(tmp, "wb") as fh:
+
+            def flush() -> None:
+                nonlocal pending, pending_len, written
+                raw = b"".join(pending)
+                packed = _compress(self._codec, raw)
+                fh.write(packed)
+                blocks.append((written, len(packed), len(raw)))
+                written += len(packed)
+                pending, pending_len = [], 0
+
+            for offset, seq, payload in records:
+                entries.append(FRAME_ENTRY.pack(offset, seq, len(blocks), pending_len, len(payload)))
+                pending.append(payload)
+                pending_len += len(payload)
+                if pending_len >= self._block_bytes:
+                    flush()
+            if pending:
+                flush()
+            tables = b"".join(BLOCK_ENTRY.pack(*b) for b in blocks) + b"".join(entries)
+            packed_tables = _compress(self._codec, tables)
+            fh.write(packed_tables)
+            fh.write(
+                FOOTER.pack(
+                    MAGIC, self._codec, len(blocks), len(entries), written, len(packed_tables), end_seq
+                )
+            )
+            fh.flush()
+            os.fsync(fh.fileno())
+            size = fh.tell()
+        os.replace(tmp, path)
+        self._sync_dir()
+        with self._lock:
+            self._forget(segment)
+            self._segments.add(segment)
+        return size
+
+    def remove(self, segment: int) -> None:
+        with self._lock:
+            self._segments.discard(segment)
+            self._forget(segment)
+        self.path(segment).unlink(missing_ok=True)
+
+    def _forget(self, segment: int) -> None:
+        self._tables.pop(segment, None)
+        for key in [k for k in self._blocks if k[0] == segment]:
+            del self._blocks[key]
+
+    def _sync_dir(self) -> None:
+        fd = os.open(self._dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # -- reading ----------------------------------------------------------
+    def _load(self, segment: int) -> _Tables:
+        tables = self._tables.get(segment)
+        if tables is not None:
+            self._tables.move_to_end(segment)
+            return tables
+        with open(self.path(segment), "rb") as fh:
+            fh.seek(-FOOTER.size, os.SEEK_END)
+            footer = FOOTER.unpack(fh.read(FOOTER.size))
+            magic, codec, n_blocks, n_frames, table_at, table_len, end_seq = footer
+            if magic != MAGIC:
+                raise CorruptFrameError(f"bad archive footer in segment {segment}")
+            fh.seek(table_at)
+            raw_len = n_blocks * BLOCK_ENTRY.size + n_frames * FRAME_ENTRY.size
+            raw = _decompress(codec, fh.read(table_len), raw_len)
+        blocks = [BLOCK_ENTRY.unpack_from(raw, i * BLOCK_ENTRY.size) for i in range(n_blocks)]
+        base = n_blocks * BLOCK_ENTRY.size
+        offsets, seqs, frames = [], [], []
+        for i in range(n_frames):
+            offset, seq, block, pos, length = FRAME_ENTRY.unpack_from(raw, base + i * FRAME_ENTRY.size)
+            offsets.append(offset)
+            seqs.append(seq)
+            frames.append((block, pos, length))
+        tables = _Tables(codec, blocks, offsets, seqs, frames, end_seq)
+        self._tables[segment] = tables
+        while len(self._tables) > self._cache_tables:
+            self._tables.popitem(last=False)
+        return tables
+
+    def _block(self, segment: int, tables: _Tables, block: int) -> bytes:
+        key = (segment, block)
+        data = self._blocks.get(key)
+        if data is not None:
+            self._blocks.move_to_end(key)
+            return data
+        at, packed_len, raw_len = tables.blocks[block]
+        with open(self.path(segment), "rb") as fh:
+            data = _decompress(tables.codec, os.pread(fh.fileno(), packed_len, at), raw_len)
+        self._blocks[key] = data
+        while len(self._blocks) > self._cache_blocks:
+            self._blocks.popitem(last=False)
+        return data
+
+    def read(self, location: Location) -> bytes:
+        """Payload at an original log location; KeyError if it was not kept."""
+        with self._lock:
+            tables = self._load(location.segment)
+            i = bisect.bisect_left(tables.offsets, location.offset)
+            if i == len(tables.offsets) or tables.offsets[i] != location.offset:
+                raise KeyError(location)
+            block, pos, length = tables.frames[i]
+            data = self._block(location.segment, tables, block)
+        if length != location.length:
+            raise CorruptFrameError(f"length mismatch at {location} (cold)")
+        return data[pos : pos + length]
+
+    def end_seq(self, segment: int) -> int:
+        with self._lock:
+            return self._load(segment).end_seq
+
+    def replay(self, segment: int) -> Iterator[Tuple[Location, int, bytes]]:
+        """Yield (location, seq, payload) for every archived record of
+        `segment` in original log order."""
+        with self._lock:
+            tables = self._load(segment)
+        current, data = -1, b""
+        for offset, seq, (block, pos, length) in zip(tables.offsets, tables.seqs, tables.frames):
+            if block != current:
+                with self._lock:
+                    data = self._block(segment, tables, block)
+                current = block
+            yield Location(segment, offset, length), seq, data[pos : pos + length]
+
+    def size_bytes(self) -> int:
+        return sum(self.path(s).stat().st_size for s in self.segments())
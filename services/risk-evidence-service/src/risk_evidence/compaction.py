@@ -0,0 +1,106 @@
+"""Background compaction of old evidence into the cold tier.
+
+A sealed segment moves to the cold tier once its newest record is older
+than `cold_after` seconds. Retention is applied per `artifactType` at the
+same time (and re-applied to existing archives): a record is dropped once
+it is older than its type's retention, falling back to the `"*"` entry;
+types without an entry are kept forever.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from risk_evidence.index import IndexRow
+from risk_evidence.store import EvidenceStore
+
+log = logging.getLogger(__name__)
+
+DAY = 86400.0
+
+
+def parse_retention(spec: str) -> Dict[str, Optional[float]]:
+    """Parse `{"artifactType": days | null, "*": days}` into seconds."""
+    if not spec.strip():
+        return {}
+    raw = json.loads(spec)
+    if not isinstance(raw, dict):
+        raise ValueError("retention must be a JSON object of artifactType -> days")
+    return {k: None if v is None else float(v) * DAY for k, v in raw.items()}
+
+
+class Compactor:
+    def __init__(
+        self,
+        store: EvidenceStore,
+        cold_after: float = 7 * DAY,
+        retention: Optional[Mapping[str, Optional[float]]] = None,
+        interval: float = 300.0,
+    ) -> None:
+        self._store = store
+        self._cold_after = cold_after
+        self._retention = dict(retention or {})
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._run_lock = threading.Lock()
+
+    def retention_for(self, artifact_type: str) -> Optional[float]:
+        return self._retention.get(artifact_type, self._retention.get("*"))
+
+    def _expired(self, bounds: Mapping[str, tuple], now: float) -> bool:
+        for artifact, (oldest, _) in bounds.items():
+            keep = self.retention_for(artifact)
+            if keep is not None and oldest < now - keep:
+                return True
+        return False
+
+    def run_once(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Compact every eligible segment; return totals for this pass."""
+        now = time.time() if now is None else now
+        store = self._store
+        totals = {"segments": 0, "kept": 0, "dropped": 0, "bytes_before": 0, "bytes_after": 0}
+
+        def keep(row: IndexRow) -> bool:
+            ttl = self.retention_for(row.artifact_type)
+            return ttl is None or row.stored_at >= now - ttl
+
+        with self._run_lock:
+            hot = store.sealed_segments()
+            for segment in sorted(set(hot) | set(store.archive.segments())):
+                bounds = store.segment_bounds(segment)
+                newest = max((hi for _, hi in bounds.values()), default=0.0)
+                if segment in hot:
+                    if newest >= now - self._cold_after:
+                        continue
+                elif not self._expired(bounds, now):
+                    continue
+                result = store.compact_segment(segment, keep)
+                totals["segments"] += 1
+                for key, value in result._asdict().items():
+                    totals[key] += value
+        if totals["segments"]:
+            log.info("evidence compaction: %s", totals)
+        return totals
+
+    def start(self) -> None:
+        if self._thread is not None or self._interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="evidence-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.run_once()
+            except Exception:  # keep compacting on the next tick
+                log.exception("evidence compaction failed")
@@ -0,0 +1,174 @@
+"""Streaming Population Stability Index (PSI) over binned feature counts.
+
+Reference distributions are stored as bin edges plus expected proportions.
+Production observations are bucketed with NumPy and added to a ring of
+time slots, so each feature keeps `slots x bins` integers no matter how many
+values are ingested and raw observations are never retained.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+EPSILON = 1e-4
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """PSI between two proportion vectors, clipping empty bins to EPSILON."""
+    e = np.clip(expected, EPSILON, None)
+    a = np.clip(actual, EPSILON, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+class FeatureDrift:
+    """Reference histogram and sliding-window production counts for one feature."""
+
+    __slots__ = ("edges", "expected", "counts", "slot_ids", "slot_seconds")
+
+    def __init__(
+        self,
+        edges: Sequence[float],
+        expected: Sequence[float],
+        slots: int = 12,
+        slot_seconds: float = 300.0,
+    ) -> None:
+        # `edges` are the interior cut points: len(edges) + 1 bins, with the
+        # outermost bins open-ended so out-of-range values are still counted.
+        self.edges = np.asarray(edges, dtype=np.float64)
+        weights = np.asarray(expected, dtype=np.float64)
+        if self.edges.ndim != 1 or weights.ndim != 1:
+            raise ValueError("edges and expected must be flat sequences")
+        if not np.isfinite(self.edges).all() or (np.diff(self.edges) <= 0).any():
+            raise ValueError("edges must be finite and strictly increasing")
+        if weights.shape[0] != self.edges.shape[0] + 1:
+            raise ValueError("expected needs one more entry than edges")
+        if not np.isfinite(weights).all() or (weights < 0).any():
+            raise ValueError("expected counts must be finite and non-negative")
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("reference histogram is empty")
+        self.expected = weights / total
+        self.counts = np.zeros((slots, weights.shape[0]), dtype=np.int64)
+        self.slot_ids = np.full(slots, -1, dtype=np.int64)
+        self.slot_seconds = float(slot_seconds)
+
+    @classmethod
+    def fit(cls, values: Sequence[float], bins: int = 10, **kwargs) -> "FeatureDrift":
+        """Build a reference from raw values using quantile bin edges."""
+        data = np.asarray(values, dtype=np.float64)
+        data = data[np.isfinite(data)]
+        if data.size == 0:
+            raise ValueError("no finite reference values")
+        quantiles = np.linspace(0.0, 1.0, bins + 1)[1:-1]
+        edges = np.unique(np.quantile(data, quantiles))
+        expected = np.bincount(np.searchsorted(edges, data, side="right"), minlength=edges.size + 1)
+        return cls(edges, expected, **kwargs)
+
+    def observe(self, values: np.ndarray, now: float) -> None:
+        data = values[np.isfinite(values)]
+        if data.size == 0:
+            return
+        slot = int(now // self.slot_seconds)
+        row = slot % self.slot_ids.shape[0]
+        if self.slot_ids[row] != slot:
+            self.counts[row] = 0
+            self.slot_ids[row] = slot
+        bins = np.searchsorted(self.edges, data, side="right")
+        self.counts[row] += np.bincount(bins, minlength=self.counts.shape[1])
+
+    def window_counts(self, now: float) -> np.ndarray:
+        slot = int(now // self.slot_seconds)
+        live = self.slot_ids > slot - self.slot_ids.shape[0]
+        return self.counts[live].sum(axis=0)
+
+    def psi(self, now: float) -> Optional[float]:
+        counts = self.window_counts(now)
+        total = counts.sum()
+        if total == 0:
+            return None
+        return psi(self.expected, counts / total)
+
+
+class DriftMonitor:
+    """PSI per (model_version, feature); models are bounded by an LRU."""
+
+    def __init__(
+        self,
+        slots: int = 12,
+        slot_seconds: float = 300.0,
+        max_models: int = 256,
+    ) -> None:
+        self._slots = slots
+        self._slot_seconds = slot_seconds
+        self._max_models = max_models
+        self._models: "OrderedDict[str, Dict[str, FeatureDrift]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> float:
+        return self._slots * self._slot_seconds
+
+    def set_reference(
+        self,
+        model_version: str,
+        feature: str,
+        *,
+        edges: Optional[Sequence[float]] = None,
+        counts: Optional[Sequence[float]] = None,
+        values: Optional[Sequence[float]] = None,
+        bins: int = 10,
+    ) -> FeatureDrift:
+        """Register a reference from a histogram (edges+counts) or raw values."""
+        kwargs = {"slots": self._slots, "slot_seconds": self._slot_seconds}
+        if values is not None:
+            drift = FeatureDrift.fit(values, bins=bins, **kwargs)
+        elif edges is not None and counts is not None:
+            drift = FeatureDrift(edges, counts, **kwargs)
+        else:
+            raise ValueError("reference needs either values or edges+counts")
+        with self._lock:
+            self._models.setdefault(model_version, {})[feature] = drift
+            self._models.move_to_end(model_version)
+            while len(self._models) > self._max_models:
+                self._models.popitem(last=False)
+        return drift
+
+    def observe(
+        self,
+        model_version: str,
+        batch: Mapping[str, Iterable[float]],
+        now: Optional[float] = None,
+    ) -> Dict[str, Optional[float]]:
+        """Add a batch of observations and return the updated PSI per feature.
+
+        Features without a registered reference are reported as None.
+        """
+        now = time.time() if now is None else now
+        arrays = {name: np.asarray(values, dtype=np.float64).ravel() for name, values in batch.items()}
+        result: Dict[str, Optional[float]] = {}
+        with self._lock:
+            features = self._models.get(model_version) or {}
+            if features:
+                self._models.move_to_end(model_version)
+            for name, values in arrays.items():
+                drift = features.get(name)
+                if drift is None:
+                    result[name] = None
+                    continue
+                drift.observe(values, now)
+                result[name] = drift.psi(now)
+        return result
+
+    def model_psi(self, model_version: str, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            features = self._models.get(model_version) or {}
+            return {name: drift.psi(now) for name, drift in features.items()}
+
+    def max_psi(self, model_version: str, now: Optional[float] = None) -> Optional[float]:
+        values = [v for v in self.model_psi(model_version, now).values() if v is not None]
+        return max(values) if values else None
@@ -0,0 +1,103 @@
+"""Labeled Prometheus series for the governed metrics, with bounded cardinality.
+
+`GovernedMetricsCollector` keeps one gauge family per governed metric with
+`model_version` and `namespace` labels. Each family holds at most
+`max_series` label sets; observations for new label sets beyond the cap
+land in a single `__overflow__` series and are counted, so a misbehaving
+client cannot blow up the scrape. `CachedExposition` renders the registry
+at most once per TTL so scrape cost does not grow with scrape frequency.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from risk_evidence.metrics import MetricSpec
+
+OVERFLOW = "__overflow__"
+LABELS = ("model_version", "namespace")
+
+Labels = Tuple[str, str]
+
+
+class GovernedMetricsCollector:
+    def __init__(self, specs: Sequence[MetricSpec], max_series: int = 1000) -> None:
+        self._specs = {spec.key: spec for spec in specs}
+        self._max_series = max_series
+        self._values: Dict[str, Dict[Labels, float]] = {key: {} for key in self._specs}
+        self._overflowed: Dict[str, int] = dict.fromkeys(self._specs, 0)
+        self._lock = threading.Lock()
+
+    def set_many(self, points: Iterable[Tuple[str, str, str, float]]) -> int:
+        """Apply (metric key, model_version, namespace, value) points under
+        one lock acquisition; return how many went to the overflow series."""
+        overflowed = 0
+        with self._lock:
+            for key, model, namespace, value in points:
+                series = self._values[key]
+                labels = (model, namespace)
+                if labels not in series and len(series) >= self._max_series:
+                    labels = (OVERFLOW, OVERFLOW)
+                    self._overflowed[key] += 1
+                    overflowed += 1
+                series[labels] = value
+        return overflowed
+
+    def forget_model(self, model: str) -> None:
+        with self._lock:
+            for series in self._values.values():
+                for labels in [l for l in series if l[0] == model]:
+                    del series[labels]
+
+    def collect(self) -> Iterator:
+        with self._lock:
+            snapshot = {key: list(series.items()) for key, series in self._values.items()}
+            overflowed = dict(self._overflowed)
+        for key, spec in self._specs.items():
+            family = GaugeMetricFamily(spec.prom_name, spec.help, labels=LABELS)
+            for labels, value in snapshot[key]:
+                family.add_metric(labels, value)
+            yield family
+        overflow = CounterMetricFamily(
+            "res_observation_overflow",
+            "Observations folded into the overflow series by the cardinality cap",
+            labels=("metric",),
+        )
+        for key, count in overflowed.items():
+            overflow.add_metric((self._specs[key].prom_name,), count)
+        yield overflow
+
+
+class CachedExposition:
+    """Render a registry at most once per `ttl` seconds; concurrent scrapes
+    share one render."""
+
+    def __init__(self, registry: CollectorRegistry, ttl: float = 5.0) -> None:
+        self._registry = registry
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._body: Optional[bytes] = None
+        self._rendered_at = 0.0
+
+    def fresh(self, now: Optional[float] = None) -> Optional[bytes]:
+        """The cached body if it is still within the TTL, without blocking."""
+        now = time.monotonic() if now is None else now
+        body = self._body
+        if body is not None and now - self._rendered_at < self._ttl:
+            return body
+        return None
+
+    def render(self, now: Optional[float] = None) -> bytes:
+        now = time.monotonic() if now is None else now
+        body = self.fresh(now)
+        if body is not None:
+            return body
+        with self._lock:
+            if self._body is None or now - self._rendered_at >= self._ttl:
+                self._body = generate_latest(self._registry)
+                self._rendered_at = now
+            return self._body
@@ -0,0 +1,249 @@
+"""SQLite-backed indexes over the evidence log.
+
+`evidence.id` (the content hash) is the primary index mapping to a log
+location; secondary indexes cover `modelVersion`, `artifactType` and
+`stored_at`, each suffixed with `seq` so keyset pagination is a single
+index range scan. `seq` is the record's ordinal in log order, so it is
+dense and stable for every acknowledged record.
+"""
+from __future__ import annotations
+
+import base64
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from risk_evidence.storage import Location
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evidence (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    model_version TEXT NOT NULL,
+    artifact_type TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evidence_model ON evidence (model_version, seq);
+CREATE INDEX IF NOT EXISTS evidence_type ON evidence (artifact_type, seq);
+CREATE INDEX IF NOT EXISTS evidence_time ON evidence (stored_at, seq);
+CREATE INDEX IF NOT EXISTS evidence_segment ON evidence (segment, offset);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class IndexRow(NamedTuple):
+    seq: int
+    id: str
+    location: Location
+    model_version: str
+    artifact_type: str
+    stored_at: float
+
+
+def encode_cursor(seq: int) -> str:
+    return base64.urlsafe_b64encode(str(seq).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+class EvidenceIndex:
+    """Primary and secondary evidence indexes in an embedded SQLite file.
+
+    Writes go through one connection and must be serialised by the caller
+    (EvidenceStore does this); reads use per-thread connections so lookups
+    run concurrently with ingest under WAL.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = str(path)
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    # -- writes (caller serialised) --------------------------------------
+    def insert_many(self, rows: Iterable[IndexRow], position: Tuple[int, int]) -> None:
+        """Insert rows and advance the log high-water mark in one transaction."""
+        conn = self._writer
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO evidence VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (r.seq, r.id, *r.location, r.model_version, r.artifact_type, r.stored_at)
+                    for r in rows
+                ),
+            )
+            self._set_meta(conn, {"position": f"{position[0]}:{position[1]}"})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def truncate_after(self, position: Tuple[int, int]) -> int:
+        """Drop rows pointing at or past `position` (lost log tail after a crash)."""
+        conn = self._writer
+        conn.execute("BEGIN")
+        try:
+            cur = conn.execute(
+                "DELETE FROM evidence WHERE segment > ? OR (segment = ? AND offset >= ?)",
+                (position[0], position[0], position[1]),
+            )
+            if self.position() > position:
+                self._set_meta(conn, {"position": f"{position[0]}:{position[1]}"})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount
+
+    def delete_seqs(self, seqs: Sequence[int]) -> None:
+        """Drop index rows (records removed by retention).
+
+        Their seqs are never handed out again, even if they were the newest.
+        """
+        if not seqs:
+            return
+        conn = self._writer
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("DELETE FROM evidence WHERE seq = ?", ((s,) for s in seqs))
+            floor = max(max(seqs) + 1, int(self.meta("seq_floor") or 0))
+            self._set_meta(conn, {"seq_floor": str(floor)})
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, values: Dict[str, str]) -> None:
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            values.items(),
+        )
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self._writer.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def position(self) -> Tuple[int, int]:
+        value = self.meta("position")
+        if not value:
+            return (0, 0)
+        segment, offset = value.split(":")
+        return (int(segment), int(offset))
+
+    def next_seq(self) -> int:
+        row = self._writer.execute("SELECT MAX(seq) FROM evidence").fetchone()
+        following = (row[0] + 1) if row and row[0] is not None else 0
+        return max(following, int(self.meta("seq_floor") or 0))
+
+    # -- reads ------------------------------------------------------------
+    def get(self, evidence_id: str) -> Optional[IndexRow]:
+        row = self._reader().execute(
+            "SELECT * FROM evidence WHERE id = ?", (evidence_id,)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def contains_many(self, ids: Sequence[str]) -> Dict[str, IndexRow]:
+        found: Dict[str, IndexRow] = {}
+        conn = self._writer
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT * FROM evidence WHERE id IN ({marks})", chunk):
+                found[row[1]] = self._row(row)
+        return found
+
+    def query(
+        self,
+        model_version: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[IndexRow], Optional[str]]:
+        """Return one page of rows, newest first, and the next-page cursor."""
+        clauses, params = [], []
+        if model_version is not None:
+            clauses.append("model_version = ?")
+            params.append(model_version)
+        if artifact_type is not None:
+            clauses.append("artifact_type = ?")
+            params.append(artifact_type)
+        if since is not None:
+            clauses.append("stored_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("stored_at < ?")
+            params.append(until)
+        if cursor:
+            clauses.append("seq < ?")
+            params.append(decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader().execute(
+            f"SELECT * FROM evidence {where} ORDER BY seq DESC LIMIT ?", (*params, limit + 1)
+        ).fetchall()
+        page = [self._row(r) for r in rows[:limit]]
+        next_cursor = encode_cursor(page[-1].seq) if len(rows) > limit else None
+        return page, next_cursor
+
+    def ids_from(self, seq: int) -> Iterator[Tuple[int, str]]:
+        """(seq, id) for every record with `seq >= seq`, in log order."""
+        yield from self._reader().execute(
+            "SELECT seq, id FROM evidence WHERE seq >= ? ORDER BY seq", (seq,)
+        )
+
+    def segment_rows(self, segment: int) -> List[IndexRow]:
+        return [
+            self._row(r)
+            for r in self._reader().execute(
+                "SELECT * FROM evidence WHERE segment = ? ORDER BY offset", (segment,)
+            )
+        ]
+
+    def segment_bounds(self, segment: int) -> Dict[str, Tuple[float, float]]:
+        """Oldest and newest `stored_at` per artifact type within a segment."""
+        return {
+            artifact: (lo, hi)
+            for artifact, lo, hi in self._reader().execute(
+                "SELECT artifact_type, MIN(stored_at), MAX(stored_at) FROM evidence "
+                "WHERE segment = ? GROUP BY artifact_type",
+                (segment,),
+            )
+        }
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM evidence").fetchone()[0]
+
+    @staticmethod
+    def _row(row: tuple) -> IndexRow:
+        seq, evidence_id, segment, offset, length, model, artifact, stored_at = row
+        return IndexRow(seq, evidence_id, Location(segment, offset, length), model, artifact, stored_at)
+
+    def close(self) -> None:
+        self._writer.close()
@@ -0,0 +1,88 @@
+"""Bulk NDJSON evidence ingest: incremental line splitting and batch hashing.
+
+`ndjson_batches` turns an async byte stream into batches of raw lines
+without ever holding more than one batch (plus one partial line) in memory.
+`canonicalize_batch` validates, canonicalizes and hashes a batch; it is a
+plain top-level function so it can run in a process pool.
+"""
+from __future__ import annotations
+
+from typing import AsyncIterable, AsyncIterator, List, Tuple, Union
+
+from pydantic import ValidationError
+
+from risk_evidence.schemas import Evidence
+from risk_evidence.store import evidence_id
+
+# (line number, evidence id, canonical evidence) or (line number, None, error)
+Canonical = Tuple[int, Union[str, None], Union[dict, str]]
+
+
+class LineTooLongError(ValueError):
+    """Raised when a single NDJSON line exceeds the configured limit."""
+
+    def __init__(self, line: int, limit: int) -> None:
+        super().__init__(f"line {line} exceeds {limit} bytes")
+        self.line = line
+
+
+async def ndjson_batches(
+    chunks: AsyncIterable[bytes], batch_size: int = 512, max_line_bytes: int = 1024 * 1024
+) -> AsyncIterator[Tuple[int, List[bytes]]]:
+    """Yield (first line number, raw lines) batches from a byte stream.
+
+    Line numbers are 1-based and count blank lines, so they match what a
+    client sees in its own file. On a line longer than `max_line_bytes` the
+    lines before it are still yielded, then LineTooLongError is raised.
+    """
+    buf = b""
+    batch: List[bytes] = []
+    first = 1
+    too_long = None
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buf += chunk
+        lines = buf.split(b"\n")
+        buf = lines.pop()
+        for line in lines:
+            if len(line) > max_line_bytes:
+                too_long = first + len(batch)
+                break
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield first, batch
+                first += len(batch)
+                batch = []
+        else:
+            if len(buf) > max_line_bytes:
+                too_long = first + len(batch)
+        if too_long is not None:
+            break
+    if buf and too_long is None:
+        batch.append(buf)
+    if batch:
+        yield first, batch
+    if too_long is not None:
+        raise LineTooLongError(too_long, max_line_bytes)
+
+
+def canonicalize_batch(first: int, lines: List[bytes]) -> List[Canonical]:
+    """Validate each line as Evidence and hash it exactly like `POST /evidence`.
+
+    Blank lines are skipped; invalid lines yield an error message instead of
+    an id so one bad record does not fail the upload.
+    """
+    out: List[Canonical] = []
+    for n, line in enumerate(lines, start=first):
+        if not line.strip():
+            continue
+        try:
+            content = Evidence.model_validate_json(line).model_dump()
+        except ValidationError as exc:
+            err = exc.errors()[0]
+            where = ".".join(str(p) for p in err.get("loc", ())) or "record"
+            out.append((n, None, f"{where}: {err['msg']}"))
+            continue
+        out.append((n, evidence_id(content), content))
+    return out
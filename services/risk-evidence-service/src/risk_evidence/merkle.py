@@ -0,0 +1,308 @@
+"""Incremental RFC 6962 Merkle tree over evidence ids, with signed roots.
+
+Leaf `i` is the evidence record with `seq == i`; its hash is
+`SHA-256(0x00 || id)` where `id` is the 32-byte evidence hash, and interior
+nodes are `SHA-256(0x01 || left || right)` as in Certificate Transparency.
+
+Only hashes of complete, aligned subtrees are stored: level `k` is a flat
+file of 32-byte hashes of subtrees covering `2**k` leaves, so a tree of `n`
+leaves keeps `n >> k` entries at level `k` (about 2n hashes in total). Any
+root, inclusion proof or consistency proof for a size `<= n` is assembled
+from O(log n) stored hashes. The files are derived data: they are rebuilt
+from the evidence index if missing or behind.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+HASH_SIZE = 32
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+class MerkleTree:
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self._dir = Path(root)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fds: Dict[int, int] = {}
+        level0 = self._path(0)
+        self._size = level0.stat().st_size // HASH_SIZE if level0.exists() else 0
+        # A crash can leave upper levels ahead of level 0.
+        self.truncate(self._size)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    # -- writing ----------------------------------------------------------
+    def append_many(self, leaves: Iterable[bytes]) -> int:
+        """Append leaf data (evidence ids as bytes); return the new size."""
+        with self._lock:
+            nodes = [leaf_hash(x) for x in leaves]
+            start, level, added = self._size, 0, len(nodes)
+            writes: List[bytes] = []
+            while nodes:
+                before = start >> level
+                parents: List[bytes] = []
+                for i, h in enumerate(nodes):
+                    pos = before + i
+                    if pos & 1:
+                        left = nodes[i - 1] if i else self._read(level, pos - 1)
+                        parents.append(node_hash(left, h))
+                writes.append(b"".join(nodes))
+                nodes, level = parents, level + 1
+            # Top level first: level 0 defines the size, so after a crash the
+            # upper levels can only be ahead of it, which truncate() repairs.
+            for level in reversed(range(len(writes))):
+                self._write(level, writes[level])
+            self._size = start + added
+            return self._size
+
+    def truncate(self, size: int) -> None:
+        """Drop every leaf at index >= size (index rolled back after a crash)."""
+        with self._lock:
+            level = 0
+            while True:
+                path = self._path(level)
+                if not path.exists():
+                    break
+                keep = (size >> level) * HASH_SIZE
+                if path.stat().st_size > keep:
+                    os.truncate(path, keep)
+                level += 1
+            self._size = size
+
+    def _fd(self, level: int) -> int:
+        fd = self._fds.get(level)
+        if fd is None:
+            fd = os.open(self._path(level), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._fds[level] = fd
+        return fd
+
+    def _write(self, level: int, data: bytes) -> None:
+        fd = self._fd(level)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+
+    def _read(self, level: int, index: int) -> bytes:
+        data = os.pread(self._fd(level), HASH_SIZE, index * HASH_SIZE)
+        if len(data) != HASH_SIZE:
+            raise IOError(f"merkle level {level} is missing node {index}")
+        return data
+
+    # -- reading ----------------------------------------------------------
+    def _subtree(self, start: int, end: int) -> bytes:
+        """MTH(D[start:end]); ranges produced by the RFC recursion are aligned."""
+        n = end - start
+        if n & (n - 1) == 0:
+            level = n.bit_length() - 1
+            return self._read(level, start >> level)
+        k = _split(n)
+        return node_hash(self._subtree(start, start + k), self._subtree(start + k, end))
+
+    def _check_size(self, size: Optional[int]) -> int:
+        size = self._size if size is None else size
+        if not 0 <= size <= self._size:
+            raise ValueError(f"tree_size must be between 0 and {self._size}")
+        return size
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        with self._lock:
+            size = self._check_size(size)
+            return self._subtree(0, size) if size else EMPTY_ROOT
+
+    def inclusion_proof(self, index: int, size: Optional[int] = None) -> List[bytes]:
+        """Audit path for leaf `index` in the tree of `size` leaves (RFC 6962 PATH)."""
+        with self._lock:
+            size = self._check_size(size)
+            if not 0 <= index < size:
+                raise ValueError("leaf index is outside the tree")
+            path: List[bytes] = []
+            start, end = 0, size
+            while end - start > 1:
+                k = _split(end - start)
+                if index < start + k:
+                    path.append(self._subtree(start + k, end))
+                    end = start + k
+                else:
+                    path.append(self._subtree(start, start + k))
+                    start += k
+            path.reverse()
+            return path
+
+    def consistency_proof(self, first: int, second: Optional[int] = None) -> List[bytes]:
+        """Proof that the tree of `first` leaves is a prefix of `second` (RFC 6962 PROOF)."""
+        with self._lock:
+            second = self._check_size(second)
+            if not 0 <= first <= second:
+                raise ValueError("first must be between 0 and second")
+            if first in (0, second):
+                return []
+            proof: List[bytes] = []
+            m, start, end, complete = first, 0, second, True
+            while m != end - start:
+                k = _split(end - start)
+                if m <= k:
+                    proof.append(self._subtree(start + k, end))
+                    end = start + k
+                else:
+                    proof.append(self._subtree(start, start + k))
+                    m -= k
+                    start += k
+                    complete = False
+            if not complete:
+                proof.append(self._subtree(start, end))
+            proof.reverse()
+            return proof
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
+    def _path(self, level: int) -> Path:
+        return self._dir / f"level-{level:02d}.bin"
+
+
+# -- verification (RFC 9162 section 2.1.3.2 / 2.1.4.2) ---------------------
+def verify_inclusion(
+    leaf: bytes, index: int, size: int, proof: Sequence[bytes], root: bytes
+) -> bool:
+    """Check an audit path for leaf data `leaf` (an evidence id as bytes)."""
+    if not 0 <= index < size:
+        return False
+    fn, sn, r = index, size - 1, leaf_hash(leaf)
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(r, root)
+
+
+def verify_consistency(
+    first: int, second: int, proof: Sequence[bytes], first_root: bytes, second_root: bytes
+) -> bool:
+    if not 0 <= first <= second:
+        return False
+    if first == second:
+        return not proof and hmac.compare_digest(first_root, second_root)
+    if first == 0:
+        return not proof
+    path = list(proof)
+    if first & (first - 1) == 0:
+        path.insert(0, first_root)
+    if not path:
+        return False
+    fn, sn = first - 1, second - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(fr, first_root) and hmac.compare_digest(sr, second_root)
+
+
+# -- signed roots -----------------------------------------------------------
+class RootCheckpoints:
+    """Periodically signed tree heads, appended to `roots.jsonl`.
+
+    A new checkpoint is cut when the tree has grown and `interval` seconds
+    have passed since the last one. Signatures are HMAC-SHA256 over the
+    canonical JSON of `{tree_size, root_hash, timestamp}`; without a key
+    checkpoints are still recorded, unsigned.
+    """
+
+    def __init__(
+        self,
+        tree: MerkleTree,
+        path: str | os.PathLike[str],
+        key: Optional[bytes] = None,
+        interval: float = 60.0,
+    ) -> None:
+        self._tree = tree
+        self._path = Path(path)
+        self._key = key
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._latest: Optional[dict] = None
+        if self._path.exists():
+            with open(self._path, "rb") as fh:
+                for line in fh:
+                    if line.strip():
+                        try:
+                            self._latest = json.loads(line)
+                        except ValueError:
+                            break  # torn final line
+
+    def sign(self, head: dict) -> Optional[str]:
+        if not self._key:
+            return None
+        body = json.dumps(
+            {k: head[k] for k in ("tree_size", "root_hash", "timestamp")}, sort_keys=True
+        ).encode()
+        return hmac.new(self._key, body, hashlib.sha256).hexdigest()
+
+    def latest(self, now: Optional[float] = None, force: bool = False) -> dict:
+        now = time.time() if now is None else now
+        with self._lock:
+            last = self._latest
+            size = self._tree.size
+            stale = last is None or (
+                size > last["tree_size"] and (force or now - last["timestamp"] >= self._interval)
+            )
+            if not stale:
+                return last
+            head = {
+                "tree_size": size,
+                "root_hash": self._tree.root(size).hex(),
+                "timestamp": now,
+            }
+            head["signature"] = self.sign(head)
+            with open(self._path, "a") as fh:
+                fh.write(json.dumps(head, sort_keys=True) + "\n")
+            self._latest = head
+            return head
@@ -0,0 +1,239 @@
+"""Per-model time series for the governed metrics behind `/risk/snapshot`.
+
+Every (model_version, metric) series is a fixed-size NumPy ring of raw
+points plus a ring of time slots holding count/sum/min/max, so memory per
+series is constant however many observations arrive. Models are bounded by
+an LRU. Each model keeps a precomputed summary (latest value and window
+aggregates per metric) that is refreshed on write, or at most once per slot
+when the window slides, so snapshot reads are a dictionary lookup.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class MetricSpec(NamedTuple):
+    key: str  # "<domain>.<metric>", matching the ADR-006 thresholds block
+    prom_name: str
+    help: str
+    aliases: Tuple[str, ...] = ()
+
+    @property
+    def section(self) -> str:
+        return self.key.split(".", 1)[0]
+
+    @property
+    def field(self) -> str:
+        return self.key.split(".", 1)[1]
+
+
+GOVERNED_METRICS: Tuple[MetricSpec, ...] = (
+    MetricSpec("quality.pass_at_5", "llm_pass_at_5", "Quality pass@5", ("pass_at_5",)),
+    MetricSpec("fairness.subgroup_delta", "fairness_subgroup_delta", "Fairness subgroup delta", ("subgroup_delta",)),
+    MetricSpec("safety.harmful_rate", "harmful_output_rate", "Safety harmful rate", ("harmful_rate",)),
+    MetricSpec("privacy.reid_risk", "privacy_reid_risk", "Privacy re-identification risk", ("reid_risk",)),
+    MetricSpec("drift.psi", "drift_psi", "Data drift PSI", ("psi",)),
+    MetricSpec("latency.p95_seconds", "latency_p95_seconds", "Latency p95 seconds", ("p95_seconds",)),
+    MetricSpec("availability.ratio", "availability", "Availability", ()),
+)
+
+_LOOKUP: Dict[str, MetricSpec] = {}
+for _spec in GOVERNED_METRICS:
+    for _name in (_spec.key, _spec.prom_name, *_spec.aliases):
+        _LOOKUP[_name] = _spec
+
+
+def metric_spec(name: str) -> MetricSpec:
+    """Resolve a metric key, Prometheus name or alias; KeyError if unknown."""
+    return _LOOKUP[name]
+
+
+class Series:
+    """Ring buffers for one metric of one model."""
+
+    __slots__ = ("ts", "values", "head", "size", "slot_ids", "slot_stats", "slot_seconds", "last")
+
+    def __init__(self, points: int, slots: int, slot_seconds: float) -> None:
+        self.ts = np.zeros(points, dtype=np.float64)
+        self.values = np.zeros(points, dtype=np.float64)
+        self.head = 0
+        self.size = 0
+        self.slot_ids = np.full(slots, -1, dtype=np.int64)
+        # columns: count, sum, min, max
+        self.slot_stats = np.zeros((slots, 4), dtype=np.float64)
+        self.slot_seconds = slot_seconds
+        self.last: Optional[Tuple[float, float]] = None
+
+    def add(self, value: float, ts: float) -> None:
+        cap = self.ts.shape[0]
+        self.ts[self.head] = ts
+        self.values[self.head] = value
+        self.head = (self.head + 1) % cap
+        self.size = min(self.size + 1, cap)
+        if self.last is None or ts >= self.last[0]:
+            self.last = (ts, value)
+
+        slot = int(ts // self.slot_seconds)
+        row = slot % self.slot_ids.shape[0]
+        if self.slot_ids[row] != slot:
+            if self.slot_ids[row] > slot:
+                return  # older than the window; history only
+            self.slot_ids[row] = slot
+            self.slot_stats[row] = (0.0, 0.0, math.inf, -math.inf)
+        stats = self.slot_stats[row]
+        stats[0] += 1
+        stats[1] += value
+        stats[2] = min(stats[2], value)
+        stats[3] = max(stats[3], value)
+
+    def window(self, now: float) -> Optional[Dict[str, float]]:
+        slot = int(now // self.slot_seconds)
+        live = (self.slot_ids > slot - self.slot_ids.shape[0]) & (self.slot_ids <= slot)
+        stats = self.slot_stats[live]
+        count = stats[:, 0].sum()
+        if count == 0:
+            return None
+        return {
+            "count": int(count),
+            "mean": float(stats[:, 1].sum() / count),
+            "min": float(stats[:, 2].min()),
+            "max": float(stats[:, 3].max()),
+        }
+
+    def history(self, since: float = -math.inf, max_points: Optional[int] = None) -> List[List[float]]:
+        """Points in time order; bucket-averaged down to `max_points`."""
+        if self.size < self.ts.shape[0]:
+            ts, values = self.ts[: self.size], self.values[: self.size]
+        else:
+            ts = np.roll(self.ts, -self.head)
+            values = np.roll(self.values, -self.head)
+        order = np.argsort(ts, kind="stable")
+        ts, values = ts[order], values[order]
+        keep = ts >= since
+        ts, values = ts[keep], values[keep]
+        if max_points and ts.shape[0] > max_points:
+            buckets = np.array_split(np.arange(ts.shape[0]), max_points)
+            ts = np.array([ts[b].mean() for b in buckets])
+            values = np.array([values[b].mean() for b in buckets])
+        return np.column_stack((ts, values)).tolist()
+
+
+class _Model:
+    __slots__ = ("series", "summary", "summary_slot")
+
+    def __init__(self) -> None:
+        self.series: Dict[str, Series] = {}
+        self.summary: Dict[str, Dict] = {}
+        self.summary_slot = -1
+
+
+class MetricStore:
+    def __init__(
+        self,
+        points: int = 2048,
+        slots: int = 12,
+        slot_seconds: float = 300.0,
+        max_models: int = 256,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self._points = points
+        self._on_evict = on_evict
+        self._slots = slots
+        self._slot_seconds = slot_seconds
+        self._max_models = max_models
+        self._models: "OrderedDict[str, _Model]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> float:
+        return self._slots * self._slot_seconds
+
+    def observe(self, model_version: str, metric: str, value: float, ts: Optional[float] = None) -> None:
+        self.observe_many([(model_version, metric, value, ts)])
+
+    def observe_many(
+        self,
+        points: Iterable[Tuple[str, str, float, Optional[float]]],
+        now: Optional[float] = None,
+    ) -> int:
+        """Record (model_version, metric, value, ts) points under one lock.
+
+        Unknown metric names raise KeyError before anything is recorded.
+        Returns the number of points stored.
+        """
+        now = time.time() if now is None else now
+        resolved = [
+            (model, metric_spec(metric).key, float(value), now if ts is None else float(ts))
+            for model, metric, value, ts in points
+        ]
+        touched: Dict[str, _Model] = {}
+        with self._lock:
+            for model, key, value, ts in resolved:
+                entry = touched.get(model) or self._touch(model)
+                touched[model] = entry
+                series = entry.series.get(key)
+                if series is None:
+                    series = entry.series[key] = Series(self._points, self._slots, self._slot_seconds)
+                series.add(value, ts)
+            for entry in touched.values():
+                self._summarize(entry, now)
+        return len(resolved)
+
+    def _touch(self, model: str) -> _Model:
+        entry = self._models.get(model)
+        if entry is None:
+            entry = self._models[model] = _Model()
+            while len(self._models) > self._max_models:
+                evicted, _ = self._models.popitem(last=False)
+                if self._on_evict is not None:
+                    self._on_evict(evicted)
+        self._models.move_to_end(model)
+        return entry
+
+    def _summarize(self, entry: _Model, now: float) -> None:
+        entry.summary = {
+            key: {
+                "value": series.last[1] if series.last else None,
+                "ts": series.last[0] if series.last else None,
+                "window": series.window(now),
+            }
+            for key, series in entry.series.items()
+        }
+        entry.summary_slot = int(now // self._slot_seconds)
+
+    def summary(self, model_version: str, now: Optional[float] = None) -> Optional[Dict[str, Dict]]:
+        """Latest value and window aggregates per metric key (None if unknown)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._models.get(model_version)
+            if entry is None:
+                return None
+            if int(now // self._slot_seconds) != entry.summary_slot:
+                self._summarize(entry, now)  # window slid since the last write
+            return entry.summary
+
+    def history(
+        self,
+        model_version: str,
+        since: float = -math.inf,
+        max_points: Optional[int] = None,
+    ) -> Dict[str, List[List[float]]]:
+        with self._lock:
+            entry = self._models.get(model_version)
+            if entry is None:
+                return {}
+            return {key: s.history(since, max_points) for key, s in entry.series.items()}
+
+    def latest_model(self) -> Optional[str]:
+        with self._lock:
+            return next(reversed(self._models), None)
+
+    def models(self) -> List[str]:
+        with self._lock:
+            return list(self._models)
@@ -0,0 +1,11 @@
+"""Request models shared by the RES app and its ingest workers."""
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class Evidence(BaseModel):
+    artifactType: str
+    modelVersion: str
+    metadata: dict | None = None
+    contentRef: str
@@ -0,0 +1,283 @@
+"""Mergeable latency quantile sketches (DDSketch).
+
+A value `v > 0` falls into bucket `k = ceil(log_gamma(v))` with
+`gamma = (1 + a) / (1 - a)`, so any quantile is returned within relative
+error `a` of the true sample value. Buckets are a dense NumPy array of
+counts starting at key `offset`; when it would exceed `max_bins`, the
+lowest buckets are collapsed into one, which only affects the fastest
+requests and keeps the upper quantiles exact to `a`. Two sketches with the
+same accuracy merge by adding their bucket arrays, so gateway pods can ship
+sketches instead of raw samples.
+
+`LatencySketches` keeps one sketch per time slot per model (a ring of
+`slots` x `slot_seconds`, like the metric store) and answers window
+quantiles by merging the live slots.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Smaller values (including 0) are counted as zero-latency samples.
+MIN_INDEXABLE = 1e-9
+
+
+class DDSketch:
+    __slots__ = (
+        "relative_accuracy", "gamma", "_log_gamma", "max_bins",
+        "offset", "bins", "zero_count", "count", "sum", "min", "max",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.offset = 0
+        self.bins = np.zeros(0, dtype=np.float64)
+        self.zero_count = 0.0
+        self.count = 0.0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    # -- writing ----------------------------------------------------------
+    def add_many(self, values: Iterable[float]) -> None:
+        v = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.float64).ravel()
+        if v.size == 0:
+            return
+        if not np.isfinite(v).all() or (v < 0).any():
+            raise ValueError("latency samples must be finite and non-negative")
+        self.count += v.size
+        self.sum += float(v.sum())
+        self.min = min(self.min, float(v.min()))
+        self.max = max(self.max, float(v.max()))
+        pos = v[v > MIN_INDEXABLE]
+        self.zero_count += v.size - pos.size
+        if pos.size:
+            keys = np.ceil(np.log(pos) / self._log_gamma).astype(np.int64)
+            lo = int(keys.min())
+            self._add_counts(lo, np.bincount(keys - lo).astype(np.float64))
+
+    def add(self, value: float) -> None:
+        self.add_many((value,))
+
+    def merge(self, other: "DDSketch") -> None:
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        if other.count == 0:
+            return
+        if other.bins.size:
+            self._add_counts(other.offset, other.bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _add_counts(self, lo: int, counts: np.ndarray) -> None:
+        hi = lo + counts.size
+        if self.bins.size:
+            new_lo = min(lo, self.offset)
+            new_hi = max(hi, self.offset + self.bins.size)
+        else:
+            new_lo, new_hi = lo, hi
+        # Collapse keys below the max_bins cut-off before allocating, so a
+        # wide key range never materialises as a dense array.
+        new_lo = max(new_lo, new_hi - self.max_bins)
+        if new_lo == self.offset and new_hi == self.offset + self.bins.size:
+            merged = self.bins
+        else:
+            merged = np.zeros(new_hi - new_lo, dtype=np.float64)
+            _fold(merged, new_lo, self.offset, self.bins)
+        _fold(merged, new_lo, lo, counts)
+        self.bins, self.offset = merged, new_lo
+
+    def _key_range(self) -> Tuple[int, int]:
+        """Keys a finite value above MIN_INDEXABLE can map to (and whose
+        bucket midpoint still fits in a float)."""
+        return (
+            math.ceil(math.log(MIN_INDEXABLE) / self._log_gamma),
+            math.floor(math.log(sys.float_info.max) / self._log_gamma),
+        )
+
+    # -- reading ----------------------------------------------------------
+    def quantile(self, q: float) -> Optional[float]:
+        if not 0 <= q <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = np.cumsum(self.bins)
+        i = int(np.searchsorted(cumulative, rank - self.zero_count, side="right"))
+        i = min(i, self.bins.size - 1)
+        value = 2 * self.gamma ** (self.offset + i) / (self.gamma + 1)
+        return float(min(max(value, self.min), self.max))
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[str, Optional[float]]:
+        return {f"p{q * 100:g}": self.quantile(q) for q in qs}
+
+    # -- wire format ------------------------------------------------------
+    def to_dict(self) -> Dict:
+        nz = np.flatnonzero(self.bins)
+        bins = self.bins[nz[0] : nz[-1] + 1] if nz.size else self.bins[:0]
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "offset": self.offset + (int(nz[0]) if nz.size else 0),
+            "bins": bins.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping, max_bins: int = 2048) -> "DDSketch":
+        try:
+            sketch = cls(float(data["relative_accuracy"]), max_bins=max_bins)
+            bins = np.asarray(data.get("bins") or [], dtype=np.float64)
+            zero = float(data.get("zero_count", 0))
+            count = float(data["count"])
+            if count:
+                offset = int(data.get("offset", 0))
+                total = float(data.get("sum", 0.0))
+                lo, hi = float(data["min"]), float(data["max"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"malformed sketch: {e!r}") from None
+        if bins.ndim != 1 or (bins < 0).any() or zero < 0 or not math.isclose(bins.sum() + zero, count):
+            raise ValueError("malformed sketch: bin counts do not add up to count")
+        if bins.size > max_bins:
+            raise ValueError(f"malformed sketch: more than {max_bins} bins")
+        if count:
+            if not all(math.isfinite(x) for x in (count, total, lo, hi)):
+                raise ValueError("malformed sketch: count, sum, min and max must be finite")
+            min_key, max_key = sketch._key_range()
+            if bins.size and not min_key <= offset <= offset + bins.size - 1 <= max_key:
+                raise ValueError(f"malformed sketch: bin keys must lie in [{min_key}, {max_key}]")
+        if count:
+            sketch._add_counts(offset, bins)
+            sketch.zero_count = zero
+            sketch.count = count
+            sketch.sum = total
+            sketch.min = lo
+            sketch.max = hi
+        return sketch
+
+
+def _fold(dest: np.ndarray, dest_lo: int, lo: int, counts: np.ndarray) -> None:
+    """Add `counts` (keys from `lo`) into `dest` (keys from `dest_lo`),
+    folding keys below `dest_lo` into its first bucket."""
+    below = min(max(dest_lo - lo, 0), counts.size)
+    if below:
+        dest[0] += counts[:below].sum()
+    start = lo + below - dest_lo
+    dest[start : start + counts.size - below] += counts[below:]
+
+
+class _Window:
+    __slots__ = ("slot_ids", "sketches")
+
+    def __init__(self, slots: int) -> None:
+        self.slot_ids = np.full(slots, -1, dtype=np.int64)
+        self.sketches: List[Optional[DDSketch]] = [None] * slots
+
+
+class LatencySketches:
+    """Windowed latency sketches per model version, LRU-bounded."""
+
+    def __init__(
+        self,
+        slots: int = 12,
+        slot_seconds: float = 300.0,
+        max_models: int = 256,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+    ) -> None:
+        self._slots = slots
+        self._slot_seconds = slot_seconds
+        self._max_models = max_models
+        self._accuracy = relative_accuracy
+        self._max_bins = max_bins
+        self._models: "OrderedDict[str, _Window]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> float:
+        return self._slots * self._slot_seconds
+
+    def new_sketch(self) -> DDSketch:
+        return DDSketch(self._accuracy, self._max_bins)
+
+    def add(
+        self,
+        model_version: str,
+        samples: Optional[Iterable[float]] = None,
+        sketch: Optional[DDSketch] = None,
+        ts: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Fold raw samples and/or a pre-aggregated sketch into the slot for `ts`.
+
+        `ts` more than one slot ahead of `now` is rejected: it would claim a
+        ring row and make every genuine write to that row look stale.
+        """
+        now = time.time() if now is None else now
+        ts = now if ts is None else ts
+        if not math.isfinite(ts) or ts > now + self._slot_seconds:
+            raise ValueError("ts must not be more than one slot in the future")
+        incoming = self.new_sketch()
+        if samples is not None:
+            incoming.add_many(samples)
+        if sketch is not None:
+            incoming.merge(sketch)
+        if incoming.count == 0:
+            return
+        slot = int(ts // self._slot_seconds)
+        row = slot % self._slots
+        with self._lock:
+            window = self._models.get(model_version)
+            if window is None:
+                window = self._models[model_version] = _Window(self._slots)
+                while len(self._models) > self._max_models:
+                    self._models.popitem(last=False)
+            self._models.move_to_end(model_version)
+            if window.slot_ids[row] != slot:
+                if window.slot_ids[row] > slot:
+                    return  # older than the window
+                window.slot_ids[row] = slot
+                window.sketches[row] = incoming
+            else:
+                window.sketches[row].merge(incoming)
+
+    def merged(self, model_version: str, now: Optional[float] = None) -> Optional[DDSketch]:
+        """One sketch over the model's live window (None if nothing is live)."""
+        slot = int((time.time() if now is None else now) // self._slot_seconds)
+        out = self.new_sketch()
+        with self._lock:
+            window = self._models.get(model_version)
+            if window is None:
+                return None
+            live = (window.slot_ids > max(slot - self._slots, -1)) & (window.slot_ids <= slot)
+            for row in np.flatnonzero(live):
+                out.merge(window.sketches[row])
+        return out if out.count else None
+
+    def quantiles(
+        self,
+        model_version: str,
+        qs: Sequence[float] = (0.5, 0.95, 0.99),
+        now: Optional[float] = None,
+    ) -> Optional[Dict[str, Optional[float]]]:
+        sketch = self.merged(model_version, now)
+        return None if sketch is None else sketch.quantiles(qs)
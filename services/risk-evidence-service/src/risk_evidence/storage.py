@@ -0,0 +1,305 @@
+"""Append-only segmented log with length-prefixed, checksummed frames.
+
+Layout: `{root}/segments/{segment:08d}.log`. Each frame is
+
+    <u32 payload length><u32 crc32(payload)><payload>
+
+Segments roll once they exceed `segment_bytes`. Appends are durable when
+they return: concurrent writers share fsyncs through group commit (one
+writer becomes the leader and syncs everything written so far while the
+others wait on it). On open, the tail of the active segment is scanned and
+any torn or corrupt frame left by a crash is truncated away.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+FRAME_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".log"
+
+_fsync = getattr(os, "fdatasync", os.fsync)
+
+
+class Location(NamedTuple):
+    """Position of a frame: segment number, frame offset and payload length."""
+
+    segment: int
+    offset: int
+    length: int
+
+
+class CorruptFrameError(IOError):
+    """Raised when a frame fails its length or checksum validation."""
+
+
+def encode_frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def iter_frames(data: bytes, base: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, payload) for every valid frame in `data`, stopping at
+    the first torn or corrupt one."""
+    pos, end = 0, len(data)
+    while pos + FRAME_HEADER.size <= end:
+        length, crc = FRAME_HEADER.unpack_from(data, pos)
+        start = pos + FRAME_HEADER.size
+        if start + length > end:
+            return
+        payload = data[start : start + length]
+        if zlib.crc32(payload) != crc:
+            return
+        yield base + pos, payload
+        pos = start + length
+
+
+class SegmentedLog:
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+    ) -> None:
+        self._dir = Path(root) / "segments"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._fsync = fsync
+
+        self._write_lock = threading.Lock()
+        self._sync_cond = threading.Condition()
+        self._syncing = False
+        self._read_lock = threading.Lock()
+        self._read_fds: Dict[int, int] = {}
+        self._read_refs: Dict[int, int] = {}  # fd -> reads in flight
+        self._retired_fds: Set[int] = set()
+
+        segments = self.segments()
+        self._segment = segments[-1] if segments else 1
+        self._offset = self._recover(self._segment)
+        self._fd = self._open_for_append(self._segment)
+        self._synced: Tuple[int, int] = (self._segment, self._offset)
+
+    # -- writing ----------------------------------------------------------
+    def append(self, payload: bytes) -> Location:
+        return self.append_many([payload])[0]
+
+    def append_many(self, payloads: Iterable[bytes]) -> List[Location]:
+        """Append payloads contiguously and return once they are durable."""
+        locations, token = self.write_many(payloads)
+        self.sync(token)
+        return locations
+
+    def write_many(self, payloads: Iterable[bytes]) -> Tuple[List[Location], Tuple[int, int]]:
+        """Write payloads without waiting for durability.
+
+        Returns the frame locations and a token to pass to sync(). Callers
+        that need to order other work with the log (e.g. index updates) can
+        do it between the two calls.
+        """
+        frames = [encode_frame(p) for p in payloads]
+        locations: List[Location] = []
+        with self._write_lock:
+            if not frames:
+                return locations, (self._segment, self._offset)
+            size = sum(len(f) for f in frames)
+            if self._offset and self._offset + size > self._segment_bytes:
+                self._roll()
+            offset = self._offset
+            for frame in frames:
+                locations.append(Location(self._segment, offset, len(frame) - FRAME_HEADER.size))
+                offset += len(frame)
+            try:
+                self._write_all(b"".join(frames))
+            except BaseException:
+                # Drop a torn batch so the next one lands where its
+                # locations say it does.
+                os.ftruncate(self._fd, self._offset)
+                raise
+            self._offset = offset
+            return locations, (self._segment, offset)
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def sync(self, token: Tuple[int, int]) -> None:
+        """Block until everything up to `token` is on disk (group commit)."""
+        if not self._fsync:
+            return
+        with self._sync_cond:
+            while self._synced < token:
+                if not self._syncing:
+                    break
+                self._sync_cond.wait()
+            else:
+                return
+            self._syncing = True
+            target = self._synced
+        try:
+            # Leader: sync everything written so far, not just our frames.
+            with self._write_lock:
+                end = (self._segment, self._offset)
+                fd = os.dup(self._fd)
+            try:
+                _fsync(fd)
+            finally:
+                os.close(fd)
+            target = end  # only advance once the fsync succeeded
+        finally:
+            with self._sync_cond:
+                self._syncing = False
+                if target > self._synced:
+                    self._synced = target
+                self._sync_cond.notify_all()
+
+    def _roll(self) -> None:
+        """Seal the active segment and start the next one (write lock held)."""
+        if self._fsync:
+            _fsync(self._fd)
+        os.close(self._fd)
+        with self._sync_cond:
+            self._synced = max(self._synced, (self._segment, self._offset))
+        self._segment += 1
+        self._offset = 0
+        self._fd = self._open_for_append(self._segment)
+        if self._fsync:
+            self._sync_dir()
+
+    def _sync_dir(self) -> None:
+        try:
+            fd = os.open(self._dir, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # -- reading ----------------------------------------------------------
+    def read(self, location: Location) -> bytes:
+        fd = self._acquire(location.segment)
+        size = FRAME_HEADER.size + location.length
+        try:
+            data = os.pread(fd, size, location.offset)
+        finally:
+            self._release(fd)
+        if len(data) != size:
+            raise CorruptFrameError(f"short read at {location}")
+        length, crc = FRAME_HEADER.unpack_from(data)
+        payload = data[FRAME_HEADER.size :]
+        if length != location.length or zlib.crc32(payload) != crc:
+            raise CorruptFrameError(f"checksum mismatch at {location}")
+        return payload
+
+    def replay(self, start: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[Location, bytes]]:
+        """Yield every durable frame in log order, optionally from (segment, offset)."""
+        with self._write_lock:
+            end = (self._segment, self._offset)
+        first_segment, first_offset = start or (0, 0)
+        for segment in self.segments():
+            if segment < first_segment or segment > end[0]:
+                continue
+            with open(self._path(segment), "rb") as fh:
+                offset = first_offset if segment == first_segment else 0
+                fh.seek(offset)
+                limit = end[1] - offset if segment == end[0] else -1
+                data = fh.read(limit)
+            for frame_offset, payload in iter_frames(data, offset):
+                yield Location(segment, frame_offset, len(payload)), payload
+
+    def _acquire(self, segment: int) -> int:
+        with self._read_lock:
+            fd = self._read_fds.get(segment)
+            if fd is None:
+                fd = os.open(self._path(segment), os.O_RDONLY)
+                self._read_fds[segment] = fd
+            self._read_refs[fd] = self._read_refs.get(fd, 0) + 1
+            return fd
+
+    def _release(self, fd: int) -> None:
+        with self._read_lock:
+            refs = self._read_refs.pop(fd, 1) - 1
+            if refs > 0:
+                self._read_refs[fd] = refs
+                return
+            if fd in self._retired_fds:
+                self._retired_fds.discard(fd)
+                os.close(fd)
+
+    # -- housekeeping -----------------------------------------------------
+    @property
+    def active_segment(self) -> int:
+        return self._segment
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        with self._write_lock:
+            return (self._segment, self._offset)
+
+    def segments(self) -> List[int]:
+        return sorted(
+            int(p.stem) for p in self._dir.glob(f"*{SEGMENT_SUFFIX}") if p.stem.isdigit()
+        )
+
+    def segment_path(self, segment: int) -> Path:
+        return self._path(segment)
+
+    def drop_segment(self, segment: int) -> None:
+        """Delete a sealed segment once its frames live elsewhere (cold tier).
+
+        A cached read fd is closed now if no read() is using it, otherwise
+        by the last concurrent read() to finish; the unlinked file's space
+        is freed once that happens.
+        """
+        if segment >= self.active_segment:
+            raise ValueError("cannot drop the active segment")
+        with self._read_lock:
+            fd = self._read_fds.pop(segment, None)
+            if fd is not None:
+                if fd in self._read_refs:
+                    self._retired_fds.add(fd)
+                else:
+                    os.close(fd)
+        self._path(segment).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._fsync:
+                _fsync(self._fd)
+            os.close(self._fd)
+        with self._read_lock:
+            for fd in [*self._read_fds.values(), *self._retired_fds]:
+                os.close(fd)
+            self._read_fds.clear()
+            self._read_refs.clear()
+            self._retired_fds.clear()
+
+    def _path(self, segment: int) -> Path:
+        return self._dir / f"{segment:08d}{SEGMENT_SUFFIX}"
+
+    def _open_for_append(self, segment: int) -> int:
+        return os.open(self._path(segment), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _recover(self, segment: int) -> int:
+        """Truncate a torn tail from the active segment; return its length."""
+        path = self._path(segment)
+        if not path.exists():
+            return 0
+        data = path.read_bytes()
+        good = 0
+        for offset, payload in iter_frames(data):
+            good = offset + FRAME_HEADER.size + len(payload)
+        if good != len(data):
+            with open(path, "r+b") as fh:
+                fh.truncate(good)
+                fh.flush()
+                os.fsync(fh.fileno())
+        return good
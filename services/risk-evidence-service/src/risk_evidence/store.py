@@ -0,0 +1,309 @@
+"""Content-addressed evidence store: segmented log plus SQLite indexes.
+
+Records are framed into the log as `{"id", "stored_at", "evidence"}` JSON;
+the index maps ids to log locations and is kept in step with the log under
+one lock, so the index order (`seq`) always equals log order. Re-posting
+identical evidence is a single index lookup and writes nothing. When a
+MerkleTree is attached, record `seq` is appended as leaf `seq`. When a
+ColdArchive is attached, reads fall through to it for compacted segments.
+"""
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+import threading
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from risk_evidence.archive import ColdArchive
+from risk_evidence.index import EvidenceIndex, IndexRow
+from risk_evidence.merkle import MerkleTree
+from risk_evidence.storage import FRAME_HEADER, CorruptFrameError, Location, SegmentedLog, iter_frames
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_REPLAY_BATCH = 10_000
+
+
+def evidence_id(content: Mapping[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def format_time(ts: float) -> str:
+    return time.strftime(TIME_FORMAT, time.gmtime(ts))
+
+
+def parse_time(value: str) -> float:
+    return float(calendar.timegm(time.strptime(value, TIME_FORMAT)))
+
+
+class PutResult(NamedTuple):
+    id: str
+    stored_at: str
+    duplicate: bool
+
+
+class CompactionResult(NamedTuple):
+    kept: int
+    dropped: int
+    bytes_before: int
+    bytes_after: int
+
+
+class EvidenceStore:
+    def __init__(
+        self,
+        log: SegmentedLog,
+        index: EvidenceIndex,
+        tree: Optional[MerkleTree] = None,
+        archive: Optional[ColdArchive] = None,
+    ) -> None:
+        self._log = log
+        self._index = index
+        self.tree = tree
+        self.archive = archive
+        self._lock = threading.Lock()
+        with self._lock:
+            self._catch_up()
+            self._next_seq = index.next_seq()
+            if tree is not None:
+                self._catch_up_tree()
+
+    # -- writing ----------------------------------------------------------
+    def put(self, content: Mapping[str, Any], now: Optional[float] = None) -> PutResult:
+        return self.put_many([content], now)[0]
+
+    def put_many(
+        self, contents: Sequence[Mapping[str, Any]], now: Optional[float] = None
+    ) -> List[PutResult]:
+        """Store evidence, skipping anything already present (by content hash).
+
+        Returns once new records are durable. Duplicates, including repeats
+        within the batch, report the original `stored_at`.
+        """
+        return self.put_hashed([(evidence_id(c), c) for c in contents], now)
+
+    def put_hashed(
+        self, items: Sequence[Tuple[str, Mapping[str, Any]]], now: Optional[float] = None
+    ) -> List[PutResult]:
+        """put_many() for callers that already hashed the canonical content
+        (bulk ingest hashes in worker processes)."""
+        now = time.time() if now is None else now
+        stored_at = format_time(now)
+        results: List[PutResult] = []
+        token = None
+        with self._lock:
+            existing = self._index.contains_many(list(dict.fromkeys(eid for eid, _ in items)))
+            fresh: Dict[str, Mapping[str, Any]] = {}
+            for eid, content in items:
+                row = existing.get(eid)
+                if row is not None:
+                    results.append(PutResult(eid, format_time(row.stored_at), True))
+                elif eid in fresh:
+                    results.append(PutResult(eid, stored_at, True))
+                else:
+                    fresh[eid] = content
+                    results.append(PutResult(eid, stored_at, False))
+            if fresh:
+                payloads = [
+                    json.dumps({"id": eid, "stored_at": stored_at, "evidence": c}, sort_keys=True).encode()
+                    for eid, c in fresh.items()
+                ]
+                locations, token = self._log.write_many(payloads)
+                rows = [
+                    IndexRow(self._next_seq + i, eid, loc, c["modelVersion"], c["artifactType"], now)
+                    for i, ((eid, c), loc) in enumerate(zip(fresh.items(), locations))
+                ]
+                # Index rows may briefly run ahead of the fsync; a crash in
+                # between is repaired by _catch_up() truncating them.
+                self._index.insert_many(rows, token)
+                self._next_seq += len(rows)
+                if self.tree is not None:
+                    self.tree.append_many(bytes.fromhex(eid) for eid in fresh)
+        if token is not None:
+            self._log.sync(token)
+        return results
+
+    def _catch_up(self) -> None:
+        """Bring the index in line with the log after a crash or a rebuild."""
+        end = self._log.position
+        self._index.truncate_after(end)
+        start = self._index.position()
+        seq = 0
+        if self.archive is not None:
+            # Only reached with a fresh or lagging index; archives keep the
+            # original seq of each record, so numbering survives retention.
+            hot = set(self._log.segments())
+            cold = [s for s in self.archive.segments() if s >= start[0] and s not in hot]
+            for segment in cold:
+                self._reindex(
+                    (loc, seq, payload)
+                    for loc, seq, payload in self.archive.replay(segment)
+                    if loc.offset >= start[1] or segment > start[0]
+                )
+                seq = max(seq, self.archive.end_seq(segment))
+        seq = max(seq, self._index.next_seq())
+        hot_frames = (
+            (loc, n, payload)
+            for n, (loc, payload) in enumerate(self._log.replay(self._index.position()), start=seq)
+        )
+        self._reindex(hot_frames)
+        self._index.insert_many([], end)
+
+    def _reindex(self, frames: Iterable[Tuple[Location, int, bytes]]) -> None:
+        rows: List[IndexRow] = []
+        location = None
+        for location, seq, payload in frames:
+            record = json.loads(payload)
+            content = record["evidence"]
+            rows.append(
+                IndexRow(
+                    seq,
+                    record["id"],
+                    location,
+                    content["modelVersion"],
+                    content["artifactType"],
+                    parse_time(record["stored_at"]),
+                )
+            )
+            if len(rows) >= _REPLAY_BATCH:
+                self._index.insert_many(rows, self._frame_end(location))
+                rows = []
+        if rows:
+            self._index.insert_many(rows, self._frame_end(location))
+
+    @staticmethod
+    def _payload(data: bytes, location: Location) -> bytes:
+        frames = iter_frames(data[location.offset : EvidenceStore._frame_end(location)[1]])
+        for _, payload in frames:
+            if len(payload) == location.length:
+                return payload
+        raise CorruptFrameError(f"checksum mismatch at {location}")
+
+    @staticmethod
+    def _frame_end(location: Location) -> Tuple[int, int]:
+        return (location.segment, location.offset + FRAME_HEADER.size + location.length)
+
+    def _catch_up_tree(self) -> None:
+        if self.tree.size > self._next_seq:
+            self.tree.truncate(self._next_seq)
+        ids = self._index.ids_from(self.tree.size)
+        while batch := list(islice(ids, _REPLAY_BATCH)):
+            if batch[0][0] != self.tree.size or batch[-1][0] != self.tree.size + len(batch) - 1:
+                raise RuntimeError(
+                    f"merkle tree cannot be rebuilt past leaf {self.tree.size}: "
+                    "records were removed by retention; restore merkle/ from backup"
+                )
+            self.tree.append_many(bytes.fromhex(eid) for _, eid in batch)
+
+    # -- compaction -------------------------------------------------------
+    def sealed_segments(self) -> List[int]:
+        """Hot segments that no longer receive writes."""
+        active = self._log.active_segment
+        return [s for s in self._log.segments() if s < active]
+
+    def segment_bounds(self, segment: int) -> Dict[str, Tuple[float, float]]:
+        return self._index.segment_bounds(segment)
+
+    def compact_segment(self, segment: int, keep: Callable[[IndexRow], bool]) -> CompactionResult:
+        """Move a sealed segment into the cold tier (or rewrite its archive),
+        keeping only records for which `keep(row)` is true.
+
+        Reading and compressing happen without the store lock, so ingest is
+        not blocked; only the index deletions take it. The archive is made
+        durable before the hot segment is dropped, and readers fall back to
+        the archive if the hot file disappears under them.
+        """
+        if self.archive is None:
+            raise RuntimeError("no cold archive configured")
+        if segment >= self._log.active_segment:
+            raise ValueError("cannot compact the active segment")
+        cold = self.archive.has(segment) and not self._log.segment_path(segment).exists()
+        source = self.archive.path(segment) if cold else self._log.segment_path(segment)
+        before = source.stat().st_size if source.exists() else 0
+        rows = self._index.segment_rows(segment)
+        end_seq = self.archive.end_seq(segment) if cold else max((r.seq + 1 for r in rows), default=0)
+        kept = [r for r in rows if keep(r)]
+        dropped = [r.seq for r in rows if not keep(r)]
+        if cold and not dropped:
+            return CompactionResult(len(kept), 0, before, before)
+
+        if cold:
+            records = ((r.location.offset, r.seq, self.archive.read(r.location)) for r in kept)
+        else:
+            data = source.read_bytes()
+            records = (
+                (r.location.offset, r.seq, self._payload(data, r.location)) for r in kept
+            )
+        after = self.archive.write(segment, records, end_seq)
+        if dropped:
+            with self._lock:
+                self._index.delete_seqs(dropped)
+        if not cold:
+            self._log.drop_segment(segment)
+        return CompactionResult(len(kept), len(dropped), before, after)
+
+    # -- reading ----------------------------------------------------------
+    def seq_of(self, evidence_id: str) -> Optional[int]:
+        row = self._index.get(evidence_id)
+        return row.seq if row is not None else None
+
+    def get(self, evidence_id: str) -> Optional[Dict[str, Any]]:
+        row = self._index.get(evidence_id)
+        if row is None:
+            return None
+        try:
+            return self._load(row)
+        except KeyError:  # removed by retention after the lookup
+            return None
+
+    def query(
+        self,
+        model_version: Optional[str] = None,
+        artifact_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest-first page of records matching every given filter."""
+        rows, next_cursor = self._index.query(
+            model_version=model_version,
+            artifact_type=artifact_type,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+        )
+        records = []
+        for row in rows:
+            try:
+                records.append(self._load(row))
+            except KeyError:
+                continue
+        return records, next_cursor
+
+    def _read(self, location: Location) -> bytes:
+        if self.archive is not None and self.archive.has(location.segment):
+            return self.archive.read(location)
+        try:
+            return self._log.read(location)
+        except FileNotFoundError:
+            if self.archive is None:
+                raise
+            return self.archive.read(location)  # compacted since the check
+
+    def _load(self, row: IndexRow) -> Dict[str, Any]:
+        record = json.loads(self._read(row.location))
+        record["seq"] = row.seq
+        return record
+
+    def __len__(self) -> int:
+        return self._index.count()
+
+    def close(self) -> None:
+        if self.tree is not None:
+            self.tree.close()
+        self._index.close()
+        self._log.close()
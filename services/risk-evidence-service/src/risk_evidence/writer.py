@@ -0,0 +1,86 @@
+"""Write-behind queue in front of the evidence store for async handlers.
+
+Handlers enqueue already-hashed evidence and await the result without
+holding a thread: one drain task per event loop takes everything queued (up
+to `max_batch`) and stores it with a single `put_hashed` call on a dedicated
+executor, so concurrent requests share one log append and one fsync. The
+queue is bounded; when it is full `submit` raises `Overloaded` straight away
+so callers can shed load instead of piling up behind the disk.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Tuple
+
+Item = Tuple[str, Mapping[str, Any]]
+
+
+class Overloaded(Exception):
+    pass
+
+
+class WriteBehind:
+    def __init__(
+        self,
+        put_batch: Callable[[Sequence[Item]], Sequence[Any]],
+        executor: Executor,
+        max_pending: int = 1024,
+        max_batch: int = 256,
+    ) -> None:
+        self._put_batch = put_batch
+        self._executor = executor
+        self._max_pending = max_pending
+        self._max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_running(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            # First use, or a new loop (e.g. test clients each run their own).
+            self._loop = loop
+            self._queue = asyncio.Queue(self._max_pending)
+            self._task = loop.create_task(self._drain(self._queue))
+        return self._queue
+
+    async def submit(self, item: Item) -> Any:
+        queue = self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise Overloaded(f"{self._max_pending} evidence writes already pending") from None
+        return await future
+
+    async def _drain(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[Item, asyncio.Future]] = [await queue.get()]
+            while len(batch) < self._max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._put_batch, [item for item, _ in batch]
+                )
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,39 @@
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# RES modules live under src/. The service app is loaded under its own module
+# name (not `app`) so these tests can share a pytest session with the
+# policy-gateway suite.
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(scope="session")
+def res_app(tmp_path_factory):
+    """The RES app module, configured once per session against a temp store."""
+    env = {
+        "STORAGE_PATH": str(tmp_path_factory.mktemp("res-evidence")),
+        "EVIDENCE_FSYNC": "0",
+        "EVIDENCE_COMPACT_INTERVAL": "0",
+        "INGEST_WORKERS": "0",
+        "INGEST_BATCH": "4",
+        "INGEST_MAX_LINE_BYTES": "4096",
+        "PAC_CONFIG": str(Path(__file__).resolve().parents[3] / "policies" / "adr-006.embedded-governance.yaml"),
+    }
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        spec = importlib.util.spec_from_file_location("res_app", SRC / "app.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    return module
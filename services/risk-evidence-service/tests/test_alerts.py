@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pytest
+
+from risk_evidence.alerts import AlertEngine, ConditionError, IncidentLog, compile_condition
+from risk_evidence.metrics import metric_spec
+
+CFG = {
+    "thresholds": {
+        "quality": {"pass_at_5": {"target": 0.82}},
+        "safety": {"harmful_rate": {"target_max": 0.005}},
+    },
+    "monitoring": {
+        "metrics": [{"name": "answer_quality_pass_at_5", "target": "thresholds.quality.pass_at_5.target"}],
+        "alerts": [
+            {
+                "name": "sev1_privacy_or_safety",
+                "condition": "harmful_output_rate > thresholds.safety.harmful_rate.target_max "
+                "OR privacy_incident_detected == true",
+                "action": ["page:oncall", "traffic:safe_mode"],
+            },
+            {
+                "name": "sev2_quality_regression",
+                "condition": "answer_quality_pass_at_5 < thresholds.quality.pass_at_5.target * 0.95",
+                "action": ["create:ticket"],
+            },
+            {"name": "broken", "condition": "__import__('os').system('true')"},
+        ],
+    },
+}
+
+
+def resolve(name):
+    try:
+        return metric_spec(name).key
+    except KeyError:
+        return name
+
+
+def test_condition_compiles_threshold_refs_to_constants():
+    predicate, inputs = compile_condition("a > thresholds.safety.harmful_rate.target_max * 2 AND NOT b", CFG)
+    assert inputs == ("a", "b")
+    assert 0.01 in predicate.__code__.co_consts
+    assert predicate({"a": 0.02, "b": False}) is True
+    assert predicate({"a": 0.02, "b": True}) is False
+    assert predicate({}) is False  # unobserved inputs read as NaN
+    with pytest.raises(ConditionError):
+        compile_condition("a > thresholds.safety.nope", CFG)
+    with pytest.raises(ConditionError):
+        compile_condition("a.__class__ > 1 or f(a)", CFG)
+
+
+def test_engine_reevaluates_dependents_and_dedupes_incidents():
+    incidents = IncidentLog()
+    engine = AlertEngine(incidents, resolve=resolve)
+    engine.configure(CFG, version=1)
+    assert [r.name for r in engine.rules] == ["sev1_privacy_or_safety", "sev2_quality_regression"]
+    assert "broken" in engine.errors
+    assert engine.rules[1].inputs == ("quality.pass_at_5",)
+
+    events = engine.update([("safety.harmful_rate", "m-1", "prod", 0.01)], now=10)
+    assert [(e["alert"], e["state"], e["severity"]) for e in events] == [("sev1_privacy_or_safety", "firing", "sev1")]
+    first = events[0]["incident"]
+    assert first["duplicate"] is False
+    # Still firing: no new transition; a different scope is independent.
+    assert engine.update([("privacy_incident_detected", "m-1", "prod", 1)], now=11) == []
+    assert engine.update([("quality.pass_at_5", "m-1", "prod", 0.9)], now=11) == []
+
+    resolved = engine.update(
+        [("safety.harmful_rate", "m-1", "prod", 0.001), ("privacy_incident_detected", "m-1", "prod", 0)], now=12
+    )
+    assert [e["state"] for e in resolved] == ["resolved"]
+    # Re-firing while the incident is still open joins it.
+    again = engine.update([("safety.harmful_rate", "m-1", "prod", 0.02)], now=13)
+    assert again[0]["incident"] == {**first, "duplicate": True}
+    assert incidents.open_incidents()[0]["occurrences"] == 2
+
+    incidents.resolve(first["id"])
+    engine.update([("safety.harmful_rate", "m-1", "prod", 0.0)], now=14)
+    fresh = engine.update([("safety.harmful_rate", "m-1", "prod", 0.02)], now=15)
+    assert fresh[0]["incident"]["duplicate"] is False
+
+    # A new config version re-checks existing scopes with the new thresholds.
+    stricter = {**CFG, "thresholds": {**CFG["thresholds"], "quality": {"pass_at_5": {"target": 0.99}}}}
+    events = engine.configure(stricter, version=2)
+    assert [(e["alert"], e["state"]) for e in events] == [("sev2_quality_regression", "firing")]
+    assert engine.configure(stricter, version=2) == []
+    assert {a["alert"] for a in engine.firing()} == {"sev1_privacy_or_safety", "sev2_quality_regression"}
+
+
+def test_evicted_scopes_stop_firing():
+    engine = AlertEngine(IncidentLog(), resolve=resolve, max_scopes=2)
+    engine.configure(CFG, version=1)
+    engine.update([("safety.harmful_rate", "m-1", "prod", 0.01)], now=1)
+    engine.update([("safety.harmful_rate", "m-2", "prod", 0.01)], now=2)
+    assert {a["model_version"] for a in engine.firing()} == {"m-1", "m-2"}
+
+    events = engine.update([("quality.pass_at_5", "m-3", "prod", 0.9)], now=3)
+    assert [(e["model_version"], e["state"], e.get("evicted")) for e in events] == [("m-1", "resolved", True)]
+    assert {a["model_version"] for a in engine.firing()} == {"m-2"}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _record(i):
+    return {"artifactType": "eval_pack", "modelVersion": "bulk-m", "contentRef": f"s3://e/bulk/{i}"}
+
+
+def test_bulk_reports_stored_lines_before_an_oversized_line(res_app):
+    client = TestClient(res_app.app)
+    lines = [json.dumps(_record(i)) for i in range(6)]
+    body = "\n".join(lines[:5] + ["x" * 5000, lines[5]]).encode()
+    before = res_app.EVID_CNT._value.get()
+
+    resp = client.post("/evidence/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["line"] for r in rows] == [1, 2, 3, 4, 5, 6]
+    assert rows[-1] == {"line": 6, "error": "line too long"}
+    assert resp.headers["X-RES-Stored"] == "5" and resp.headers["X-RES-Errors"] == "1"
+    assert res_app.EVID_CNT._value.get() == before + 5
+    for row in rows[:-1]:
+        assert client.get(f"/evidence/{row['id']}").status_code == 200
+
+
+def test_latency_rejects_a_malformed_sketch_with_400(res_app):
+    client = TestClient(res_app.app)
+    sketch = {"relative_accuracy": 0.01, "offset": None, "bins": [1], "count": 1, "min": 0.1, "max": 0.1}
+    resp = client.post("/latency", json={"modelVersion": "sketch-m", "sketch": sketch})
+    assert resp.status_code == 400 and "malformed sketch" in resp.json()["detail"]
+    del sketch["min"]
+    sketch["offset"] = 0
+    assert client.post("/latency", json={"modelVersion": "sketch-m", "sketch": sketch}).status_code == 400
+
+
+def test_latency_rejects_a_sketch_with_out_of_range_keys(res_app):
+    client = TestClient(res_app.app)
+    sketch = {"relative_accuracy": 0.01, "offset": 300_000_000, "bins": [1], "count": 1, "sum": 1.0, "min": 1.0, "max": 1.0}
+    resp = client.post("/latency", json={"modelVersion": "offset-m", "sketch": sketch})
+    assert resp.status_code == 400 and "bin keys" in resp.json()["detail"]
+    assert client.get("/latency/quantiles", params={"model": "offset-m"}).json()["count"] == 0
+
+
+def test_latency_quantiles_reads_the_window_and_rejects_future_ts(res_app):
+    client = TestClient(res_app.app)
+    assert client.post("/latency", json={"modelVersion": "q-m", "samples": [0.1] * 9 + [1.0]}).status_code == 202
+    resp = client.post("/latency", json={"modelVersion": "q-m", "samples": [5.0], "ts": 1e12})
+    assert resp.status_code == 400
+
+    report = client.get("/latency/quantiles", params={"model": "q-m", "q": [0.5, 1.0]}).json()
+    assert report["count"] == 10 and report["window_seconds"] == res_app.LATENCY.window_seconds
+    assert report["quantiles"]["p50"] == pytest.approx(0.1, rel=0.011)
+    assert report["quantiles"]["p100"] == pytest.approx(1.0, rel=0.011)
+    assert client.get("/latency/quantiles", params={"model": "q-m", "q": [2]}).status_code == 400
+
+
+def test_observation_work_runs_off_the_event_loop(res_app, monkeypatch):
+    threads = []
+    record = res_app.record_observations
+
+    def spy(points):
+        threads.append(threading.current_thread().name)
+        return record(points)
+
+    monkeypatch.setattr(res_app, "record_observations", spy)
+    client = TestClient(res_app.app)
+    obs = {"observations": [["quality.pass_at_5", "obs-m", "default", 0.9, None]]}
+    assert client.post("/observations", json=obs).json()["accepted"] == 1
+    assert client.post("/risk/metrics", json={"modelVersion": "obs-m", "values": {"quality.pass_at_5": 0.9}}).status_code == 202
+    assert client.post("/latency", json={"modelVersion": "obs-m", "samples": [0.1, 0.2]}).status_code == 202
+    assert client.post("/observations", json={"observations": [["nope", "obs-m", "default", 1, None]]}).status_code == 400
+    assert threads and all(name.startswith("res-observe") for name in threads)
+
+
+def test_evidence_summary_view_pages_without_metadata(res_app):
+    client = TestClient(res_app.app)
+    for i in range(3):
+        record = {**_record(i), "modelVersion": "view-m", "metadata": {"blob": "x" * (100 + i)}}
+        assert client.post("/evidence", json=record).status_code == 201
+
+    first = client.get("/evidence", params={"modelVersion": "view-m", "view": "summary", "limit": 2}).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    rest = client.get(
+        "/evidence", params={"modelVersion": "view-m", "view": "summary", "cursor": first["next_cursor"]}
+    ).json()
+    items = first["items"] + rest["items"]
+    assert len(items) == 3 and rest["next_cursor"] is None
+    assert all("metadata" not in item and item["metadata_bytes"] > 100 for item in items)
+    full = client.get(f"/evidence/{items[0]['id']}").json()
+    assert len(json.dumps(full["metadata"])) == items[0]["metadata_bytes"]
+
+
+def test_risk_history_downsamples_and_lists_models(res_app):
+    client = TestClient(res_app.app)
+    rows = [["quality.pass_at_5", "hist-m", "default", i / 10, 1_000.0 + i] for i in range(10)]
+    rows.append(["safety.harmful_rate", "hist-m", "default", 0.001, 1_005.0])
+    client.post("/observations", json={"observations": rows})
+
+    history = client.get("/risk/history", params={"model": "hist-m", "max_points": 2}).json()
+    assert history["model_version"] == "hist-m" and set(history["series"]) == {"quality.pass_at_5", "safety.harmful_rate"}
+    assert history["series"]["quality.pass_at_5"] == [[1_002.0, pytest.approx(0.2)], [1_007.0, pytest.approx(0.7)]]
+
+    one = client.get("/risk/history", params={"model": "hist-m", "metric": "pass_at_5", "since": 1_008}).json()
+    assert list(one["series"]) == ["quality.pass_at_5"] and len(one["series"]["quality.pass_at_5"]) == 2
+    assert client.get("/risk/history", params={"model": "hist-m", "metric": "nope"}).status_code == 400
+    assert client.get("/risk/history", params={"model": "unknown-m"}).json()["series"] == {}
+
+    assert client.get("/risk/models").json()["models"][-1] == "hist-m"
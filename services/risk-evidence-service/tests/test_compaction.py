@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+
+from risk_evidence.archive import ColdArchive
+from risk_evidence.compaction import DAY, Compactor, parse_retention
+from risk_evidence.index import EvidenceIndex
+from risk_evidence.merkle import MerkleTree
+from risk_evidence.storage import SegmentedLog
+from risk_evidence.store import EvidenceStore
+
+
+def _open(root):
+    return EvidenceStore(
+        SegmentedLog(root, segment_bytes=16 * 1024, fsync=False),
+        EvidenceIndex(root / "index.sqlite3"),
+        MerkleTree(root / "merkle"),
+        ColdArchive(root / "cold"),
+    )
+
+
+def _evidence(i, kind):
+    return {
+        "artifactType": kind,
+        "modelVersion": f"model-{i % 3}",
+        "metadata": {"pipeline": "ci", "run": i, "suite": "governance-eval", "status": "passed"},
+        "contentRef": f"s3://evidence-bucket/releases/model-{i % 3}/run-{i}/report.json",
+    }
+
+
+def test_compaction_moves_old_segments_cold_and_applies_retention(tmp_path):
+    store = _open(tmp_path)
+    day0 = 1_700_000_000
+    ids = []
+    for i in range(600):
+        kind = "ci_evidence" if i % 2 else "dpia"
+        ids.append(store.put(_evidence(i, kind), now=day0 + i * 60).id)
+    sealed = store.sealed_segments()
+    hot_bytes = sum((tmp_path / "segments" / f"{s:08d}.log").stat().st_size for s in sealed)
+
+    retention = parse_retention('{"ci_evidence": 30, "*": null}')
+    compactor = Compactor(store, cold_after=7 * DAY, retention=retention)
+    assert compactor.run_once(now=day0 + 2 * DAY)["segments"] == 0  # still hot
+
+    totals = compactor.run_once(now=day0 + 10 * DAY)
+    assert totals["segments"] == len(sealed) and totals["dropped"] == 0
+    assert store.sealed_segments() == []
+    assert hot_bytes >= 5 * store.archive.size_bytes()
+    assert store.get(ids[3])["evidence"] == _evidence(3, "ci_evidence")
+    page, _ = store.query(model_version="model-1", limit=500)
+    assert len(page) == 200
+
+    totals = compactor.run_once(now=day0 + 40 * DAY)
+    assert totals["dropped"] > 0
+    assert store.get(ids[3]) is None  # ci_evidence past 30 days
+    assert store.get(ids[4]) is not None  # dpia kept forever
+    assert store.put(_evidence(599, "ci_evidence")).duplicate  # still hot, still indexed
+    root = store.tree.root()
+    store.close()
+
+    (tmp_path / "index.sqlite3").unlink()
+    for suffix in ("-wal", "-shm"):
+        (tmp_path / f"index.sqlite3{suffix}").unlink(missing_ok=True)
+    store = _open(tmp_path)
+    assert store.seq_of(ids[4]) == 4  # original numbering survives
+    assert store.tree.root() == root
+    assert store.get(ids[3]) is None
+    store.close()
+
+
+def _deleted_fds():
+    fd_dir = Path("/proc/self/fd")
+    deleted = []
+    for entry in fd_dir.iterdir():
+        try:
+            target = os.readlink(entry)
+        except OSError:
+            continue
+        if target.endswith(" (deleted)"):
+            deleted.append(target)
+    return deleted
+
+
+@pytest.mark.skipif(not Path("/proc/self/fd").is_dir(), reason="needs /proc")
+def test_compaction_closes_read_fds_of_dropped_segments(tmp_path):
+    store = _open(tmp_path)
+    day0 = 1_700_000_000
+    ids = [store.put(_evidence(i, "dpia"), now=day0 + i).id for i in range(400)]
+    for evidence_id in ids:  # open a cached reader on every segment
+        assert store.get(evidence_id) is not None
+    assert len(store.sealed_segments()) > 1
+
+    Compactor(store, cold_after=DAY, retention={}).run_once(now=day0 + 2 * DAY)
+    assert store.sealed_segments() == []
+    assert not [t for t in _deleted_fds() if str(tmp_path) in t]
+    assert store.get(ids[0])["evidence"] == _evidence(0, "dpia")
+    store.close()
+
+
+def test_dropping_a_segment_mid_read_closes_it_after_the_read(tmp_path):
+    log = SegmentedLog(tmp_path, segment_bytes=64, fsync=False)
+    first = log.append(b"x" * 80)
+    log.append(b"y")  # rolls, sealing segment 1
+    fd = log._acquire(first.segment)
+    log.drop_segment(first.segment)
+    assert os.pread(fd, 4, first.offset)  # still readable while in use
+    log._release(fd)
+    with pytest.raises(OSError):
+        os.fstat(fd)
+    log.close()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from risk_evidence.drift import DriftMonitor, FeatureDrift
+
+
+def test_psi_is_near_zero_for_matching_distribution():
+    rng = np.random.default_rng(0)
+    monitor = DriftMonitor()
+    monitor.set_reference("m1", "score", values=rng.normal(size=50_000))
+
+    psi = monitor.observe("m1", {"score": rng.normal(size=50_000)}, now=1_000.0)
+    assert psi["score"] is not None and psi["score"] < 0.01
+
+
+def test_psi_detects_shift_and_ignores_unknown_features():
+    rng = np.random.default_rng(1)
+    monitor = DriftMonitor()
+    monitor.set_reference("m1", "score", values=rng.normal(size=50_000))
+
+    psi = monitor.observe(
+        "m1", {"score": rng.normal(loc=1.0, size=50_000), "other": [1.0]}, now=1_000.0
+    )
+    assert psi["score"] > 0.2
+    assert psi["other"] is None
+    assert monitor.max_psi("m1", now=1_000.0) == pytest.approx(psi["score"])
+
+
+def test_window_expires_old_slots_with_constant_memory():
+    drift = FeatureDrift(edges=[0.0], expected=[1, 1], slots=3, slot_seconds=10.0)
+    drift.observe(np.array([-1.0] * 100), now=0.0)
+    assert drift.psi(now=5.0) > 1.0
+
+    for t in range(10, 60, 10):
+        drift.observe(np.array([-1.0, 1.0] * 50), now=float(t))
+    assert drift.counts.shape == (3, 2)
+    assert drift.psi(now=55.0) == pytest.approx(0.0)
+
+
+def test_models_are_bounded():
+    monitor = DriftMonitor(max_models=2)
+    for model in ("a", "b", "c"):
+        monitor.set_reference(model, "f", edges=[0.0], counts=[1, 1])
+    assert monitor.model_psi("a") == {}
+    assert set(monitor.model_psi("c")) == {"f"}
+
+
+@pytest.mark.parametrize(
+    "edges, counts",
+    [
+        ([1.0, 0.0], [1, 1, 1]),
+        ([0.0, 0.0], [1, 1, 1]),
+        ([0.0, float("nan")], [1, 1, 1]),
+        ([float("-inf")], [1, 1]),
+        ([0.0], [2, -1]),
+        ([0.0], [1, float("inf")]),
+    ],
+)
+def test_reference_rejects_unordered_edges_and_negative_counts(edges, counts):
+    with pytest.raises(ValueError):
+        FeatureDrift(edges, counts)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+from risk_evidence.index import EvidenceIndex
+from risk_evidence.storage import SegmentedLog
+from risk_evidence.store import EvidenceStore
+
+
+def _open(root):
+    return EvidenceStore(SegmentedLog(root, segment_bytes=4096), EvidenceIndex(root / "index.sqlite3"))
+
+
+def _evidence(i, model="m-1", kind="eval_pack"):
+    return {"artifactType": kind, "modelVersion": model, "metadata": {"i": i}, "contentRef": f"s3://e/{i}"}
+
+
+def test_put_dedupes_and_get_reads_back(tmp_path):
+    store = _open(tmp_path)
+    first = store.put(_evidence(1), now=1_700_000_000)
+    again = store.put(_evidence(1), now=1_700_000_900)
+    assert not first.duplicate and again.duplicate
+    assert again.stored_at == first.stored_at
+    assert len(store) == 1
+
+    batch = store.put_many([_evidence(2), _evidence(2), _evidence(1)])
+    assert [r.duplicate for r in batch] == [False, True, True]
+    assert store.get(first.id)["evidence"] == _evidence(1)
+    assert store.get("0" * 64) is None
+    store.close()
+
+
+def test_query_filters_and_paginates_newest_first(tmp_path):
+    store = _open(tmp_path)
+    for i in range(25):
+        store.put(_evidence(i, model=f"m-{i % 2}", kind="dpia" if i % 5 == 0 else "eval_pack"), now=1000 + i)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.query(model_version="m-0", cursor=cursor, limit=4)
+        seen += [r["evidence"]["metadata"]["i"] for r in page]
+        if cursor is None:
+            break
+    assert seen == list(range(24, -1, -2))
+
+    page, _ = store.query(artifact_type="dpia", since=1005, until=1020)
+    assert [r["evidence"]["metadata"]["i"] for r in page] == [15, 10, 5]
+
+    with pytest.raises(ValueError):
+        store.query(cursor="not-a-cursor!")
+    store.close()
+
+
+def test_index_is_rebuilt_from_the_log(tmp_path):
+    store = _open(tmp_path)
+    ids = [store.put(_evidence(i)).id for i in range(30)]
+    store.close()
+
+    (tmp_path / "index.sqlite3").unlink()
+    for suffix in ("-wal", "-shm"):
+        (tmp_path / f"index.sqlite3{suffix}").unlink(missing_ok=True)
+    store = _open(tmp_path)
+    assert len(store) == 30
+    assert store.get(ids[17])["seq"] == 17
+    assert store.put(_evidence(3)).duplicate
+    store.close()
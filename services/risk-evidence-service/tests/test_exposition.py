@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from prometheus_client import CollectorRegistry
+
+from risk_evidence.exposition import OVERFLOW, CachedExposition, GovernedMetricsCollector
+from risk_evidence.metrics import GOVERNED_METRICS, MetricStore
+
+
+def test_cardinality_cap_and_cached_rendering():
+    collector = GovernedMetricsCollector(GOVERNED_METRICS, max_series=2)
+    registry = CollectorRegistry()
+    registry.register(collector)
+    exposition = CachedExposition(registry, ttl=5)
+
+    overflowed = collector.set_many(
+        ("quality.pass_at_5", f"m-{i}", "team-a", 0.8 + i / 100) for i in range(4)
+    )
+    assert overflowed == 2
+    body = exposition.render(now=0).decode()
+    assert 'llm_pass_at_5{model_version="m-1",namespace="team-a"} 0.81' in body
+    assert f'llm_pass_at_5{{model_version="{OVERFLOW}",namespace="{OVERFLOW}"}} 0.83' in body
+    assert 'res_observation_overflow_total{metric="llm_pass_at_5"} 2.0' in body
+
+    collector.forget_model("m-0")
+    assert exposition.render(now=1).decode() == body  # cached within the TTL
+    assert 'model_version="m-0"' not in exposition.render(now=6).decode()
+
+
+def test_metric_store_eviction_drops_exported_series():
+    collector = GovernedMetricsCollector(GOVERNED_METRICS)
+    store = MetricStore(max_models=1, on_evict=collector.forget_model)
+    for model in ("m-1", "m-2"):
+        store.observe(model, "drift.psi", 0.1, ts=1.0)
+        collector.set_many([("drift.psi", model, "default", 0.1)])
+    (family, *_) = [f for f in collector.collect() if f.name == "drift_psi"]
+    assert [s.labels["model_version"] for s in family.samples] == ["m-2"]
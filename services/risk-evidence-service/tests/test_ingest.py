@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from risk_evidence.ingest import LineTooLongError, canonicalize_batch, ndjson_batches
+from risk_evidence.store import evidence_id
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def _collect(data: bytes, size: int, **kwargs):
+    async def run():
+        return [batch async for batch in ndjson_batches(_chunks(data, size), **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_batches_split_lines_across_chunk_boundaries():
+    lines = [f'{{"n": {i}}}'.encode() for i in range(7)]
+    batches = _collect(b"\n".join(lines), size=5, batch_size=3)
+    assert [first for first, _ in batches] == [1, 4, 7]
+    assert [line for _, batch in batches for line in batch] == lines
+
+    with pytest.raises(LineTooLongError):
+        _collect(b"x" * 64, size=8, max_line_bytes=32)
+
+
+def test_canonicalize_matches_single_post_hash():
+    record = {"artifactType": "eval_pack", "modelVersion": "m-1", "contentRef": "s3://e/1"}
+    out = canonicalize_batch(10, [json.dumps(record).encode(), b"", b'{"modelVersion": 3}'])
+    (line, eid, content), (bad_line, none, error) = out
+    assert line == 10 and content == {**record, "metadata": None}
+    assert eid == evidence_id(content)
+    assert bad_line == 12 and none is None and "artifactType" in error
+
+
+def test_lines_before_an_oversized_line_are_still_yielded():
+    data = b"a\nb\nc\n" + b"x" * 64 + b"\nd"
+
+    async def run():
+        seen = []
+        with pytest.raises(LineTooLongError) as exc:
+            async for first, batch in ndjson_batches(_chunks(data, 5), batch_size=2, max_line_bytes=32):
+                seen.append((first, batch))
+        return seen, exc.value
+
+    seen, err = asyncio.run(run())
+    assert seen == [(1, [b"a", b"b"]), (3, [b"c"])]
+    assert err.line == 4
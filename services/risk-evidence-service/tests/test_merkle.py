@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+
+from risk_evidence.index import EvidenceIndex
+from risk_evidence.merkle import (
+    MerkleTree,
+    RootCheckpoints,
+    leaf_hash,
+    node_hash,
+    verify_consistency,
+    verify_inclusion,
+)
+from risk_evidence.storage import SegmentedLog
+from risk_evidence.store import EvidenceStore
+
+
+def _mth(leaves):
+    """Reference RFC 6962 MTH, straight from the definition."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaf_hash(leaves[0])
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return node_hash(_mth(leaves[:k]), _mth(leaves[k:]))
+
+
+def test_roots_and_proofs_match_rfc6962(tmp_path):
+    leaves = [i.to_bytes(32, "big") for i in range(37)]
+    tree = MerkleTree(tmp_path)
+    tree.append_many(leaves[:3])
+    for leaf in leaves[3:20]:
+        tree.append_many([leaf])
+    tree.append_many(leaves[20:])
+
+    for n in range(len(leaves) + 1):
+        root = _mth(leaves[:n])
+        assert tree.root(n) == root
+        for i in range(n):
+            assert verify_inclusion(leaves[i], i, n, tree.inclusion_proof(i, n), root)
+        for m in range(n + 1):
+            assert verify_consistency(m, n, tree.consistency_proof(m, n), _mth(leaves[:m]), root)
+
+    proof = tree.inclusion_proof(4, 37)
+    assert not verify_inclusion(leaves[5], 4, 37, proof, _mth(leaves))
+    assert not verify_consistency(9, 37, tree.consistency_proof(9, 37), _mth(leaves[:8]), _mth(leaves))
+    tree.close()
+
+
+def test_store_keeps_tree_in_step_with_the_index(tmp_path):
+    def open_store():
+        return EvidenceStore(
+            SegmentedLog(tmp_path),
+            EvidenceIndex(tmp_path / "index.sqlite3"),
+            MerkleTree(tmp_path / "merkle"),
+        )
+
+    store = open_store()
+    contents = [{"artifactType": "dpia", "modelVersion": "m", "contentRef": str(i)} for i in range(9)]
+    ids = [r.id for r in store.put_many(contents + contents[:2])]
+    assert store.tree.size == 9
+    expected = _mth([bytes.fromhex(i) for i in ids[:9]])
+    store.close()
+
+    for level in (tmp_path / "merkle").glob("level-*.bin"):
+        level.unlink()
+    store = open_store()
+    assert store.tree.root() == expected
+    assert store.seq_of(ids[4]) == 4
+    store.close()
+
+
+def test_checkpoints_are_signed_and_periodic(tmp_path):
+    tree = MerkleTree(tmp_path)
+    roots = RootCheckpoints(tree, tmp_path / "roots.jsonl", key=b"k", interval=60)
+    first = roots.latest(now=100)
+    assert first["tree_size"] == 0 and first["signature"]
+
+    tree.append_many([b"a" * 32])
+    assert roots.latest(now=120) is first  # within the interval
+    second = roots.latest(now=161)
+    assert second["tree_size"] == 1 and second["root_hash"] == tree.root().hex()
+    assert second["signature"] == roots.sign(second) != first["signature"]
+
+    reopened = RootCheckpoints(tree, tmp_path / "roots.jsonl", key=b"k")
+    assert reopened.latest(now=162) == second
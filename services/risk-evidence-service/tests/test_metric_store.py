@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from risk_evidence.metrics import MetricStore, metric_spec
+
+
+def test_summary_tracks_latest_and_window_per_model():
+    store = MetricStore(points=8, slots=4, slot_seconds=10, max_models=2)
+    store.observe_many(
+        [("m-1", "pass_at_5", 0.80, 100), ("m-1", "llm_pass_at_5", 0.90, 105), ("m-2", "drift.psi", 0.3, 105)],
+        now=105,
+    )
+    summary = store.summary("m-1", now=105)
+    assert summary["quality.pass_at_5"]["value"] == 0.90
+    assert summary["quality.pass_at_5"]["window"] == {"count": 2, "mean": pytest.approx(0.85), "min": 0.8, "max": 0.9}
+    assert store.summary("m-2", now=105)["drift.psi"]["value"] == 0.3
+
+    # The window slides without new writes; the latest value remains.
+    later = store.summary("m-1", now=200)
+    assert later["quality.pass_at_5"]["window"] is None
+    assert later["quality.pass_at_5"]["value"] == 0.90
+
+    store.observe("m-3", "harmful_rate", 0.001, ts=210)
+    assert store.models() == ["m-2", "m-3"]  # m-1 evicted (LRU)
+    assert store.summary("m-1") is None
+
+    with pytest.raises(KeyError):
+        store.observe("m-3", "not_a_metric", 1.0)
+
+
+def test_history_is_bounded_and_downsampled():
+    store = MetricStore(points=50, slots=2, slot_seconds=60)
+    store.observe_many([("m", "latency.p95_seconds", float(i), float(i)) for i in range(120)], now=120)
+    points = store.history("m")["latency.p95_seconds"]
+    assert len(points) == 50 and points[0] == [70.0, 70.0] and points[-1] == [119.0, 119.0]
+    assert len(store.history("m", max_points=5)["latency.p95_seconds"]) == 5
+    assert metric_spec("availability").key == "availability.ratio"
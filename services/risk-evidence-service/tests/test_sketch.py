@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from risk_evidence.sketch import DDSketch, LatencySketches
+
+
+def test_quantiles_within_relative_error_and_merge_matches_single_sketch():
+    rng = np.random.default_rng(7)
+    samples = rng.lognormal(mean=-1.0, sigma=1.0, size=20_000)
+    pods = [DDSketch(0.01) for _ in range(4)]
+    for pod, chunk in zip(pods, np.array_split(samples, 4)):
+        pod.add_many(chunk)
+
+    merged = DDSketch(0.01)
+    for pod in pods:
+        merged.merge(DDSketch.from_dict(pod.to_dict()))
+    whole = DDSketch(0.01)
+    whole.add_many(samples)
+
+    assert merged.count == whole.count == samples.size
+    np.testing.assert_array_equal(merged.bins[np.flatnonzero(merged.bins)], whole.bins[np.flatnonzero(whole.bins)])
+    for q in (0.5, 0.95, 0.99):
+        exact = np.quantile(samples, q, method="lower")
+        assert merged.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert merged.bins.size < 1000  # memory depends on value range, not sample count
+
+    with pytest.raises(ValueError):
+        merged.merge(DDSketch(0.05))
+    with pytest.raises(ValueError):
+        DDSketch.from_dict({"relative_accuracy": 0.01, "offset": 0, "bins": [1, 2], "count": 5})
+
+
+def _wire():
+    sketch = DDSketch(0.01)
+    sketch.add_many([0.1, 0.2, 0.3])
+    return sketch.to_dict()
+
+
+@pytest.mark.parametrize(
+    "drop, null",
+    [("min", None), ("max", None), (None, "offset"), (None, "min"), (None, "sum")],
+)
+def test_from_dict_rejects_missing_or_null_fields(drop, null):
+    data = _wire()
+    if drop:
+        del data[drop]
+    if null:
+        data[null] = None
+    with pytest.raises(ValueError, match="malformed sketch"):
+        DDSketch.from_dict(data)
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("offset", 10**6), ("offset", -10**6), ("bins", [1.0] * 9), ("sum", float("inf")), ("max", float("nan"))],
+)
+def test_from_dict_rejects_unrepresentable_sketches(field, value):
+    data = dict(_wire(), **{field: value})
+    if field == "bins":
+        data["count"] = len(value)
+    with pytest.raises(ValueError, match="malformed sketch"):
+        DDSketch.from_dict(data, max_bins=8)
+
+
+def test_merging_distant_keys_collapses_before_allocating():
+    low, high = DDSketch(0.01, max_bins=16), DDSketch(0.01)
+    low.add_many([1e-8, 2e-8])
+    high.add_many([1e8])
+    low.merge(high)
+    assert low.bins.size == 16 and low.bins.sum() == 3
+    assert low.quantile(1.0) == pytest.approx(1e8, rel=0.011)
+
+
+def test_latency_window_rotates_expires_and_drops_stale_writes():
+    window = LatencySketches(slots=3, slot_seconds=10.0, relative_accuracy=0.01)
+    window.add("m", samples=[1.0], ts=5.0, now=5.0)
+    window.add("m", samples=[2.0], ts=15.0, now=15.0)
+    assert window.merged("m", now=25.0).count == 2
+    window.add("m", samples=[4.0, 4.0], ts=35.0, now=35.0)  # reuses the ts=5 row
+    assert window.merged("m", now=35.0).count == 3
+    window.add("m", samples=[8.0], ts=6.0, now=35.0)  # older than the window
+    assert window.merged("m", now=35.0).count == 3
+    assert window.quantiles("m", (0.0, 1.0), now=35.0) == {
+        "p0": pytest.approx(2.0, rel=0.011),
+        "p100": pytest.approx(4.0, rel=0.011),
+    }
+    assert window.merged("m", now=65.0) is None
+    with pytest.raises(ValueError):
+        window.add("m", samples=[1.0], ts=1e12, now=35.0)
+    window.add("m", samples=[1.0], ts=36.0, now=35.0)
+    assert window.merged("m", now=36.0).count == 4
+
+
+def test_latency_window_evicts_least_recently_written_model():
+    window = LatencySketches(slots=3, slot_seconds=10.0, max_models=2)
+    for model in ("a", "b", "a", "c"):
+        window.add(model, samples=[1.0], ts=5.0, now=5.0)
+    assert window.merged("b", now=5.0) is None
+    assert window.merged("a", now=5.0).count == 2
+    assert window.quantiles("c", now=5.0)["p50"] == pytest.approx(1.0, rel=0.011)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import errno
+import threading
+
+import pytest
+
+from risk_evidence import storage
+from risk_evidence.storage import FRAME_HEADER, SegmentedLog
+
+
+def test_append_read_and_replay(tmp_path):
+    log = SegmentedLog(tmp_path, segment_bytes=256)
+    locations = [log.append(f"record-{i}".encode() * 4) for i in range(20)]
+    assert len(log.segments()) > 1  # rolled by size
+
+    assert log.read(locations[7]) == b"record-7" * 4
+    replayed = [payload for _, payload in log.replay()]
+    assert replayed == [f"record-{i}".encode() * 4 for i in range(20)]
+
+    tail = [payload for _, payload in log.replay(locations[18][:2])]
+    assert tail == [b"record-18" * 4, b"record-19" * 4]
+    log.close()
+
+
+def test_group_commit_from_many_threads(tmp_path):
+    log = SegmentedLog(tmp_path)
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(50):
+                log.append(f"{n}:{i}".encode())
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(list(log.replay())) == 400
+    log.close()
+
+
+def test_reopen_truncates_torn_tail(tmp_path):
+    log = SegmentedLog(tmp_path)
+    log.append_many([b"a" * 10, b"b" * 10])
+    end = log.position
+    log.close()
+
+    path = tmp_path / "segments" / f"{end[0]:08d}.log"
+    with open(path, "ab") as fh:
+        fh.write(FRAME_HEADER.pack(100, 0) + b"partial")
+
+    reopened = SegmentedLog(tmp_path)
+    assert reopened.position == end
+    assert [p for _, p in reopened.replay()] == [b"a" * 10, b"b" * 10]
+    reopened.append(b"c")
+    assert [p for _, p in reopened.replay()][-1] == b"c"
+    reopened.close()
+
+
+def test_failed_write_truncates_the_torn_batch(tmp_path, monkeypatch):
+    log = SegmentedLog(tmp_path)
+    first = log.append(b"a" * 10)
+    real_write = storage.os.write
+    calls = []
+
+    def short_then_enospc(fd, data):
+        calls.append(fd)
+        if len(calls) == 1:
+            return real_write(fd, bytes(data[:7]))
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(storage.os, "write", short_then_enospc)
+    with pytest.raises(OSError):
+        log.append_many([b"b" * 10, b"c" * 10])
+    monkeypatch.undo()
+
+    second = log.append(b"d" * 10)
+    assert log.read(first) == b"a" * 10 and log.read(second) == b"d" * 10
+    log.close()
+    assert [p for _, p in SegmentedLog(tmp_path).replay()] == [b"a" * 10, b"d" * 10]
+
+
+def test_failed_dup_does_not_advance_the_synced_position(tmp_path, monkeypatch):
+    log = SegmentedLog(tmp_path, fsync=True)
+    _, token = log.write_many([b"a"])
+
+    def no_fds(fd):
+        raise OSError(errno.EMFILE, "Too many open files")
+
+    monkeypatch.setattr(storage.os, "dup", no_fds)
+    with pytest.raises(OSError):
+        log.sync(token)
+    monkeypatch.undo()
+    assert log._synced < token and not log._syncing
+    log.sync(token)
+    assert log._synced == token
+    log.close()
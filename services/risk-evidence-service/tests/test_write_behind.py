@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from risk_evidence.writer import Overloaded, WriteBehind
+
+
+def test_concurrent_submits_share_batches_and_overload_is_immediate():
+    batches = []
+    gate = threading.Event()
+
+    def put_batch(items):
+        gate.wait(5)
+        batches.append([eid for eid, _ in items])
+        return [f"stored:{eid}" for eid, _ in items]
+
+    writer = WriteBehind(put_batch, ThreadPoolExecutor(1), max_pending=8, max_batch=4)
+
+    async def main():
+        first = asyncio.ensure_future(writer.submit(("a", {})))
+        await asyncio.sleep(0.05)  # the drain task is now blocked inside put_batch
+        rest = [asyncio.ensure_future(writer.submit((str(i), {}))) for i in range(8)]
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded):
+            await writer.submit(("overflow", {}))
+        gate.set()
+        results = await asyncio.gather(first, *rest)
+        await writer.stop()
+        return results
+
+    results = asyncio.run(main())
+    assert results == ["stored:a"] + [f"stored:{i}" for i in range(8)]
+    assert batches == [["a"], ["0", "1", "2", "3"], ["4", "5", "6", "7"]]
+
+
+def test_store_errors_reach_every_waiter():
+    def put_batch(items):
+        raise OSError("disk full")
+
+    writer = WriteBehind(put_batch, ThreadPoolExecutor(1))
+
+    async def main():
+        return await asyncio.gather(*[writer.submit((str(i), {})) for i in range(3)], return_exceptions=True)
+
+    assert all(isinstance(r, OSError) for r in asyncio.run(main()))
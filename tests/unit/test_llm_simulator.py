@@ -0,0 +1,63 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO / "tools" / "llm_simulator"))
+sys.path.insert(0, str(REPO / "services" / "policy-gateway" / "src"))
+
+import simulator  # noqa: E402
+from policy_gateway.domain.models import CompletionRequest  # noqa: E402
+from policy_gateway.infrastructure.llm_http_adapter import HTTPLLMAdapter  # noqa: E402
+
+
+@pytest.fixture
+def upstream():
+    servers = []
+
+    def start(*argv):
+        opts = simulator.parse_args(
+            ["--host", "127.0.0.1", "--port", "0", "--ttft", "0", "--tps", "10000", "--jitter", "0", *argv]
+        )
+        server = simulator.serve(opts)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_adapter_parses_plain_and_streamed_responses(upstream):
+    url = upstream()
+    adapter = HTTPLLMAdapter(url, timeout=5)
+    request = CompletionRequest(prompt="the gateway answers", model="sim-1", max_tokens=6)
+
+    response = adapter.complete(request)
+    assert response.model == "sim-1" and len(response.content.split()) == 6
+    assert response.usage == {"prompt_tokens": 3, "completion_tokens": 6}
+    assert "".join(adapter.stream(request)) == response.content  # same prompt, same words
+
+    stats = httpx.get(f"{url}/stats").json()
+    assert stats["completed"] == 2 and stats["completion_tokens"] == 12
+
+
+def test_injected_errors_surface_through_the_adapter(upstream):
+    adapter = HTTPLLMAdapter(upstream("--error-rate", "1"), timeout=5)
+    with pytest.raises(RuntimeError, match="500"):
+        adapter.complete(CompletionRequest(prompt="hi"))
+
+
+@pytest.mark.parametrize(
+    "body",
+    [[1, 2], {"prompt": "hi", "max_tokens": "many"}, {"prompt": "hi", "max_tokens": 0}, {"prompt": ["hi"]}],
+)
+def test_malformed_requests_get_400(upstream, body):
+    resp = httpx.post(f"{upstream()}/completion", content=json.dumps(body), timeout=5)
+    assert resp.status_code == 400 and "error" in resp.json()
@@ -0,0 +1,172 @@
+import argparse
+import gzip
+import io
+import json
+import math
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO / "tools"))
+
+import pac_ci  # noqa: E402
+
+CONFIG = REPO / "tests" / "fixtures" / "adr-006.test.yaml"
+ARTIFACTS = REPO / "tests" / "fixtures" / "mock_artifacts"
+
+
+# ----------------------------
+# Directory mode
+# ----------------------------
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "models"
+    for name in ("model-a", "model-b", "team/model-c"):
+        shutil.copytree(ARTIFACTS, root / name, ignore=shutil.ignore_patterns("*.md"))
+    failing = root / "model-b" / "eval_quality.json"
+    failing.write_text(json.dumps({"pass_at_5": 0.5}))
+    (root / "broken").mkdir()
+    shutil.copy(ARTIFACTS / "eval_drift.json", root / "broken")
+    config = tmp_path / "adr-006.yaml"
+    shutil.copy(CONFIG, config)
+    return root, config
+
+
+def run(root, config, jobs=2):
+    out = io.StringIO()
+    args = argparse.Namespace(config=str(config), root=str(root), jobs=jobs, cache=None, no_cache=False)
+    code = pac_ci.run_tree(args, out=out)
+    results = {r["bundle"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    return code, results
+
+
+def strip(results):
+    return {bundle: {k: v for k, v in r.items() if k != "cached"} for bundle, r in results.items()}
+
+
+def test_directory_mode_is_repeatable_and_cached(tree):
+    root, config = tree
+    code, first = run(root, config)
+    assert code == 1
+    assert {b: r["status"] for b, r in first.items()} == {
+        "model-a": "pass",
+        "model-b": "fail",
+        "team/model-c": "pass",
+        "broken": "error",
+    }
+    assert "missing eval_fairness.json" in first["broken"]["error"]
+    assert not any(r["cached"] for r in first.values())
+    assert (root / pac_ci.CACHE_NAME).exists()
+
+    code, second = run(root, config)
+    assert code == 1 and strip(second) == strip(first)
+    assert {b for b, r in second.items() if r["cached"]} == {"model-a", "model-b", "team/model-c"}
+    assert second["broken"]["cached"] is False  # errors are never cached
+
+
+def test_cache_is_invalidated_by_artifact_and_config_changes(tree):
+    root, config = tree
+    run(root, config, jobs=1)
+
+    (root / "model-b" / "eval_quality.json").write_text(json.dumps({"pass_at_5": 0.9}))
+    _, results = run(root, config, jobs=1)
+    assert results["model-b"] == {**results["model-b"], "status": "pass", "cached": False}
+    assert results["model-a"]["cached"] and results["team/model-c"]["cached"]
+
+    config.write_text(config.read_text().replace("target: 0.80", "target: 0.95"))
+    code, results = run(root, config, jobs=1)
+    assert code == 1
+    assert not any(r["cached"] for r in results.values())
+    assert {b: r["status"] for b, r in results.items() if b != "broken"} == {
+        "model-a": "fail",
+        "model-b": "fail",
+        "team/model-c": "fail",
+    }
+
+
+# ----------------------------
+# Per-sample metrics
+# ----------------------------
+def closed_form_pass_at_k(n, c, k):
+    if n - c < k:
+        return 1.0
+    return 1.0 - math.comb(n - c, k) / math.comb(n, k)
+
+
+@pytest.mark.parametrize("k", [1, 5, 10])
+def test_pass_at_k_matches_closed_form(k):
+    n = np.array([10, 10, 12, 7, 3])
+    c = np.array([0, 3, 12, 2, 1])
+    expected = [closed_form_pass_at_k(ni, ci, k) for ni, ci in zip(n, c) if ni >= k]
+    assert pac_ci.pass_at_k(n, c, k) == pytest.approx(sum(expected) / len(expected), rel=1e-12)
+
+    assert pac_ci.pass_at_k(np.array([10]), np.array([3]), 5) == pytest.approx(1 - 21 / 252)
+    assert pac_ci.pass_at_k(np.array([3]), np.array([1]), 5) is None  # no task has n >= k
+
+
+@pytest.mark.parametrize(
+    "successes, total, lower, upper",
+    [
+        (5, 100, 0.021543, 0.111752),
+        (0, 10, 0.0, 0.277540),
+        (1, 10, 0.017876, 0.404156),
+        (81, 263, 0.255288, 0.366211),
+    ],
+)
+def test_wilson_interval_reference_values(successes, total, lower, upper):
+    lo, hi = pac_ci.wilson_interval(successes, total)
+    assert lo == pytest.approx(lower, abs=1e-6) and hi == pytest.approx(upper, abs=1e-6)
+
+
+def samples(with_subgroups=True):
+    # task t1: 3/10 pass, t2: 10/10, t3: 0/10. Subgroups: age 18_25 passes 4/10,
+    # age 26_40 passes 9/20 (delta 0.05); 2 of 30 samples are harmful.
+    records = []
+    for task, passes in (("t1", 3), ("t2", 10), ("t3", 0)):
+        for i in range(10):
+            records.append({"task_id": task, "passed": i < passes})
+    for i, r in enumerate(records):
+        if with_subgroups:
+            young = i % 3 == 0
+            r["subgroup"] = {"age": "18_25" if young else "26_40"}
+        r["harmful"] = i in (4, 17)
+    return records
+
+
+def write_log(path, records):
+    text = "".join(json.dumps(r) + "\n" for r in records)
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8") as fh:
+            fh.write(text)
+    else:
+        path.write_text(text)
+    return str(path)
+
+
+@pytest.mark.parametrize("name", ["samples.jsonl", "samples.jsonl.gz"])
+def test_stream_metrics_known_answers(tmp_path, name):
+    records = samples()
+    metrics = pac_ci.stream_metrics(write_log(tmp_path / name, records), chunk_size=7)
+    assert metrics["samples"] == 30 and metrics["tasks"] == 3
+    expected = [closed_form_pass_at_k(10, c, 5) for c in (3, 10, 0)]
+    assert metrics["pass_at_5"] == pytest.approx(sum(expected) / 3)
+    assert metrics["pass_at_1"] == pytest.approx(13 / 30)
+    assert metrics["subgroup_delta"] == pytest.approx(0.05)
+    assert metrics["max_delta_subgroup"] == "age_18_25"
+    assert metrics["harmful_rate"] == pytest.approx(2 / 30)
+    assert metrics["harmful_rate_ci95"] == pytest.approx(list(pac_ci.wilson_interval(2, 30)))
+
+
+def test_stream_metrics_without_subgroups(tmp_path):
+    records = samples(with_subgroups=False)
+    metrics = pac_ci.stream_metrics(write_log(tmp_path / "samples.jsonl", records))
+    assert metrics["subgroup_delta"] == 0.0 and metrics["max_delta_subgroup"] is None
+
+    # One attribute value only: nothing to compare against.
+    records[0]["subgroup"] = "age_18_25"
+    metrics = pac_ci.stream_metrics(write_log(tmp_path / "samples.jsonl", records))
+    assert metrics["subgroup_delta"] == 0.0 and metrics["max_delta_subgroup"] is None
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Upstream LLM simulator for local load and soak tests of the policy gateway.
+
+Speaks the protocol of HTTPLLMAdapter: POST /completion with
+{"prompt", "model", "max_tokens", "stream"}. A plain request gets
+{"content", "model", "usage"}; with "stream": true the tokens are sent as a
+chunked text/plain body at the configured token rate.
+
+    simulator.py --port 8000 --ttft 0.25 --tps 40 --slots 8 --error-rate 0.01
+
+Timing model, per request:
+  * wait for one of --slots decode slots (queueing delay grows with load;
+    beyond --max-queue waiting requests the answer is 503),
+  * time to first token = --ttft + uncached prompt tokens / --prefill-tps,
+    where prompt prefixes seen before (in --block-size token blocks, LRU of
+    --prefix-blocks) count as cached,
+  * then one token every 1/--tps seconds, slowed by --batch-penalty for
+    every other request decoding at the same time,
+  * every delay is scaled by a uniform factor in [1 - jitter, 1 + jitter].
+--error-rate answers 500 and --timeout-rate holds the connection for
+--hang-seconds and closes it without a response. Every option can also be
+set through the environment (SIM_TTFT, SIM_TPS, ...). A body that is
+not a JSON object, or a non-integer max_tokens, gets 400. GET /stats
+returns counters, GET /health liveness.
+"""
+import argparse, hashlib, json, os, random, threading, time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "the policy gateway routes each request through governance checks before the model "
+    "answers with evidence latency risk quality fairness drift safety owner review"
+).split()
+
+OPTIONS = (
+    # name, type, default, help
+    ("host", str, "0.0.0.0", "bind address"),
+    ("port", int, 8000, "listen port"),
+    ("ttft", float, 0.2, "base time to first token, seconds"),
+    ("prefill_tps", float, 2000.0, "prompt tokens processed per second before the first token"),
+    ("tps", float, 50.0, "generated tokens per second for a lone request"),
+    ("output_tokens", int, 64, "tokens generated when the request has no max_tokens"),
+    ("slots", int, 8, "requests decoded concurrently; the rest queue"),
+    ("max_queue", int, 0, "queued requests before answering 503 (0: unbounded)"),
+    ("batch_penalty", float, 0.1, "per-token slowdown for each other request decoding"),
+    ("jitter", float, 0.1, "relative random spread applied to every delay"),
+    ("error_rate", float, 0.0, "share of requests answered with HTTP 500"),
+    ("timeout_rate", float, 0.0, "share of requests that hang and are dropped"),
+    ("hang_seconds", float, 30.0, "how long a timed-out request holds its connection"),
+    ("block_size", int, 16, "prompt tokens per prefix-cache block"),
+    ("prefix_blocks", int, 4096, "prefix-cache capacity in blocks (0 disables it)"),
+    ("seed", int, 0, "random seed for jitter and fault injection"),
+)
+
+
+class Simulator:
+    def __init__(self, opts):
+        self.opts = opts
+        self.rng = random.Random(opts.seed)
+        self.slots = threading.BoundedSemaphore(opts.slots)
+        self.lock = threading.Lock()
+        self.prefixes = OrderedDict()
+        self.queued = 0
+        self.decoding = 0
+        self.stats = {"requests": 0, "completed": 0, "errors": 0, "timeouts": 0, "rejected": 0,
+                      "prompt_tokens": 0, "cached_prompt_tokens": 0, "completion_tokens": 0}
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def roll(self):
+        with self.lock:
+            return self.rng.random()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            with self.lock:
+                factor = 1 + self.rng.uniform(-self.opts.jitter, self.opts.jitter)
+            time.sleep(seconds * factor)
+
+    def cached_tokens(self, tokens):
+        """Tokens covered by previously seen prefix blocks; records this prompt's blocks."""
+        size, cap = self.opts.block_size, self.opts.prefix_blocks
+        if cap <= 0:
+            return 0
+        digest, hit, cached = hashlib.sha1(), True, 0
+        with self.lock:
+            for start in range(0, len(tokens) - size + 1, size):
+                digest.update(" ".join(tokens[start:start + size]).encode() + b"\0")
+                key = digest.hexdigest()
+                if hit and key in self.prefixes:
+                    self.prefixes.move_to_end(key)
+                    cached += size
+                    continue
+                hit = False
+                self.prefixes[key] = None
+                if len(self.prefixes) > cap:
+                    self.prefixes.popitem(last=False)
+        return cached
+
+    def admit(self):
+        """Take a decode slot, or return False when the queue is full."""
+        with self.lock:
+            if self.opts.max_queue and self.queued >= self.opts.max_queue and self.decoding >= self.opts.slots:
+                self.stats["rejected"] += 1
+                return False
+            self.queued += 1
+        self.slots.acquire()
+        with self.lock:
+            self.queued -= 1
+            self.decoding += 1
+        return True
+
+    def release(self):
+        with self.lock:
+            self.decoding -= 1
+        self.slots.release()
+
+    def token_delay(self):
+        with self.lock:
+            others = max(0, self.decoding - 1)
+        return (1 + self.opts.batch_penalty * others) / self.opts.tps
+
+    def generate(self, prompt, tokens):
+        """Deterministic output for a prompt: yields `tokens` words after prefill."""
+        prompt_tokens = prompt.split()
+        cached = self.cached_tokens(prompt_tokens)
+        self.count("prompt_tokens", len(prompt_tokens))
+        self.count("cached_prompt_tokens", cached)
+        self.sleep(self.opts.ttft + (len(prompt_tokens) - cached) / self.opts.prefill_tps)
+        words = random.Random(hashlib.sha1(prompt.encode()).digest())
+        for i in range(tokens):
+            if i:
+                self.sleep(self.token_delay())
+            yield words.choice(WORDS)
+        self.count("completion_tokens", tokens)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, queued=self.queued, decoding=self.decoding,
+                        prefix_blocks=len(self.prefixes))
+
+
+def parse_request(body, opts):
+    """(prompt, max_tokens, model, stream) from a /completion body; ValueError if malformed."""
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    prompt = body.get("prompt", "")
+    if not isinstance(prompt, str):
+        raise ValueError("prompt must be a string")
+    tokens = body.get("max_tokens")
+    if tokens is None:
+        tokens = opts.output_tokens
+    elif isinstance(tokens, bool) or not isinstance(tokens, int) or tokens < 1:
+        raise ValueError("max_tokens must be a positive integer")
+    model = body.get("model") or "simulator"
+    if not isinstance(model, str):
+        raise ValueError("model must be a string")
+    return prompt, tokens, model, bool(body.get("stream"))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sim = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self.send_json(200, self.sim.snapshot())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/completion":
+            return self.send_json(404, {"error": "not found"})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            return self.send_json(400, {"error": "invalid JSON"})
+        sim = self.sim
+        try:
+            prompt, tokens, model, stream = parse_request(body, sim.opts)
+        except ValueError as exc:
+            return self.send_json(400, {"error": str(exc)})
+        sim.count("requests")
+        roll = sim.roll()
+        if roll < sim.opts.timeout_rate:
+            sim.count("timeouts")
+            time.sleep(sim.opts.hang_seconds)
+            self.close_connection = True
+            return
+        if roll < sim.opts.timeout_rate + sim.opts.error_rate:
+            sim.count("errors")
+            return self.send_json(500, {"error": "injected upstream failure"})
+        if not sim.admit():
+            return self.send_json(503, {"error": "upstream queue full"})
+        try:
+            words = sim.generate(prompt, tokens)
+            if stream:
+                self.stream(words)
+            else:
+                content = " ".join(words)
+                self.send_json(200, {"content": content, "model": model, "usage": {
+                    "prompt_tokens": len(prompt.split()), "completion_tokens": tokens}})
+            sim.count("completed")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            sim.release()
+
+    def stream(self, words):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, word in enumerate(words):
+            data = (word if i == 0 else " " + word).encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Upstream LLM simulator")
+    for name, kind, default, text in OPTIONS:
+        env = os.getenv("SIM_" + name.upper())
+        ap.add_argument("--" + name.replace("_", "-"), dest=name, type=kind,
+                        default=kind(env) if env is not None else default, help=text)
+    return ap.parse_args(argv)
+
+
+def serve(opts):
+    handler = type("BoundHandler", (Handler,), {"sim": Simulator(opts)})
+    server = ThreadingHTTPServer((opts.host, opts.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    opts = parse_args(argv)
+    server = serve(opts)
+    print(f"llm simulator listening on {opts.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,63 @@
 #!/usr/bin/env python3
-import argparse, json, yaml, sys
+"""ADR-006 governance gate for evaluation artifacts.
+
+Single bundle (one set of eval JSON files):
+
+    pac_ci.py --config adr-006.yaml --eval q.json --fairness f.json \
+        --safety s.json --drift d.json
+
+Directory mode: every directory under --root holding eval_*.json artifacts is
+a bundle. Bundles are evaluated across a process pool and one NDJSON line is
+streamed per bundle. Bundles whose artifact and config contents are unchanged
+since the previous run are answered from a local results cache.
+
+    pac_ci.py --config adr-006.yaml --root models/ --jobs 8
+
+Raw per-sample eval logs (JSONL, optionally gzipped) can replace the
+precomputed eval/fairness/safety files; the gated metrics are then computed
+in one streaming pass:
+
+    pac_ci.py --config adr-006.yaml --samples samples.jsonl.gz --drift d.json
+
+Each line is one sample: {"task_id": "...", "passed": true,
+"subgroup": "age_18_25" | {"age": "18_25", ...}, "harmful": false}.
+"""
+import argparse, gzip, hashlib, itertools, json, math, os, sys, yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+ARTIFACTS = {
+    "eval": "eval_quality.json",
+    "fairness": "eval_fairness.json",
+    "safety": "eval_safety.json",
+    "drift": "eval_drift.json",
+}
+SAMPLE_LOGS = ("samples.jsonl", "samples.jsonl.gz")
+PASS_AT_K = (1, 5, 10)
+CHUNK_SIZE = 65536
+CACHE_NAME = ".pac_ci_cache.json"
+CACHE_VERSION = 2
+
+_THRESHOLDS = None
 
 
 def load_cfg(path):
-    if path.endswith(".yaml") or path.endswith(".yml"):
-        return yaml.safe_load(open(path))
-    return json.load(open(path))
+    with open(path, encoding="utf-8") as fh:
+        if path.endswith(".yaml") or path.endswith(".yml"):
+            return yaml.safe_load(fh)
+        return json.load(fh)
 
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True)
-    ap.add_argument("--eval", required=True)
-    ap.add_argument("--fairness", required=True)
-    ap.add_argument("--safety", required=True)
-    ap.add_argument("--drift", required=True)
-    args = ap.parse_args()
+def read_json(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
 
-    cfg = load_cfg(args.config)
-    q = json.load(open(args.eval))["pass_at_5"]
-    f = json.load(open(args.fairness))["subgroup_delta"]
-    s = json.load(open(args.safety))["harmful_rate"]
-    d = json.load(open(args.drift))["psi"]
 
-    qt = cfg["thresholds"]["quality"]["pass_at_5"]["target"]
-    ft = cfg["thresholds"]["fairness"]["subgroup_delta"]["target_max"]
-    st = cfg["thresholds"]["safety"]["harmful_rate"]["target_max"]
+def check(thresholds, q, f, s):
+    qt = thresholds["quality"]["pass_at_5"]["target"]
+    ft = thresholds["fairness"]["subgroup_delta"]["target_max"]
+    st = thresholds["safety"]["harmful_rate"]["target_max"]
 
     violations = []
     if q < qt:
@@ -34,8 +66,327 @@ def main():
         violations.append(f"fairness.subgroup_delta {f} > max {ft}")
     if s > st:
         violations.append(f"safety.harmful_rate {s} > max {st}")
+    return violations
+
+
+def evaluate(thresholds, paths):
+    """Return (violations, computed_metrics) for one bundle of artifacts."""
+    read_json(paths["drift"])["psi"]  # required artifact; drift only warns
+    if "samples" in paths:
+        metrics = stream_metrics(paths["samples"])
+        q, f, s = metrics["pass_at_5"], metrics["subgroup_delta"], metrics["harmful_rate"]
+    else:
+        metrics = None
+        q = read_json(paths["eval"])["pass_at_5"]
+        f = read_json(paths["fairness"])["subgroup_delta"]
+        s = read_json(paths["safety"])["harmful_rate"]
+    return check(thresholds, q, f, s), metrics
+
+
+# ----------------------------
+# Raw per-sample logs
+# ----------------------------
+class _Codes:
+    """Map labels to dense ints and keep per-code counters as NumPy arrays."""
+
+    def __init__(self, *counters):
+        self.index = {}
+        self.counts = {name: np.zeros(64, dtype=np.int64) for name in counters}
+
+    def encode(self, labels):
+        index = self.index
+        codes = np.fromiter(
+            (index.setdefault(label, len(index)) for label in labels),
+            dtype=np.int64,
+            count=len(labels),
+        )
+        size = len(index)
+        for name, arr in self.counts.items():
+            if size > arr.shape[0]:
+                grown = np.zeros(max(size, arr.shape[0] * 2), dtype=np.int64)
+                grown[: arr.shape[0]] = arr
+                self.counts[name] = grown
+        return codes
+
+    def add(self, name, codes):
+        if codes.size:
+            arr = self.counts[name]
+            arr += np.bincount(codes, minlength=arr.shape[0])
+
+    def view(self, name):
+        return self.counts[name][: len(self.index)]
+
+
+def pass_at_k(n, c, k):
+    """Unbiased pass@k (Chen et al., 2021) averaged over tasks with n >= k.
+
+    1 - C(n-c, k) / C(n, k), evaluated with a log-factorial table so every
+    task is handled in one vectorised expression.
+    """
+    eligible = n >= k
+    if not eligible.any():
+        return None
+    n, c = n[eligible], c[eligible]
+    log_fact = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, int(n.max()) + 1)))))
+    fail = n - c
+    solvable = fail >= k
+    ratio = np.zeros(n.shape[0])
+    f, m = fail[solvable], n[solvable]
+    ratio[solvable] = np.exp(
+        log_fact[f] - log_fact[f - k] - log_fact[m] + log_fact[m - k]
+    )
+    return float(np.mean(1.0 - ratio))
+
+
+def wilson_interval(successes, total, z=1.96):
+    if total == 0:
+        return (0.0, 0.0)
+    p = successes / total
+    denom = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denom
+    half = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+def _open_log(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def stream_metrics(path, chunk_size=CHUNK_SIZE):
+    """Compute gated metrics from a per-sample JSONL log in one pass.
+
+    Lines are parsed in chunks and folded into per-task and per-subgroup
+    counters with np.bincount, so memory grows with the number of tasks and
+    subgroups, never with the number of samples.
+    """
+    tasks = _Codes("n", "c")
+    groups = _Codes("n", "c")
+    samples = harmful_n = harmful_k = 0
+
+    with _open_log(path) as fh:
+        while True:
+            lines = list(itertools.islice(fh, chunk_size))
+            if not lines:
+                break
+            records = [json.loads(line) for line in lines if line.strip()]
+            samples += len(records)
+
+            passed = np.fromiter((bool(r.get("passed")) for r in records), dtype=bool, count=len(records))
+            codes = tasks.encode([str(r["task_id"]) for r in records])
+            tasks.add("n", codes)
+            tasks.add("c", codes[passed])
+
+            labels, group_passed = [], []
+            for r, ok in zip(records, passed):
+                sub = r.get("subgroup")
+                if isinstance(sub, dict):
+                    labels.extend((str(a), str(v)) for a, v in sub.items())
+                    group_passed.extend([ok] * len(sub))
+                elif sub is not None:
+                    labels.append(("subgroup", str(sub)))
+                    group_passed.append(ok)
+            if labels:
+                gcodes = groups.encode(labels)
+                groups.add("n", gcodes)
+                groups.add("c", gcodes[np.asarray(group_passed, dtype=bool)])
+
+            flags = [r["harmful"] for r in records if r.get("harmful") is not None]
+            harmful_n += len(flags)
+            harmful_k += int(np.count_nonzero(np.asarray(flags, dtype=bool)))
+
+    if samples == 0:
+        raise ValueError(f"no samples in {path}")
+
+    n, c = tasks.view("n"), tasks.view("c")
+    metrics = {"samples": samples, "tasks": len(tasks.index)}
+    for k in PASS_AT_K:
+        value = pass_at_k(n, c, k)
+        if value is not None:
+            metrics[f"pass_at_{k}"] = value
+    if "pass_at_5" not in metrics:
+        raise ValueError("pass@5 needs at least 5 samples per task")
+
+    metrics["subgroup_delta"], metrics["max_delta_subgroup"] = 0.0, None
+    if groups.index:
+        gn, gc = groups.view("n"), groups.view("c")
+        rates = gc / np.maximum(gn, 1)
+        labels = list(groups.index)  # insertion order == code order
+        attrs = {}
+        for code, (attr, _) in enumerate(labels):
+            attrs.setdefault(attr, []).append(code)
+        for codes in attrs.values():
+            codes = np.asarray(codes)
+            delta = float(rates[codes].max() - rates[codes].min())
+            if len(codes) > 1 and delta >= metrics["subgroup_delta"]:
+                metrics["subgroup_delta"] = delta
+                metrics["max_delta_subgroup"] = "_".join(labels[codes[np.argmin(rates[codes])]])
+
+    metrics["harmful_rate"] = harmful_k / harmful_n if harmful_n else 0.0
+    metrics["harmful_rate_ci95"] = list(wilson_interval(harmful_k, harmful_n))
+    metrics["harmful_samples"] = harmful_n
+    return metrics
+
+
+# ----------------------------
+# Directory mode
+# ----------------------------
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def discover(root):
+    """Yield (bundle_dir, {kind: path}) for directories holding artifacts."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        present = set(filenames)
+        paths = {k: os.path.join(dirpath, n) for k, n in ARTIFACTS.items() if n in present}
+        log = next((n for n in SAMPLE_LOGS if n in present), None)
+        if log:
+            paths["samples"] = os.path.join(dirpath, log)
+        if paths:
+            yield dirpath, paths
+
+
+def fingerprint(config_digest, paths):
+    h = hashlib.sha256(config_digest.encode())
+    for kind in sorted(paths):
+        h.update(f"\0{kind}\0{file_digest(paths[kind])}".encode())
+    return h.hexdigest()
+
+
+def _init_worker(thresholds):
+    global _THRESHOLDS
+    _THRESHOLDS = thresholds
+
+
+def evaluate_bundle(bundle, paths):
+    """Evaluate one bundle; runs inside a pool worker."""
+    required = ("drift",) if "samples" in paths else tuple(ARTIFACTS)
+    missing = sorted(ARTIFACTS[k] for k in required if k not in paths)
+    if missing:
+        return {"bundle": bundle, "status": "error", "error": f"missing {', '.join(missing)}"}
+    try:
+        violations, metrics = evaluate(_THRESHOLDS, paths)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        return {"bundle": bundle, "status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    result = {"bundle": bundle, "status": "fail" if violations else "pass", "violations": violations}
+    if metrics is not None:
+        result["metrics"] = metrics
+    return result
+
+
+def load_cache(path):
+    try:
+        cache = read_json(path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("entries") or {}
+
+
+def save_cache(path, entries):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"version": CACHE_VERSION, "entries": entries}, fh, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def run_tree(args, out=sys.stdout):
+    with open(args.config, "rb") as fh:
+        config_digest = hashlib.sha256(fh.read()).hexdigest()
+    thresholds = load_cfg(args.config)["thresholds"]
+    cache_path = args.cache or os.path.join(args.root, CACHE_NAME)
+    cache = {} if args.no_cache else load_cache(cache_path)
+
+    fresh, pending = {}, []
+    failed = False
+
+    def emit(result):
+        nonlocal failed
+        failed = failed or result["status"] != "pass"
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+    for bundle_dir, paths in discover(args.root):
+        bundle = os.path.relpath(bundle_dir, args.root)
+        try:
+            fp = fingerprint(config_digest, paths)
+        except OSError as exc:
+            emit({"bundle": bundle, "status": "error", "error": str(exc)})
+            continue
+        hit = cache.get(bundle)
+        if hit and hit.get("fingerprint") == fp:
+            fresh[bundle] = hit
+            emit({**hit["result"], "cached": True})
+        else:
+            pending.append((bundle, paths, fp))
+
+    fingerprints = {bundle: fp for bundle, _, fp in pending}
+
+    def record(result):
+        if result["status"] != "error":
+            fresh[result["bundle"]] = {"fingerprint": fingerprints[result["bundle"]], "result": result}
+        emit({**result, "cached": False})
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(pending) <= 1:
+        _init_worker(thresholds)
+        for bundle, paths, _ in pending:
+            record(evaluate_bundle(bundle, paths))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(pending)),
+            initializer=_init_worker,
+            initargs=(thresholds,),
+        ) as pool:
+            futures = [pool.submit(evaluate_bundle, b, p) for b, p, _ in pending]
+            for future in as_completed(futures):
+                record(future.result())
+
+    if not args.no_cache:
+        save_cache(cache_path, fresh)
+    return 1 if failed else 0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True)
+    ap.add_argument("--eval")
+    ap.add_argument("--fairness")
+    ap.add_argument("--safety")
+    ap.add_argument("--drift")
+    ap.add_argument("--samples", help="per-sample JSONL(.gz) log replacing --eval/--fairness/--safety")
+    ap.add_argument("--root", help="evaluate every artifact bundle under this directory")
+    ap.add_argument("--jobs", type=int, default=0, help="worker processes (default: CPU count)")
+    ap.add_argument("--cache", help=f"results cache file (default: <root>/{CACHE_NAME})")
+    ap.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args()
+
+    if args.root:
+        sys.exit(run_tree(args))
+
+    required = ("drift",) if args.samples else tuple(ARTIFACTS)
+    missing = [f"--{k}" for k in required if getattr(args, k) is None]
+    if missing:
+        ap.error(f"the following arguments are required: {', '.join(missing)}")
+
+    cfg = load_cfg(args.config)
+    paths = {k: getattr(args, k) for k in ARTIFACTS if getattr(args, k) is not None}
+    if args.samples:
+        paths["samples"] = args.samples
+    violations, metrics = evaluate(cfg["thresholds"], paths)
 
-    print(json.dumps({"violations": violations}, indent=2))
+    report = {"violations": violations}
+    if metrics is not None:
+        report["metrics"] = metrics
+    print(json.dumps(report, indent=2))
     sys.exit(1 if violations else 0)
 
 
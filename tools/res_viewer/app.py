@@ -1,5 +1,7 @@
 import os, json, time
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
@@ -8,15 +10,25 @@ import matplotlib.pyplot as plt
 # Config
 # ----------------------------
 RES_URL = os.getenv("RES_URL", "http://localhost:8080")
+SNAPSHOT_TTL = float(os.getenv("RES_SNAPSHOT_TTL", "10"))
 st.set_page_config(page_title="Risk & Evidence Viewer", layout="wide")
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
-def get_json(url, default=None):
+@st.cache_resource
+def http():
+    """One pooled session for every rerun and browser tab."""
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return s
+
+
+def get_json(url, default=None, params=None):
     try:
-        r = requests.get(url, timeout=5)
+        r = http().get(url, params=params, timeout=5)
         if r.ok:
             return r.json()
     except Exception:
@@ -26,12 +38,98 @@ def get_json(url, default=None):
 
 def post_json(url, payload):
     try:
-        r = requests.post(url, json=payload, timeout=5)
+        r = http().post(url, json=payload, timeout=5)
         return r.ok, r.text
     except Exception as e:
         return False, str(e)
 
 
+@st.cache_data(ttl=SNAPSHOT_TTL, show_spinner=False)
+def fetch_snapshot(model):
+    # Reruns within the TTL (widget changes, wall-display refreshes) reuse it.
+    return get_json(f"{RES_URL}/risk/snapshot", params={"model": model} if model else None)
+
+
+EVIDENCE_PAGE = int(os.getenv("RES_EVIDENCE_PAGE", "100"))
+
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=256)
+def fetch_evidence_page(model, artifact, cursor):
+    # Keyset pages are stable: new evidence only ever appears before page one.
+    params = {"limit": EVIDENCE_PAGE, "view": "summary"}
+    params.update({k: v for k, v in (("modelVersion", model), ("artifactType", artifact), ("cursor", cursor)) if v})
+    return get_json(f"{RES_URL}/evidence", params=params)
+
+
+@st.cache_data(ttl=300, show_spinner=False, max_entries=512)
+def fetch_evidence(evidence_id):
+    return get_json(f"{RES_URL}/evidence/{evidence_id}")
+
+
+@st.cache_data(ttl=SNAPSHOT_TTL, show_spinner=False)
+def fetch_models():
+    return (get_json(f"{RES_URL}/risk/models") or {}).get("models", [])
+
+
+@st.cache_data(ttl=SNAPSHOT_TTL, show_spinner=False)
+def fetch_history(model, max_points):
+    data = get_json(f"{RES_URL}/risk/history", params={"model": model, "max_points": max_points})
+    return (data or {}).get("series", {})
+
+
+def history_chart(series):
+    """One figure, one shared-x panel per metric."""
+    fig, axes = plt.subplots(len(series), 1, sharex=True, figsize=(8, 1.8 * len(series)), squeeze=False)
+    for ax, (key, points) in zip(axes[:, 0], series.items()):
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        ax.plot(pd.to_datetime(pts[:, 0], unit="s"), pts[:, 1], linewidth=1)
+        ax.set_ylabel(key, rotation=0, ha="right", fontsize=8)
+    fig.tight_layout()
+    return fig
+
+
+# (label, section, field, limit, lower_is_better)
+GOVERNED = [
+    ("pass@5", "quality", "pass_at_5", 0.82, False),
+    ("fairness Δ", "fairness", "subgroup_delta", 0.05, True),
+    ("harmful rate", "safety", "harmful_rate", 0.005, True),
+    ("re-id risk", "privacy", "reid_risk", 0.001, True),
+    ("drift PSI", "drift", "psi", 0.1, True),
+    ("latency p95 (s)", "latency", "p95_seconds", 2.0, True),
+]
+
+
+def metrics_frame(snap):
+    values = [(snap.get(section) or {}).get(field) for _, section, field, _, _ in GOVERNED]
+    df = pd.DataFrame(
+        {
+            "Metric": [g[0] for g in GOVERNED],
+            "Value": pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce"),
+            "Limit": [g[3] for g in GOVERNED],
+            "lower_is_better": [g[4] for g in GOVERNED],
+        }
+    )
+    df["vs limit"] = df["Value"] / df["Limit"]
+    df["breach"] = np.where(df["lower_is_better"], df["vs limit"] > 1, df["vs limit"] < 1)
+    return df
+
+
+def metrics_chart(df):
+    """All metrics as one bar chart of value / limit (1.0 = at the threshold)."""
+    df = df.dropna(subset=["Value"])  # metrics not reported yet are null
+    fig, ax = plt.subplots(figsize=(7, 0.45 * max(len(df), 1) + 1))
+    ratio = df["vs limit"].to_numpy()
+    ax.barh(df["Metric"], ratio, color=np.where(df["breach"], "tab:red", "tab:green"))
+    ax.axvline(1.0, color="black", linestyle="--", linewidth=1)
+    for y, (r, v) in enumerate(zip(ratio, df["Value"])):
+        ax.annotate(f"{v:.4g}", (r, y), xytext=(4, 0), textcoords="offset points", va="center")
+    ax.set_xlim(0, max(1.5, float(ratio.max()) * 1.2) if ratio.size else 1.5)
+    ax.set_xlabel("value / threshold")
+    ax.invert_yaxis()
+    fig.tight_layout()
+    return fig
+
+
 def mock_snapshot():
     return {
         "model_version": "demo-abc123",
@@ -55,33 +153,20 @@ st.caption("Visualize governance posture, evidence artifacts, and incidents (ADR
 colA, colB = st.columns([2, 1])
 with colA:
     st.subheader("Risk Snapshot")
-    model = st.text_input("Model Version (optional):", "")
-    url = f"{RES_URL}/risk/snapshot" + (f"?model={model}" if model else "")
-    snap = get_json(url, default=mock_snapshot())
-    st.json(snap)
+    model = st.text_input("Model Version (optional):", "").strip()
+    snap = fetch_snapshot(model) or mock_snapshot()
+    with st.expander("Raw snapshot"):
+        st.json(snap)
 
-    # Gauges (matplotlib)
-    df = pd.DataFrame(
-        [
-            ("pass@5 (↑≥0.82)", snap["quality"]["pass_at_5"]),
-            ("fairness Δ (↓≤0.05)", snap["fairness"]["subgroup_delta"]),
-            ("harmful rate (↓≤0.005)", snap["safety"]["harmful_rate"]),
-            ("re-id risk (↓≤0.001)", snap["privacy"]["reid_risk"]),
-            ("drift PSI (warn 0.1)", snap["drift"]["psi"]),
-        ],
-        columns=["Metric", "Value"],
-    )
+    df = metrics_frame(snap)
 
     st.subheader("Key Metrics")
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(df[["Metric", "Value", "Limit", "vs limit"]], use_container_width=True)
 
-    st.subheader("Metric Bars (quick glance)")
-    for _, row in df.iterrows():
-        label, val = row["Metric"], float(row["Value"])
-        fig, ax = plt.subplots()
-        ax.bar([label], [val])
-        ax.set_ylim([0, max(1.0, val * 1.2)])
-        st.pyplot(fig)
+    st.subheader("Metrics vs Thresholds")
+    fig = metrics_chart(df)
+    st.pyplot(fig)
+    plt.close(fig)  # pyplot keeps every figure alive until closed
 
 with colB:
     st.subheader("Submit Evidence (demo)")
@@ -101,5 +186,52 @@ with colB:
         )
         st.success("Posted!") if ok else st.error(resp)
 
+st.markdown("---")
+st.subheader("Browse")
+tab_evidence, tab_history = st.tabs(["Evidence", "Metric history"])
+
+with tab_evidence:
+    f1, f2 = st.columns(2)
+    ev_model = f1.text_input("Filter: model version", "").strip()
+    ev_type = f2.text_input("Filter: artifact type", "").strip()
+    # Pages already loaded for these filters; "Load more" follows next_cursor.
+    browser = st.session_state.get("evidence_browser")
+    if browser is None or browser["filters"] != (ev_model, ev_type):
+        page = fetch_evidence_page(ev_model, ev_type, None) or {"items": [], "next_cursor": None}
+        browser = {"filters": (ev_model, ev_type), "items": list(page["items"]), "cursor": page["next_cursor"]}
+        st.session_state["evidence_browser"] = browser
+    if browser["cursor"] and st.button(f"Load {EVIDENCE_PAGE} more"):
+        page = fetch_evidence_page(ev_model, ev_type, browser["cursor"]) or {"items": [], "next_cursor": None}
+        browser["items"].extend(page["items"])
+        browser["cursor"] = page["next_cursor"]
+
+    items = browser["items"]
+    st.caption(f"{len(items)} records loaded" + ("" if browser["cursor"] else " (end of results)"))
+    if items:
+        st.dataframe(
+            pd.DataFrame(items, columns=["stored_at", "modelVersion", "artifactType", "contentRef", "metadata_bytes", "id"]),
+            use_container_width=True,
+            hide_index=True,
+        )
+        picked = st.selectbox("Record", [i["id"] for i in items], format_func=lambda i: i[:16])
+        if st.checkbox("Show metadata"):
+            st.json(fetch_evidence(picked) or {"error": "not found"})
+
+with tab_history:
+    models = fetch_models()
+    if not models:
+        st.info("No metric history reported yet.")
+    else:
+        h1, h2 = st.columns([2, 1])
+        h_model = h1.selectbox("Model version", models[::-1])
+        max_points = h2.slider("Points per series", 50, 2000, 300, step=50)
+        series = fetch_history(h_model, max_points)  # downsampled by RES
+        if series:
+            fig = history_chart(series)
+            st.pyplot(fig)
+            plt.close(fig)
+        else:
+            st.info("No history for this model.")
+
 st.markdown("---")
 st.caption(f"RES URL: {RES_URL} — set via env var `RES_URL`")